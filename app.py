@@ -3,15 +3,43 @@ Aplicação principal de Gestão de RH com Streamlit.
 """
 
 import streamlit as st
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, time
+import heapq
+import importlib.util
+from operator import attrgetter
 import sys
-from pathlib import Path
 
-# Adiciona o diretório raiz ao path
-sys.path.insert(0, str(Path(__file__).parent))
+from src.utils import DatabaseManager, Validators
+from src.models import Funcionario, Afastamento, TipoAfastamento
 
-from src.utils import DatabaseManager
-from src.models import TipoAfastamento
+
+def _lazy_import(nome: str):
+    """Importa um módulo sob demanda (carregado no primeiro acesso a um atributo)."""
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.find_spec(nome)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    loader.exec_module(modulo)
+    return modulo
+
+
+# Módulos pesados, carregados apenas pelas páginas que os utilizam
+pd = _lazy_import('pandas')
+ferias = _lazy_import('src.utils.ferias')
+
+# Valores dos tipos de afastamento (e seus índices), usados nos selectboxes
+TIPO_AFASTAMENTO_VALUES = tuple(t.value for t in TipoAfastamento)
+TIPO_AFASTAMENTO_INDEX = {valor: i for i, valor in enumerate(TIPO_AFASTAMENTO_VALUES)}
+
+# Horário usado ao converter as datas dos formulários em datetime
+MEIA_NOITE = time.min
+
+# Formatação das colunas de moeda, feita pelo Streamlit na exibição
+COLUNAS_MOEDA = {'Salário': st.column_config.NumberColumn(format='R$ %.2f')}
 
 # Configuração da página
 st.set_page_config(
@@ -21,12 +49,204 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_resource
+def _get_db() -> DatabaseManager:
+    """Retorna a instância compartilhada do gerenciador de banco de dados."""
+    return DatabaseManager()
+
+
 # Inicializa o gerenciador de banco de dados
 if 'db' not in st.session_state:
-    st.session_state.db = DatabaseManager()
+    st.session_state.db = _get_db()
+
+
+@st.cache_resource
+def _revisao_dados() -> dict:
+    """Contador de revisão dos dados, compartilhado entre as sessões (como o banco)."""
+    return {'revisao': 0}
+
+
+def _versao_dados() -> int:
+    """Versão dos dados usada como chave dos caches (a mesma em todas as sessões)."""
+    return _revisao_dados()['revisao']
+
+
+def _invalidar_cache():
+    """Avança a revisão compartilhada dos dados, invalidando os caches de todas as sessões."""
+    _revisao_dados()['revisao'] += 1
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_funcionarios(version: int):
+    """Lista os funcionários ativos (cacheado por versão dos dados)."""
+    return st.session_state.db.listar_funcionarios(apenas_ativos=True)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_afastamentos(version: int):
+    """Lista todos os afastamentos (cacheado por versão dos dados)."""
+    db = st.session_state.db
+    return [db._dict_to_afastamento(aft) for aft in db._load_json(db.afastamentos_file)]
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _funcionarios_by_id(version: int, apenas_ativos: bool = False) -> dict:
+    """Indexa os funcionários por ID (cacheado por versão dos dados)."""
+    if apenas_ativos:
+        return {f.id: f for f in _load_funcionarios(version)}
+    return {f.id: f for f in st.session_state.db.listar_funcionarios(apenas_ativos=False)}
+
+
+def _colunas(objetos, campos) -> dict:
+    """Extrai os atributos dos objetos em listas paralelas (uma única passada)."""
+    if not objetos:
+        return {campo: [] for campo in campos}
+    return dict(zip(campos, map(list, zip(*map(attrgetter(*campos), objetos)))))
+
+
+def _formatar_datas(serie):
+    """Formata uma coluna de datas como dd/mm/aaaa de forma vetorizada."""
+    return pd.to_datetime(serie).dt.strftime('%d/%m/%Y').fillna('N/A')
+
+
+def _texto_arrow(df):
+    """Converte as colunas de texto para o dtype string do PyArrow."""
+    texto = df.select_dtypes(include=['object', 'string']).columns
+    return df.astype({col: 'string[pyarrow]' for col in texto})
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _funcionarios_df(version: int):
+    """Monta o DataFrame da lista de funcionários (cacheado por versão dos dados)."""
+    campos = ('id', 'nome', 'cpf', 'email', 'telefone', 'cargo', 'loja', 'data_admissao', 'salario')
+    df = pd.DataFrame(_colunas(_load_funcionarios(version), campos))
+    df['data_admissao'] = _formatar_datas(df['data_admissao'])
+
+    return _texto_arrow(df).rename(columns={
+        'id': 'ID',
+        'nome': 'Nome',
+        'cpf': 'CPF',
+        'email': 'Email',
+        'telefone': 'Telefone',
+        'cargo': 'Cargo',
+        'loja': 'Loja',
+        'data_admissao': 'Admissão',
+        'salario': 'Salário'
+    })
+
+
+def _exportar_excel(df, caminho: str, aba: str) -> None:
+    """Grava o DataFrame em Excel usando o xlsxwriter em modo de memória constante."""
+    with pd.ExcelWriter(
+        caminho,
+        engine='xlsxwriter',
+        engine_kwargs={'options': {'constant_memory': True}}
+    ) as writer:
+        df.to_excel(writer, index=False, sheet_name=aba)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _afastamentos_df(version: int):
+    """Monta o DataFrame de afastamentos com datas em datetime64 (cacheado por versão dos dados)."""
+    campos = ('id', 'funcionario_id', 'tipo', 'data_inicio', 'data_fim', 'motivo')
+    df = pd.DataFrame(_colunas(_load_afastamentos(version), campos))
+    df['data_inicio'] = pd.to_datetime(df['data_inicio'])
+    df['data_fim'] = pd.to_datetime(df['data_fim'])
+    df['dias'] = ((df['data_fim'] - df['data_inicio']).dt.days + 1).fillna(0).astype(int)
+
+    nomes = pd.Series({func_id: f.nome for func_id, f in _funcionarios_by_id(version).items()}, dtype=object)
+    df['funcionario'] = df['funcionario_id'].map(nomes).fillna('N/A')
+
+    return _texto_arrow(df)
+
+
+def _tabela_afastamentos(df):
+    """Formata o DataFrame de afastamentos para exibição."""
+    return _texto_arrow(pd.DataFrame({
+        'ID': df['id'],
+        'Funcionário': df['funcionario'],
+        'Tipo': df['tipo'],
+        'Início': _formatar_datas(df['data_inicio']),
+        'Fim': _formatar_datas(df['data_fim']),
+        'Dias': df['dias'],
+        'Motivo': df['motivo']
+    }))
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _resumo_por_tipo(version: int):
+    """Agrupa os afastamentos por tipo com quantidade e total de dias (cacheado por versão dos dados)."""
+    df = _afastamentos_df(version)
+    return (
+        df.groupby('tipo', sort=False)
+        .agg(Quantidade=('tipo', 'size'), **{'Total de Dias': ('dias', 'sum')})
+        .rename_axis('Tipo')
+        .reset_index()
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _dashboard_stats(version: int) -> dict:
+    """Calcula as métricas do dashboard (cacheado por versão dos dados)."""
+    funcionarios = _load_funcionarios(version)
+
+    # Ordena por data de criação (mais recentes primeiro)
+    funcionarios_recentes = heapq.nlargest(
+        5,
+        funcionarios,
+        key=lambda x: x.data_criacao or datetime.min
+    )
+
+    campos = ('nome', 'cpf', 'cargo', 'loja', 'data_admissao')
+    df_recentes = pd.DataFrame(_colunas(funcionarios_recentes, campos))
+    df_recentes['data_admissao'] = _formatar_datas(df_recentes['data_admissao'])
+    df_recentes.columns = ['Nome', 'CPF', 'Cargo', 'Loja', 'Data Admissão']
+
+    # Agrega lojas, cargos e folha de pagamento em uma única passada
+    lojas_count = Counter()
+    cargos = set()
+    salario_total = 0.0
+    for f in funcionarios:
+        if f.loja:
+            lojas_count[f.loja] += 1
+        if f.cargo:
+            cargos.add(f.cargo)
+        salario_total += f.salario
+
+    return {
+        'total': len(funcionarios),
+        'lojas': len(lojas_count),
+        'cargos': len(cargos),
+        'salario_total': salario_total,
+        'lojas_count': lojas_count,
+        'recentes': df_recentes
+    }
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _relatorio_ferias_df(version: int):
+    """Monta o relatório de férias com um único groupby (cacheado por versão dos dados)."""
+    funcs = pd.DataFrame(_colunas(_load_funcionarios(version), ('id', 'nome', 'data_admissao')))
+    afts = _afastamentos_df(version)
+
+    # Soma os dias de férias utilizados por funcionário
+    afts_ferias = afts[afts['tipo'] == TipoAfastamento.FERIAS.value]
+    dias_utilizados = afts_ferias.groupby('funcionario_id')['dias'].sum()
+
+    df = pd.DataFrame({
+        'Nome': funcs['nome'],
+        'Data Admissão': _formatar_datas(funcs['data_admissao']),
+        'Dias Disponíveis': ferias.FeriasManager.calcular_dias_ferias_disponiveis_vec(funcs['data_admissao']),
+        'Dias Utilizados': funcs['id'].map(dias_utilizados).fillna(0).astype(int)
+    })
+    df['Saldo'] = df['Dias Disponíveis'] - df['Dias Utilizados']
+
+    return df
+
 
 # CSS customizado
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -40,7 +260,11 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Injetado a cada execução do script (o elemento faz parte da página, como os demais)
+st.markdown(CSS, unsafe_allow_html=True)
 
 # Barra lateral com navegação
 st.sidebar.title("🏢 RH Control")
@@ -69,40 +293,32 @@ if menu == "📊 Dashboard":
     st.markdown("<h1 class='main-header'>📊 Dashboard</h1>", unsafe_allow_html=True)
     
     # Obtém estatísticas
-    funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
-    total_funcionarios = len(funcionarios)
+    stats = _dashboard_stats(_versao_dados())
     
     # Cria colunas para métricas
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total de Funcionários", total_funcionarios, delta=None)
+        st.metric("Total de Funcionários", stats['total'], delta=None)
     
     with col2:
-        lojas = len(set(f.loja for f in funcionarios if f.loja))
-        st.metric("Lojas Cadastradas", lojas, delta=None)
+        st.metric("Lojas Cadastradas", stats['lojas'], delta=None)
     
     with col3:
-        cargos = len(set(f.cargo for f in funcionarios if f.cargo))
-        st.metric("Cargos Diferentes", cargos, delta=None)
+        st.metric("Cargos Diferentes", stats['cargos'], delta=None)
     
     with col4:
-        salario_total = sum(f.salario for f in funcionarios)
-        st.metric("Folha de Pagamento", f"R$ {salario_total:,.2f}", delta=None)
+        st.metric("Folha de Pagamento", f"R$ {stats['salario_total']:,.2f}", delta=None)
     
     st.markdown("---")
     
     # Distribuição por loja
-    if funcionarios:
+    if stats['total']:
         st.subheader("Distribuição de Funcionários por Loja")
         
-        lojas_count = {}
-        for func in funcionarios:
-            if func.loja:
-                lojas_count[func.loja] = lojas_count.get(func.loja, 0) + 1
+        lojas_count = stats['lojas_count']
         
         if lojas_count:
-            import pandas as pd
             df_lojas = pd.DataFrame(list(lojas_count.items()), columns=['Loja', 'Quantidade'])
             st.bar_chart(df_lojas.set_index('Loja'))
     
@@ -111,27 +327,8 @@ if menu == "📊 Dashboard":
     # Últimos funcionários cadastrados
     st.subheader("Últimos Funcionários Cadastrados")
     
-    if funcionarios:
-        # Ordena por data de criação (mais recentes primeiro)
-        funcionarios_recentes = sorted(
-            funcionarios,
-            key=lambda x: x.data_criacao or datetime.min,
-            reverse=True
-        )[:5]
-        
-        import pandas as pd
-        df_recentes = pd.DataFrame([
-            {
-                'Nome': f.nome,
-                'CPF': f.cpf,
-                'Cargo': f.cargo,
-                'Loja': f.loja,
-                'Data Admissão': f.data_admissao.strftime('%d/%m/%Y') if f.data_admissao else 'N/A'
-            }
-            for f in funcionarios_recentes
-        ])
-        
-        st.dataframe(df_recentes, use_container_width=True, hide_index=True)
+    if stats['total']:
+        st.dataframe(stats['recentes'], use_container_width=True, hide_index=True)
     else:
         st.info("Nenhum funcionário cadastrado ainda.")
 
@@ -145,32 +342,15 @@ elif menu == "👤 Funcionários":
     with tab1:
         st.subheader("Lista de Funcionários")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        df = _funcionarios_df(_versao_dados())
         
-        if funcionarios:
-            import pandas as pd
-            
-            df_data = []
-            for func in funcionarios:
-                df_data.append({
-                    'ID': func.id,
-                    'Nome': func.nome,
-                    'CPF': func.cpf,
-                    'Email': func.email,
-                    'Telefone': func.telefone,
-                    'Cargo': func.cargo,
-                    'Loja': func.loja,
-                    'Admissão': func.data_admissao.strftime('%d/%m/%Y') if func.data_admissao else 'N/A',
-                    'Salário': f"R$ {func.salario:,.2f}"
-                })
-            
-            df = pd.DataFrame(df_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True, hide_index=True, column_config=COLUNAS_MOEDA)
             
             # Botão para exportar
             if st.button("📥 Exportar para Excel"):
                 try:
-                    st.session_state.db.exportar_funcionarios_excel("funcionarios.xlsx")
+                    _exportar_excel(df, "funcionarios.xlsx", "Funcionarios")
                     st.success("Arquivo exportado com sucesso!")
                 except Exception as e:
                     st.error(f"Erro ao exportar: {e}")
@@ -205,8 +385,6 @@ elif menu == "👤 Funcionários":
                 if not nome or not cpf or not email or not telefone or not endereco or not loja or not cargo:
                     st.error("Por favor, preencha todos os campos obrigatórios.")
                 else:
-                    from src.utils import Validators
-                    
                     # Valida CPF
                     if not Validators.validar_cpf(cpf):
                         st.error("CPF inválido.")
@@ -220,8 +398,6 @@ elif menu == "👤 Funcionários":
                     elif st.session_state.db.obter_funcionario_por_cpf(cpf):
                         st.error("CPF já cadastrado no sistema.")
                     else:
-                        from src.models import Funcionario
-                        
                         novo_funcionario = Funcionario(
                             nome=nome,
                             cpf=cpf,
@@ -231,10 +407,11 @@ elif menu == "👤 Funcionários":
                             loja=loja,
                             cargo=cargo,
                             salario=salario,
-                            data_admissao=datetime.combine(data_admissao, datetime.min.time())
+                            data_admissao=datetime.combine(data_admissao, MEIA_NOITE)
                         )
                         
                         st.session_state.db.criar_funcionario(novo_funcionario)
+                        _invalidar_cache()
                         st.success("Funcionário adicionado com sucesso!")
                         st.rerun()
     
@@ -242,17 +419,17 @@ elif menu == "👤 Funcionários":
     with tab3:
         st.subheader("Editar ou Deletar Funcionário")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        funcionarios_dict = _funcionarios_by_id(_versao_dados(), apenas_ativos=True)
         
-        if funcionarios:
-            # Cria um dicionário para facilitar a seleção
-            funcionarios_dict = {f.nome: f for f in funcionarios}
-            funcionario_selecionado_nome = st.selectbox(
+        if funcionarios_dict:
+            # Seleciona pelo ID (nomes podem se repetir) e exibe o nome
+            funcionario_selecionado_id = st.selectbox(
                 "Selecione um funcionário",
-                list(funcionarios_dict.keys())
+                list(funcionarios_dict.keys()),
+                format_func=lambda i: funcionarios_dict[i].nome
             )
             
-            funcionario_selecionado = funcionarios_dict[funcionario_selecionado_nome]
+            funcionario_selecionado = funcionarios_dict[funcionario_selecionado_id]
             
             st.info(f"**ID:** {funcionario_selecionado.id}")
             
@@ -271,8 +448,6 @@ elif menu == "👤 Funcionários":
                     salario = st.number_input("Salário", value=funcionario_selecionado.salario, step=100.0)
                     
                     if st.form_submit_button("💾 Salvar Alterações", use_container_width=True):
-                        from src.utils import Validators
-                        
                         if not Validators.validar_email(email):
                             st.error("Email inválido.")
                         elif not Validators.validar_telefone(telefone):
@@ -287,6 +462,7 @@ elif menu == "👤 Funcionários":
                             funcionario_selecionado.salario = salario
                             
                             st.session_state.db.atualizar_funcionario(funcionario_selecionado)
+                            _invalidar_cache()
                             st.success("Funcionário atualizado com sucesso!")
                             st.rerun()
             
@@ -296,6 +472,7 @@ elif menu == "👤 Funcionários":
                 
                 if st.button("🗑️ Deletar Funcionário", use_container_width=True, type="secondary"):
                     st.session_state.db.deletar_funcionario(funcionario_selecionado.id)
+                    _invalidar_cache()
                     st.success("Funcionário deletado com sucesso!")
                     st.rerun()
         else:
@@ -311,27 +488,10 @@ elif menu == "📋 Afastamentos":
     with tab1:
         st.subheader("Lista de Afastamentos")
         
-        afastamentos = []
-        for aft in st.session_state.db._load_json(st.session_state.db.afastamentos_file):
-            afastamentos.append(st.session_state.db._dict_to_afastamento(aft))
+        afastamentos = _load_afastamentos(_versao_dados())
         
         if afastamentos:
-            import pandas as pd
-            
-            df_data = []
-            for aft in afastamentos:
-                funcionario = st.session_state.db.obter_funcionario(aft.funcionario_id)
-                df_data.append({
-                    'ID': aft.id,
-                    'Funcionário': funcionario.nome if funcionario else 'N/A',
-                    'Tipo': aft.tipo,
-                    'Início': aft.data_inicio.strftime('%d/%m/%Y') if aft.data_inicio else 'N/A',
-                    'Fim': aft.data_fim.strftime('%d/%m/%Y') if aft.data_fim else 'N/A',
-                    'Dias': aft.dias_afastamento(),
-                    'Motivo': aft.motivo
-                })
-            
-            df = pd.DataFrame(df_data)
+            df = _tabela_afastamentos(_afastamentos_df(_versao_dados()))
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.info("Nenhum afastamento registrado.")
@@ -340,21 +500,22 @@ elif menu == "📋 Afastamentos":
     with tab2:
         st.subheader("Registrar Novo Afastamento")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        funcionarios_dict = _funcionarios_by_id(_versao_dados(), apenas_ativos=True)
         
-        if funcionarios:
+        if funcionarios_dict:
             with st.form("form_novo_afastamento"):
-                funcionario_nome = st.selectbox(
+                funcionario_id = st.selectbox(
                     "Selecione o Funcionário *",
-                    [f.nome for f in funcionarios],
+                    list(funcionarios_dict.keys()),
+                    format_func=lambda i: funcionarios_dict[i].nome,
                     key="novo_aft_funcionario"
                 )
                 
-                funcionario = next((f for f in funcionarios if f.nome == funcionario_nome), None)
+                funcionario = funcionarios_dict.get(funcionario_id)
                 
                 tipo_afastamento = st.selectbox(
                     "Tipo de Afastamento *",
-                    [t.value for t in TipoAfastamento],
+                    TIPO_AFASTAMENTO_VALUES,
                     key="novo_aft_tipo"
                 )
                 
@@ -375,18 +536,17 @@ elif menu == "📋 Afastamentos":
                     elif data_fim < data_inicio:
                         st.error("A data de fim não pode ser anterior à data de início.")
                     else:
-                        from src.models import Afastamento
-                        
                         novo_afastamento = Afastamento(
                             funcionario_id=funcionario.id,
                             tipo=tipo_afastamento,
-                            data_inicio=datetime.combine(data_inicio, datetime.min.time()),
-                            data_fim=datetime.combine(data_fim, datetime.min.time()),
+                            data_inicio=datetime.combine(data_inicio, MEIA_NOITE),
+                            data_fim=datetime.combine(data_fim, MEIA_NOITE),
                             motivo=motivo,
                             observacoes=observacoes
                         )
                         
                         st.session_state.db.criar_afastamento(novo_afastamento)
+                        _invalidar_cache()
                         st.success("Afastamento registrado com sucesso!")
                         st.rerun()
         else:
@@ -396,24 +556,25 @@ elif menu == "📋 Afastamentos":
     with tab3:
         st.subheader("Editar ou Deletar Afastamento")
         
-        afastamentos = []
-        for aft in st.session_state.db._load_json(st.session_state.db.afastamentos_file):
-            afastamentos.append(st.session_state.db._dict_to_afastamento(aft))
+        afastamentos = _load_afastamentos(_versao_dados())
+        func_by_id = _funcionarios_by_id(_versao_dados())
         
         if afastamentos:
-            # Cria um dicionário para facilitar a seleção
-            afastamentos_dict = {}
-            for aft in afastamentos:
-                funcionario = st.session_state.db.obter_funcionario(aft.funcionario_id)
-                chave = f"{funcionario.nome if funcionario else 'N/A'} - {aft.tipo} ({aft.data_inicio.strftime('%d/%m/%Y')})"
-                afastamentos_dict[chave] = aft
+            # Seleciona pelo ID; o rótulo é montado apenas para exibição
+            afastamentos_dict = {aft.id: aft for aft in afastamentos}
+            
+            def _rotulo_afastamento(aft_id):
+                aft = afastamentos_dict[aft_id]
+                funcionario = func_by_id.get(aft.funcionario_id)
+                return f"{funcionario.nome if funcionario else 'N/A'} - {aft.tipo} ({Validators.formatar_data(aft.data_inicio)})"
             
-            afastamento_selecionado_chave = st.selectbox(
+            afastamento_selecionado_id = st.selectbox(
                 "Selecione um afastamento",
-                list(afastamentos_dict.keys())
+                list(afastamentos_dict.keys()),
+                format_func=_rotulo_afastamento
             )
             
-            afastamento_selecionado = afastamentos_dict[afastamento_selecionado_chave]
+            afastamento_selecionado = afastamentos_dict[afastamento_selecionado_id]
             
             st.info(f"**ID:** {afastamento_selecionado.id}")
             
@@ -425,8 +586,8 @@ elif menu == "📋 Afastamentos":
                 with st.form("form_editar_afastamento"):
                     tipo = st.selectbox(
                         "Tipo de Afastamento",
-                        [t.value for t in TipoAfastamento],
-                        index=[t.value for t in TipoAfastamento].index(afastamento_selecionado.tipo)
+                        TIPO_AFASTAMENTO_VALUES,
+                        index=TIPO_AFASTAMENTO_INDEX.get(afastamento_selecionado.tipo, 0)
                     )
                     
                     motivo = st.text_area("Motivo", value=afastamento_selecionado.motivo, height=100)
@@ -438,6 +599,7 @@ elif menu == "📋 Afastamentos":
                         afastamento_selecionado.observacoes = observacoes
                         
                         st.session_state.db.atualizar_afastamento(afastamento_selecionado)
+                        _invalidar_cache()
                         st.success("Afastamento atualizado com sucesso!")
                         st.rerun()
             
@@ -447,6 +609,7 @@ elif menu == "📋 Afastamentos":
                 
                 if st.button("🗑️ Deletar Afastamento", use_container_width=True, type="secondary"):
                     st.session_state.db.deletar_afastamento(afastamento_selecionado.id)
+                    _invalidar_cache()
                     st.success("Afastamento deletado com sucesso!")
                     st.rerun()
         else:
@@ -469,27 +632,14 @@ elif menu == "📈 Relatórios":
             data_fim = st.date_input("Data de Fim", key="rel_data_fim")
         
         if st.button("🔍 Gerar Relatório", key="btn_rel_periodo"):
-            afastamentos = st.session_state.db.listar_afastamentos_por_periodo(
-                datetime.combine(data_inicio, datetime.min.time()),
-                datetime.combine(data_fim, datetime.min.time())
-            )
+            df = _afastamentos_df(_versao_dados())
             
-            if afastamentos:
-                import pandas as pd
-                
-                df_data = []
-                for aft in afastamentos:
-                    funcionario = st.session_state.db.obter_funcionario(aft.funcionario_id)
-                    df_data.append({
-                        'Funcionário': funcionario.nome if funcionario else 'N/A',
-                        'Tipo': aft.tipo,
-                        'Início': aft.data_inicio.strftime('%d/%m/%Y'),
-                        'Fim': aft.data_fim.strftime('%d/%m/%Y'),
-                        'Dias': aft.dias_afastamento(),
-                        'Motivo': aft.motivo
-                    })
-                
-                df = pd.DataFrame(df_data)
+            # Afastamentos que se sobrepõem ao período selecionado
+            mask = (df['data_inicio'] <= pd.Timestamp(data_fim)) & (df['data_fim'] >= pd.Timestamp(data_inicio))
+            afastamentos = df.loc[mask].sort_values('data_inicio')
+            
+            if not afastamentos.empty:
+                df = _tabela_afastamentos(afastamentos).drop(columns='ID')
                 st.dataframe(df, use_container_width=True, hide_index=True)
                 
                 st.success(f"Total de {len(afastamentos)} afastamento(s) encontrado(s).")
@@ -500,19 +650,10 @@ elif menu == "📈 Relatórios":
     with tab2:
         st.subheader("Resumo de Afastamentos por Tipo")
         
-        afastamentos = []
-        for aft in st.session_state.db._load_json(st.session_state.db.afastamentos_file):
-            afastamentos.append(st.session_state.db._dict_to_afastamento(aft))
+        afastamentos = _load_afastamentos(_versao_dados())
         
         if afastamentos:
-            import pandas as pd
-            
-            # Conta afastamentos por tipo
-            tipos_count = {}
-            for aft in afastamentos:
-                tipos_count[aft.tipo] = tipos_count.get(aft.tipo, 0) + 1
-            
-            df_tipos = pd.DataFrame(list(tipos_count.items()), columns=['Tipo', 'Quantidade'])
+            df_tipos = _resumo_por_tipo(_versao_dados())
             
             col1, col2 = st.columns(2)
             
@@ -520,7 +661,7 @@ elif menu == "📈 Relatórios":
                 st.dataframe(df_tipos, use_container_width=True, hide_index=True)
             
             with col2:
-                st.bar_chart(df_tipos.set_index('Tipo'))
+                st.bar_chart(df_tipos.set_index('Tipo')['Quantidade'])
         else:
             st.info("Nenhum afastamento registrado.")
     
@@ -528,34 +669,9 @@ elif menu == "📈 Relatórios":
     with tab3:
         st.subheader("Relatório de Férias")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        df = _relatorio_ferias_df(_versao_dados())
         
-        if funcionarios:
-            import pandas as pd
-            from src.utils.ferias import FeriasManager
-            
-            ferias_manager = FeriasManager()
-            
-            df_data = []
-            for func in funcionarios:
-                dias_disponiveis = ferias_manager.calcular_dias_ferias(func.data_admissao)
-                
-                # Calcula dias utilizados
-                afastamentos = st.session_state.db.listar_afastamentos_por_funcionario(func.id)
-                dias_utilizados = sum(
-                    aft.dias_afastamento() for aft in afastamentos
-                    if aft.tipo == "Férias"
-                )
-                
-                df_data.append({
-                    'Nome': func.nome,
-                    'Data Admissão': func.data_admissao.strftime('%d/%m/%Y') if func.data_admissao else 'N/A',
-                    'Dias Disponíveis': dias_disponiveis,
-                    'Dias Utilizados': dias_utilizados,
-                    'Saldo': dias_disponiveis - dias_utilizados
-                })
-            
-            df = pd.DataFrame(df_data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.info("Nenhum funcionário cadastrado.")
@@ -592,14 +708,17 @@ elif menu == "⚙️ Configurações":
     
     with col1:
         if st.button("📊 Estatísticas do Sistema", use_container_width=True):
-            funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=False)
+            funcionarios = _funcionarios_by_id(_versao_dados())
+            ativos = sum(1 for f in funcionarios.values() if f.ativo)
             
             st.write(f"**Total de Funcionários:** {len(funcionarios)}")
-            st.write(f"**Funcionários Ativos:** {len([f for f in funcionarios if f.ativo])}")
-            st.write(f"**Funcionários Inativos:** {len([f for f in funcionarios if not f.ativo])}")
+            st.write(f"**Funcionários Ativos:** {ativos}")
+            st.write(f"**Funcionários Inativos:** {len(funcionarios) - ativos}")
     
     with col2:
         if st.button("🔄 Recarregar Dados", use_container_width=True):
-            st.session_state.db = DatabaseManager()
+            st.session_state.db.reload()
+            st.cache_data.clear()
+            _invalidar_cache()
             st.success("Dados recarregados com sucesso!")
             st.rerun()
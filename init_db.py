@@ -39,6 +39,7 @@ usuarios_demo = [
     }
 ]
 
+usuarios = []
 for user_data in usuarios_demo:
     usuario = Usuario(
         nome=user_data['nome'],
@@ -47,8 +48,10 @@ for user_data in usuarios_demo:
         perfil=user_data['perfil']
     )
     usuario.definir_senha(user_data['senha'])
-    db.criar_usuario(usuario)
-    print(f"✓ Usuário criado: {user_data['username']}")
+    usuarios.append(usuario)
+
+for usuario in db.criar_usuarios_em_lote(usuarios):
+    print(f"✓ Usuário criado: {usuario.username}")
 
 # Cria funcionários de demonstração
 print("\n👥 Criando funcionários...")
@@ -100,12 +103,11 @@ funcionarios_demo = [
     }
 ]
 
-funcionarios_criados = []
-for func_data in funcionarios_demo:
-    funcionario = Funcionario(**func_data)
-    funcionario = db.criar_funcionario(funcionario)
-    funcionarios_criados.append(funcionario)
-    print(f"✓ Funcionário criado: {func_data['nome']}")
+funcionarios_criados = db.criar_funcionarios_em_lote(
+    [Funcionario(**func_data) for func_data in funcionarios_demo]
+)
+for funcionario in funcionarios_criados:
+    print(f"✓ Funcionário criado: {funcionario.nome}")
 
 # Cria afastamentos de demonstração
 print("\n📋 Criando afastamentos...")
@@ -145,10 +147,11 @@ afastamentos_demo = [
     }
 ]
 
-for aft_data in afastamentos_demo:
-    afastamento = Afastamento(**aft_data)
-    db.criar_afastamento(afastamento)
-    print(f"✓ Afastamento criado: {aft_data['tipo']}")
+afastamentos_criados = db.criar_afastamentos_em_lote(
+    [Afastamento(**aft_data) for aft_data in afastamentos_demo]
+)
+for afastamento in afastamentos_criados:
+    print(f"✓ Afastamento criado: {afastamento.tipo}")
 
 print("\n✅ Banco de dados inicializado com sucesso!")
 print("\n📝 Dados de acesso para demonstração:")
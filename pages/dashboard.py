@@ -3,17 +3,31 @@ Página de dashboard da aplicação.
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, time
 
-# Adiciona o diretório raiz ao path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.bootstrap import get_db, get_auth
+from src.pages.data import (
+    get_funcionarios_por_id, get_opcoes_funcionarios,
+    get_estatisticas_funcionarios, get_afastamentos_por_id, get_resumo_afastamentos_por_tipo,
+    get_tabela_funcionarios, get_tabela_afastamentos, get_total_afastamentos, get_tabela_usuarios,
+    get_afastamentos_por_periodo, get_relatorio_ferias, limpar_cache
+)
+from src.models import TipoAfastamento, PerfilUsuario
+from src.utils.validators import Validators
+
+# Valores dos enums (e índices dos tipos), usados nos selectboxes
+TIPO_AFASTAMENTO_VALUES = tuple(t.value for t in TipoAfastamento)
+TIPO_AFASTAMENTO_INDEX = {valor: i for i, valor in enumerate(TIPO_AFASTAMENTO_VALUES)}
+PERFIL_USUARIO_VALUES = tuple(p.value for p in PerfilUsuario)
+
+# Horário usado ao converter as datas dos formulários em datetime
+MEIA_NOITE = time.min
+
+# Quantidade de afastamentos exibida por página na listagem
+AFASTAMENTOS_POR_PAGINA = 50
 
-from src.utils import DatabaseSQL, AuthManager
-from src.utils.charts import ChartManager
-from src.utils.ferias import FeriasManager
-import pandas as pd
+# Formatação das colunas de moeda, feita pelo Streamlit na exibição
+COLUNAS_MOEDA = {'Salário': st.column_config.NumberColumn(format='R$ %.2f')}
 
 # Configuração da página
 st.set_page_config(
@@ -28,12 +42,9 @@ if 'usuario_logado' not in st.session_state:
     st.warning("Por favor, faça login primeiro.")
     st.switch_page("pages/login.py")
 
-# Inicializa o banco de dados
-if 'db' not in st.session_state:
-    st.session_state.db = DatabaseSQL()
-
-if 'auth' not in st.session_state:
-    st.session_state.auth = AuthManager(st.session_state.db)
+# Banco de dados e autenticação compartilhados entre as sessões
+db = get_db()
+auth = get_auth()
 
 # Obtém o usuário logado
 usuario = st.session_state.usuario_logado
@@ -62,30 +73,36 @@ if st.sidebar.button("🚪 Sair"):
     st.session_state.clear()
     st.switch_page("pages/login.py")
 
+
 # ============ PÁGINA: DASHBOARD ============
-if menu == "📊 Dashboard":
+@st.fragment
+def _pagina_dashboard():
+    """Página de dashboard."""
+    # Plotly só é carregado nas páginas com gráficos
+    from src.pages.graficos import (
+        grafico_funcionarios_por_loja, grafico_distribuicao_cargos,
+        grafico_folha_pagamento_por_loja, grafico_salarios_por_cargo
+    )
+    
     st.markdown("<h1 style='text-align: center; color: #FF6B6B;'>📊 Dashboard</h1>", unsafe_allow_html=True)
     
     # Obtém dados
-    funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+    stats = get_estatisticas_funcionarios()
     
     # Cria colunas para métricas
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total de Funcionários", len(funcionarios))
+        st.metric("Total de Funcionários", stats['total'])
     
     with col2:
-        lojas = len(set(f.loja for f in funcionarios if f.loja))
-        st.metric("Lojas Cadastradas", lojas)
+        st.metric("Lojas Cadastradas", stats['lojas'])
     
     with col3:
-        cargos = len(set(f.cargo for f in funcionarios if f.cargo))
-        st.metric("Cargos Diferentes", cargos)
+        st.metric("Cargos Diferentes", stats['cargos'])
     
     with col4:
-        salario_total = sum(f.salario for f in funcionarios)
-        st.metric("Folha de Pagamento", f"R$ {salario_total:,.2f}")
+        st.metric("Folha de Pagamento", f"R$ {stats['salario_total']:,.2f}")
     
     st.markdown("---")
     
@@ -93,13 +110,13 @@ if menu == "📊 Dashboard":
     col1, col2 = st.columns(2)
     
     with col1:
-        if funcionarios:
-            fig = ChartManager.gráfico_funcionarios_por_loja(funcionarios)
+        if stats['total']:
+            fig = grafico_funcionarios_por_loja()
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        if funcionarios:
-            fig = ChartManager.gráfico_distribuicao_cargos(funcionarios)
+        if stats['total']:
+            fig = grafico_distribuicao_cargos()
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
@@ -107,16 +124,20 @@ if menu == "📊 Dashboard":
     col1, col2 = st.columns(2)
     
     with col1:
-        if funcionarios:
-            fig = ChartManager.gráfico_folha_pagamento_por_loja(funcionarios)
+        if stats['total']:
+            fig = grafico_folha_pagamento_por_loja()
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        if funcionarios:
-            fig = ChartManager.gráfico_salarios_por_cargo(funcionarios)
+        if stats['total']:
+            fig = grafico_salarios_por_cargo()
             st.plotly_chart(fig, use_container_width=True)
+
+
 # ============ PÁGINA: FUNCIONÁRIOS ============
-elif menu == "👥 Funcionários":
+@st.fragment
+def _pagina_funcionarios():
+    """Página de funcionários."""
     st.markdown("<h1 style='text-align: center; color: #FF6B6B;'>👥 Gerenciar Funcionários</h1>", unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["Listar", "Adicionar", "Editar/Deletar"])
@@ -124,23 +145,10 @@ elif menu == "👥 Funcionários":
     with tab1:
         st.subheader("Lista de Funcionários")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        df = get_tabela_funcionarios()
         
-        if funcionarios:
-            df_data = []
-            for func in funcionarios:
-                df_data.append({
-                    'ID': func.id,
-                    'Nome': func.nome,
-                    'CPF': func.cpf,
-                    'Email': func.email,
-                    'Cargo': func.cargo,
-                    'Loja': func.loja,
-                    'Salário': f"R$ {func.salario:,.2f}"
-                })
-            
-            df = pd.DataFrame(df_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True, hide_index=True, column_config=COLUNAS_MOEDA)
         else:
             st.info("Nenhum funcionário cadastrado.")
     
@@ -181,26 +189,27 @@ elif menu == "👥 Funcionários":
                         loja=loja,
                         cargo=cargo,
                         salario=salario,
-                        data_admissao=datetime.combine(data_admissao, datetime.min.time())
+                        data_admissao=datetime.combine(data_admissao, MEIA_NOITE)
                     )
                     
-                    st.session_state.db.criar_funcionario(novo_funcionario)
+                    db.criar_funcionario(novo_funcionario)
+                    limpar_cache('funcionarios')
                     st.success("Funcionário adicionado com sucesso!")
                     st.rerun()
     
     with tab3:
         st.subheader("Editar ou Deletar Funcionário")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        funcionarios_por_id = get_funcionarios_por_id(apenas_ativos=True)
         
-        if funcionarios:
-            funcionarios_dict = {f.nome: f for f in funcionarios}
-            funcionario_selecionado_nome = st.selectbox(
+        if funcionarios_por_id:
+            funcionario_selecionado_id = st.selectbox(
                 "Selecione um funcionário",
-                list(funcionarios_dict.keys())
+                list(funcionarios_por_id),
+                format_func=lambda i: funcionarios_por_id[i].nome
             )
             
-            funcionario_selecionado = funcionarios_dict[funcionario_selecionado_nome]
+            funcionario_selecionado = funcionarios_por_id[funcionario_selecionado_id]
             
             col1, col2 = st.columns(2)
             
@@ -225,7 +234,8 @@ elif menu == "👥 Funcionários":
                         funcionario_selecionado.cargo = cargo
                         funcionario_selecionado.salario = salario
                         
-                        st.session_state.db.atualizar_funcionario(funcionario_selecionado)
+                        db.atualizar_funcionario(funcionario_selecionado)
+                        limpar_cache('funcionarios')
                         st.success("Funcionário atualizado com sucesso!")
                         st.rerun()
             
@@ -235,13 +245,18 @@ elif menu == "👥 Funcionários":
                 st.warning(f"⚠️ Você está prestes a deletar **{funcionario_selecionado.nome}**.")
                 
                 if st.button("🗑️ Deletar Funcionário", use_container_width=True, type="secondary"):
-                    st.session_state.db.deletar_funcionario(funcionario_selecionado.id)
+                    db.deletar_funcionario(funcionario_selecionado.id)
+                    limpar_cache('funcionarios')
                     st.success("Funcionário deletado com sucesso!")
                     st.rerun()
         else:
             st.info("Nenhum funcionário cadastrado.")
+
+
 # ============ PÁGINA: AFASTAMENTOS ============
-elif menu == "📋 Afastamentos":
+@st.fragment
+def _pagina_afastamentos():
+    """Página de afastamentos."""
     st.markdown("<h1 style='text-align: center; color: #FF6B6B;'>📋 Gerenciar Afastamentos</h1>", unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["Listar", "Adicionar", "Editar/Deletar"])
@@ -249,52 +264,34 @@ elif menu == "📋 Afastamentos":
     with tab1:
         st.subheader("Lista de Afastamentos")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=False)
+        total = get_total_afastamentos()
         
-        if funcionarios:
-            todos_afastamentos = []
-            for func in funcionarios:
-                afastamentos = st.session_state.db.listar_afastamentos_por_funcionario(func.id)
-                todos_afastamentos.extend([(aft, func) for aft in afastamentos])
+        if total:
+            total_paginas = -(-total // AFASTAMENTOS_POR_PAGINA)
+            pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1)
             
-            if todos_afastamentos:
-                df_data = []
-                for aft, func in todos_afastamentos:
-                    df_data.append({
-                        'Funcionário': func.nome,
-                        'Tipo': aft.tipo,
-                        'Início': aft.data_inicio.strftime('%d/%m/%Y') if aft.data_inicio else 'N/A',
-                        'Fim': aft.data_fim.strftime('%d/%m/%Y') if aft.data_fim else 'N/A',
-                        'Dias': aft.dias_afastamento(),
-                        'Motivo': aft.motivo
-                    })
-                
-                df = pd.DataFrame(df_data)
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("Nenhum afastamento cadastrado.")
+            df = get_tabela_afastamentos(int(pagina), AFASTAMENTOS_POR_PAGINA)
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"Página {pagina} de {total_paginas} ({total} afastamentos)")
         else:
-            st.info("Nenhum funcionário cadastrado.")
+            st.info("Nenhum afastamento cadastrado.")
     
     with tab2:
         st.subheader("Adicionar Novo Afastamento")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        opcoes_funcionarios = get_opcoes_funcionarios()
         
-        if funcionarios:
-            from src.models import TipoAfastamento
-            
+        if opcoes_funcionarios:
             with st.form("form_novo_afastamento"):
-                funcionario_nome = st.selectbox(
+                funcionario_id, _ = st.selectbox(
                     "Selecione o Funcionário *",
-                    [f.nome for f in funcionarios]
+                    opcoes_funcionarios,
+                    format_func=lambda opcao: opcao[1]
                 )
                 
-                funcionario = next(f for f in funcionarios if f.nome == funcionario_nome)
-                
                 tipo_afastamento = st.selectbox(
                     "Tipo de Afastamento *",
-                    [t.value for t in TipoAfastamento]
+                    TIPO_AFASTAMENTO_VALUES
                 )
                 
                 col1, col2 = st.columns(2)
@@ -319,15 +316,16 @@ elif menu == "📋 Afastamentos":
                         from src.models import Afastamento
                         
                         novo_afastamento = Afastamento(
-                            funcionario_id=funcionario.id,
+                            funcionario_id=funcionario_id,
                             tipo=tipo_afastamento,
-                            data_inicio=datetime.combine(data_inicio, datetime.min.time()),
-                            data_fim=datetime.combine(data_fim, datetime.min.time()),
+                            data_inicio=datetime.combine(data_inicio, MEIA_NOITE),
+                            data_fim=datetime.combine(data_fim, MEIA_NOITE),
                             motivo=motivo,
                             observacoes=observacoes
                         )
                         
-                        st.session_state.db.criar_afastamento(novo_afastamento)
+                        db.criar_afastamento(novo_afastamento)
+                        limpar_cache('afastamentos')
                         st.success("Afastamento adicionado com sucesso!")
                         st.rerun()
         else:
@@ -336,26 +334,29 @@ elif menu == "📋 Afastamentos":
     with tab3:
         st.subheader("Editar ou Deletar Afastamento")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=False)
+        funcionarios_por_id = get_funcionarios_por_id(apenas_ativos=False)
         
-        if funcionarios:
-            todos_afastamentos = []
-            afastamento_info = {}
+        if funcionarios_por_id:
+            afastamentos_por_id = get_afastamentos_por_id()
+            ids_afastamentos = [
+                aft_id for aft_id, aft in afastamentos_por_id.items()
+                if aft.funcionario_id in funcionarios_por_id
+            ]
             
-            for func in funcionarios:
-                afastamentos = st.session_state.db.listar_afastamentos_por_funcionario(func.id)
-                for aft in afastamentos:
-                    label = f"{func.nome} - {aft.tipo} ({aft.data_inicio.strftime('%d/%m/%Y')})"
-                    todos_afastamentos.append(label)
-                    afastamento_info[label] = (aft, func)
+            def _rotulo_afastamento(aft_id: int) -> str:
+                aft = afastamentos_por_id[aft_id]
+                nome = funcionarios_por_id[aft.funcionario_id].nome
+                return f"{nome} - {aft.tipo} ({Validators.formatar_data(aft.data_inicio)})"
             
-            if todos_afastamentos:
-                afastamento_selecionado_label = st.selectbox(
+            if ids_afastamentos:
+                afastamento_selecionado_id = st.selectbox(
                     "Selecione um afastamento",
-                    todos_afastamentos
+                    ids_afastamentos,
+                    format_func=_rotulo_afastamento
                 )
                 
-                afastamento_selecionado, funcionario_selecionado = afastamento_info[afastamento_selecionado_label]
+                afastamento_selecionado = afastamentos_por_id[afastamento_selecionado_id]
+                funcionario_selecionado = funcionarios_por_id[afastamento_selecionado.funcionario_id]
                 
                 col1, col2 = st.columns(2)
                 
@@ -363,12 +364,10 @@ elif menu == "📋 Afastamentos":
                     st.subheader("Editar Informações")
                     
                     with st.form("form_editar_afastamento"):
-                        from src.models import TipoAfastamento
-                        
                         tipo = st.selectbox(
                             "Tipo de Afastamento",
-                            [t.value for t in TipoAfastamento],
-                            index=[t.value for t in TipoAfastamento].index(afastamento_selecionado.tipo)
+                            TIPO_AFASTAMENTO_VALUES,
+                            index=TIPO_AFASTAMENTO_INDEX.get(afastamento_selecionado.tipo, 0)
                         )
                         
                         data_inicio = st.date_input(
@@ -389,12 +388,13 @@ elif menu == "📋 Afastamentos":
                                 st.error("A data de início não pode ser posterior à data de fim.")
                             else:
                                 afastamento_selecionado.tipo = tipo
-                                afastamento_selecionado.data_inicio = datetime.combine(data_inicio, datetime.min.time())
-                                afastamento_selecionado.data_fim = datetime.combine(data_fim, datetime.min.time())
+                                afastamento_selecionado.data_inicio = datetime.combine(data_inicio, MEIA_NOITE)
+                                afastamento_selecionado.data_fim = datetime.combine(data_fim, MEIA_NOITE)
                                 afastamento_selecionado.motivo = motivo
                                 afastamento_selecionado.observacoes = observacoes
                                 
-                                st.session_state.db.atualizar_afastamento(afastamento_selecionado)
+                                db.atualizar_afastamento(afastamento_selecionado)
+                                limpar_cache('afastamentos')
                                 st.success("Afastamento atualizado com sucesso!")
                                 st.rerun()
                 
@@ -404,15 +404,22 @@ elif menu == "📋 Afastamentos":
                     st.warning(f"⚠️ Você está prestes a deletar o afastamento de **{funcionario_selecionado.nome}**.")
                     
                     if st.button("🗑️ Deletar Afastamento", use_container_width=True, type="secondary"):
-                        st.session_state.db.deletar_afastamento(afastamento_selecionado.id)
+                        db.deletar_afastamento(afastamento_selecionado.id)
+                        limpar_cache('afastamentos')
                         st.success("Afastamento deletado com sucesso!")
                         st.rerun()
             else:
                 st.info("Nenhum afastamento cadastrado.")
         else:
             st.info("Nenhum funcionário cadastrado.")
+
+
 # ============ PÁGINA: RELATÓRIOS ============
-elif menu == "📈 Relatórios":
+@st.fragment
+def _pagina_relatorios():
+    """Página de relatórios."""
+    from src.pages.graficos import grafico_afastamentos_por_tipo
+    
     st.markdown("<h1 style='text-align: center; color: #FF6B6B;'>📈 Relatórios</h1>", unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["Afastamentos por Período", "Resumo por Tipo", "Férias"])
@@ -432,116 +439,61 @@ elif menu == "📈 Relatórios":
             if data_inicio > data_fim:
                 st.error("A data de início não pode ser posterior à data de fim.")
             else:
-                afastamentos = st.session_state.db.listar_afastamentos_por_periodo(
-                    datetime.combine(data_inicio, datetime.min.time()),
-                    datetime.combine(data_fim, datetime.min.time())
+                df = get_afastamentos_por_periodo(
+                    datetime.combine(data_inicio, MEIA_NOITE),
+                    datetime.combine(data_fim, MEIA_NOITE)
                 )
                 
-                if afastamentos:
-                    df_data = []
-                    for aft in afastamentos:
-                        func = st.session_state.db.obter_funcionario(aft.funcionario_id)
-                        df_data.append({
-                            'Funcionário': func.nome if func else 'N/A',
-                            'Tipo': aft.tipo,
-                            'Início': aft.data_inicio.strftime('%d/%m/%Y'),
-                            'Fim': aft.data_fim.strftime('%d/%m/%Y'),
-                            'Dias': aft.dias_afastamento(),
-                            'Motivo': aft.motivo
-                        })
-                    
-                    df = pd.DataFrame(df_data)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
+                if not df.empty:
+                    st.dataframe(df.drop(columns='funcionario_id'), use_container_width=True, hide_index=True)
                     
                     # Estatísticas
                     st.markdown("---")
                     col1, col2, col3 = st.columns(3)
                     
                     with col1:
-                        st.metric("Total de Afastamentos", len(afastamentos))
+                        st.metric("Total de Afastamentos", len(df))
                     
                     with col2:
-                        total_dias = sum(aft.dias_afastamento() for aft in afastamentos)
-                        st.metric("Total de Dias", total_dias)
+                        st.metric("Total de Dias", int(df['Dias'].sum()))
                     
                     with col3:
-                        funcionarios_unicos = len(set(aft.funcionario_id for aft in afastamentos))
-                        st.metric("Funcionários Afastados", funcionarios_unicos)
+                        st.metric("Funcionários Afastados", df['funcionario_id'].nunique())
                 else:
                     st.info("Nenhum afastamento encontrado no período.")
     
     with tab2:
         st.subheader("Resumo de Afastamentos por Tipo")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=False)
+        df_tipos = get_resumo_afastamentos_por_tipo()
         
-        if funcionarios:
-            todos_afastamentos = []
-            for func in funcionarios:
-                afastamentos = st.session_state.db.listar_afastamentos_por_funcionario(func.id)
-                todos_afastamentos.extend(afastamentos)
+        if not df_tipos.empty:
+            col1, col2 = st.columns(2)
             
-            if todos_afastamentos:
-                # Conta afastamentos por tipo
-                tipos_count = {}
-                tipos_dias = {}
-                
-                for aft in todos_afastamentos:
-                    tipos_count[aft.tipo] = tipos_count.get(aft.tipo, 0) + 1
-                    tipos_dias[aft.tipo] = tipos_dias.get(aft.tipo, 0) + aft.dias_afastamento()
-                
-                df_tipos = pd.DataFrame({
-                    'Tipo': list(tipos_count.keys()),
-                    'Quantidade': list(tipos_count.values()),
-                    'Total de Dias': [tipos_dias[t] for t in tipos_count.keys()]
-                })
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.dataframe(df_tipos, use_container_width=True, hide_index=True)
-                
-                with col2:
-                    fig = ChartManager.gráfico_afastamentos_por_tipo(todos_afastamentos)
-                    st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("Nenhum afastamento registrado.")
+            with col1:
+                st.dataframe(df_tipos, use_container_width=True, hide_index=True)
+            
+            with col2:
+                fig = grafico_afastamentos_por_tipo()
+                st.plotly_chart(fig, use_container_width=True)
         else:
-            st.info("Nenhum funcionário cadastrado.")
+            st.info("Nenhum afastamento registrado.")
     
     with tab3:
         st.subheader("Relatório de Férias")
         
-        funcionarios = st.session_state.db.listar_funcionarios(apenas_ativos=True)
+        df = get_relatorio_ferias()
         
-        if funcionarios:
-            ferias_manager = FeriasManager()
-            
-            df_data = []
-            for func in funcionarios:
-                dias_disponiveis = ferias_manager.calcular_dias_ferias(func.data_admissao)
-                
-                # Calcula dias utilizados
-                afastamentos = st.session_state.db.listar_afastamentos_por_funcionario(func.id)
-                dias_utilizados = sum(
-                    aft.dias_afastamento() for aft in afastamentos
-                    if aft.tipo == "Férias"
-                )
-                
-                df_data.append({
-                    'Nome': func.nome,
-                    'Data Admissão': func.data_admissao.strftime('%d/%m/%Y') if func.data_admissao else 'N/A',
-                    'Dias Disponíveis': dias_disponiveis,
-                    'Dias Utilizados': dias_utilizados,
-                    'Saldo': dias_disponiveis - dias_utilizados
-                })
-            
-            df = pd.DataFrame(df_data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.info("Nenhum funcionário cadastrado.")
+
+
 # ============ PÁGINA: USUÁRIOS ============
-elif menu == "👨‍💼 Usuários":
+@st.fragment
+def _pagina_usuarios():
+    """Página de usuários."""
     if not usuario.tem_permissao("criar_usuario"):
         st.error("Você não tem permissão para acessar esta página.")
     else:
@@ -552,20 +504,9 @@ elif menu == "👨‍💼 Usuários":
         with tab1:
             st.subheader("Lista de Usuários")
             
-            usuarios = st.session_state.db.listar_usuarios(apenas_ativos=True)
+            df = get_tabela_usuarios()
             
-            if usuarios:
-                df_data = []
-                for user in usuarios:
-                    df_data.append({
-                        'Nome': user.nome,
-                        'Email': user.email,
-                        'Usuário': user.username,
-                        'Perfil': user.perfil,
-                        'Último Acesso': user.ultimo_acesso.strftime('%d/%m/%Y %H:%M') if user.ultimo_acesso else 'Nunca'
-                    })
-                
-                df = pd.DataFrame(df_data)
+            if not df.empty:
                 st.dataframe(df, use_container_width=True, hide_index=True)
             else:
                 st.info("Nenhum usuário cadastrado.")
@@ -573,8 +514,6 @@ elif menu == "👨‍💼 Usuários":
         with tab2:
             st.subheader("Adicionar Novo Usuário")
             
-            from src.models import PerfilUsuario
-            
             with st.form("form_novo_usuario"):
                 nome = st.text_input("Nome Completo *")
                 email = st.text_input("Email *")
@@ -582,7 +521,7 @@ elif menu == "👨‍💼 Usuários":
                 senha = st.text_input("Senha *", type="password")
                 perfil = st.selectbox(
                     "Perfil *",
-                    [p.value for p in PerfilUsuario]
+                    PERFIL_USUARIO_VALUES
                 )
                 
                 submitted = st.form_submit_button("✅ Adicionar Usuário", use_container_width=True)
@@ -590,8 +529,10 @@ elif menu == "👨‍💼 Usuários":
                 if submitted:
                     if not all([nome, email, username, senha]):
                         st.error("Por favor, preencha todos os campos obrigatórios.")
+                    elif not Validators.validar_email(email):
+                        st.error("Email inválido.")
                     else:
-                        novo_usuario = st.session_state.auth.criar_usuario(
+                        novo_usuario, erro = auth.criar_usuario(
                             nome=nome,
                             email=email,
                             username=username,
@@ -600,13 +541,20 @@ elif menu == "👨‍💼 Usuários":
                         )
                         
                         if novo_usuario:
+                            limpar_cache('usuarios')
                             st.success("Usuário adicionado com sucesso!")
                             st.rerun()
+                        elif erro == auth.ERRO_USERNAME_EM_USO:
+                            st.error("Este usuário já existe.")
+                        elif erro == auth.ERRO_EMAIL_EM_USO:
+                            st.error("Este email já está cadastrado.")
                         else:
-                            st.error("Erro ao criar o usuário. Verifique se o username ou email já existem.")
+                            st.error("Erro ao criar o usuário.")
 
 # ============ PÁGINA: CONFIGURAÇÕES ============
-elif menu == "⚙️ Configurações":
+@st.fragment
+def _pagina_configuracoes():
+    """Página de configurações."""
     st.markdown("<h1 style='text-align: center; color: #FF6B6B;'>⚙️ Configurações</h1>", unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["Perfil", "Segurança", "Sobre"])
@@ -640,7 +588,7 @@ elif menu == "⚙️ Configurações":
                 elif len(senha_nova) < 6:
                     st.error("A nova senha deve ter pelo menos 6 caracteres.")
                 else:
-                    if st.session_state.auth.alterar_senha(usuario.id, senha_atual, senha_nova):
+                    if auth.alterar_senha(usuario.id, senha_atual, senha_nova):
                         st.success("Senha alterada com sucesso!")
                     else:
                         st.error("Senha atual incorreta.")
@@ -664,3 +612,16 @@ elif menu == "⚙️ Configurações":
         - ✅ Backup automático
         - ✅ Notificações
         """)
+
+
+# Cada página roda em um fragmento: interações nos widgets reexecutam só a página ativa
+PAGINAS = {
+    "📊 Dashboard": _pagina_dashboard,
+    "👥 Funcionários": _pagina_funcionarios,
+    "📋 Afastamentos": _pagina_afastamentos,
+    "📈 Relatórios": _pagina_relatorios,
+    "👨‍💼 Usuários": _pagina_usuarios,
+    "⚙️ Configurações": _pagina_configuracoes,
+}
+
+PAGINAS[menu]()
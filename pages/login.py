@@ -3,13 +3,10 @@ Página de login da aplicação.
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 
-# Adiciona o diretório raiz ao path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.utils import DatabaseSQL, AuthManager
+from src.utils.bootstrap import get_auth
+from src.pages.data import limpar_cache
+from src.utils.validators import Validators
 from src.models import PerfilUsuario
 
 # Configuração da página
@@ -20,38 +17,16 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# CSS customizado
-st.markdown("""
-<style>
-    .login-container {
-        max-width: 400px;
-        margin: 50px auto;
-        padding: 2rem;
-        border-radius: 10px;
-        background-color: #f0f2f6;
-    }
-    .login-title {
-        text-align: center;
-        color: #FF6B6B;
-        margin-bottom: 2rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Inicializa o banco de dados
-if 'db' not in st.session_state:
-    st.session_state.db = DatabaseSQL()
-
-if 'auth' not in st.session_state:
-    st.session_state.auth = AuthManager(st.session_state.db)
+# Autenticação compartilhada entre as sessões
+auth = get_auth()
 
 # Se o usuário já está logado, redireciona para a página principal
 if 'usuario_logado' in st.session_state and st.session_state.usuario_logado:
     st.switch_page("pages/dashboard.py")
 
 # Página de Login
-st.markdown("<h1 class='login-title'>🏢 RH Control</h1>", unsafe_allow_html=True)
-st.markdown("<h3 class='login-title'>Sistema de Gestão de RH</h3>", unsafe_allow_html=True)
+st.markdown("<h1 style='text-align: center; color: #FF6B6B; margin-bottom: 2rem;'>🏢 RH Control</h1>", unsafe_allow_html=True)
+st.markdown("<h3 style='text-align: center; color: #FF6B6B; margin-bottom: 2rem;'>Sistema de Gestão de RH</h3>", unsafe_allow_html=True)
 
 st.markdown("---")
 
@@ -71,7 +46,7 @@ with tab1:
             if not username or not senha:
                 st.error("Por favor, preencha todos os campos.")
             else:
-                usuario = st.session_state.auth.autenticar(username, senha)
+                usuario = auth.autenticar(username, senha)
                 
                 if usuario:
                     st.session_state.usuario_logado = usuario
@@ -103,25 +78,26 @@ with tab2:
                 st.error("As senhas não correspondem.")
             elif len(senha) < 6:
                 st.error("A senha deve ter pelo menos 6 caracteres.")
+            elif not Validators.validar_email(email):
+                st.error("Email inválido.")
             else:
-                # Verifica se o username já existe
-                if st.session_state.auth.obter_usuario_por_username(username):
+                novo_usuario, erro = auth.criar_usuario(
+                    nome=nome,
+                    email=email,
+                    username=username,
+                    senha=senha,
+                    perfil=PerfilUsuario.FUNCIONARIO.value
+                )
+                
+                if novo_usuario:
+                    limpar_cache('usuarios')
+                    st.success("Conta criada com sucesso! Faça login para continuar.")
+                elif erro == auth.ERRO_USERNAME_EM_USO:
                     st.error("Este usuário já existe.")
-                elif st.session_state.auth.obter_usuario_por_email(email):
+                elif erro == auth.ERRO_EMAIL_EM_USO:
                     st.error("Este email já está cadastrado.")
                 else:
-                    novo_usuario = st.session_state.auth.criar_usuario(
-                        nome=nome,
-                        email=email,
-                        username=username,
-                        senha=senha,
-                        perfil=PerfilUsuario.FUNCIONARIO.value
-                    )
-                    
-                    if novo_usuario:
-                        st.success("Conta criada com sucesso! Faça login para continuar.")
-                    else:
-                        st.error("Erro ao criar a conta.")
+                    st.error("Erro ao criar a conta.")
 
 st.markdown("---")
 
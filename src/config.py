@@ -14,6 +14,9 @@ DATA_DIR = BASE_DIR / "src" / "data"
 # Configurações de banco de dados
 DATABASE_TYPE = os.getenv("DATABASE_TYPE", "json")  # json ou sqlite
 DATABASE_URL = os.getenv("DATABASE_URL", str(DATA_DIR / "rh_control.db"))
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", 30))  # Segundos esperando o lock do SQLite
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))  # Bytes do arquivo lidos via mmap (0 desliga)
+DB_CACHED_STATEMENTS = int(os.getenv("DB_CACHED_STATEMENTS", 256))  # Comandos SQL já compilados mantidos por conexão
 
 # Configurações de email
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -21,6 +24,7 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
 EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@rhcontrol.com")
+SMTP_NOOP_INTERVALO = float(os.getenv("SMTP_NOOP_INTERVALO", 30))  # Segundos ociosos antes de testar a conexão SMTP com NOOP
 
 # Configurações de segurança
 SECRET_KEY = os.getenv("SECRET_KEY", "sua-chave-secreta-aqui-mude-em-producao")
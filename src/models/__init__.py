@@ -1,7 +1,28 @@
 """Modelos de dados da aplicação."""
 
-from .funcionario import Funcionario
-from .afastamento import Afastamento, TipoAfastamento
-from .usuario import Usuario, PerfilUsuario
+import importlib
+
+# Nome exportado -> submódulo que o define (importado só no primeiro acesso)
+_EXPORTS = {
+    "Funcionario": ".funcionario",
+    "Afastamento": ".afastamento",
+    "TipoAfastamento": ".afastamento",
+    "Usuario": ".usuario",
+    "PerfilUsuario": ".usuario",
+}
 
 __all__ = ["Funcionario", "Afastamento", "TipoAfastamento", "Usuario", "PerfilUsuario"]
+
+
+def __getattr__(name: str):
+    """Importa sob demanda o submódulo do nome pedido (PEP 562)."""
+    if name in _EXPORTS:
+        valor = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Inclui os nomes ainda não importados (para autocompletar)."""
+    return sorted(set(globals()) | set(__all__))
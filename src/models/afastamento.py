@@ -2,7 +2,7 @@
 Modelo de dados para Afastamentos.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -19,7 +19,7 @@ class TipoAfastamento(Enum):
     OUTRO = "Outro"
 
 
-@dataclass
+@dataclass(slots=True)
 class Afastamento:
     """Classe que representa um afastamento de funcionário."""
     
@@ -33,10 +33,12 @@ class Afastamento:
     documento_anexo: Optional[str] = None
     data_criacao: Optional[datetime] = None
     data_atualizacao: Optional[datetime] = None
+    # (data_inicio, data_fim, dias) do último cálculo de dias_afastamento
+    _dias_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self):
         """Converte o objeto para dicionário."""
-        return asdict(self)
+        return {campo: getattr(self, campo) for campo in self._CAMPOS}
     
     @classmethod
     def from_dict(cls, data: dict):
@@ -44,7 +46,19 @@ class Afastamento:
         return cls(**data)
     
     def dias_afastamento(self) -> int:
-        """Calcula o número de dias de afastamento."""
+        """Calcula o número de dias de afastamento (memoizado enquanto as datas não mudam)."""
+        cache = self._dias_cache
+        if cache is not None and cache[0] is self.data_inicio and cache[1] is self.data_fim:
+            return cache[2]
+        
         if self.data_inicio and self.data_fim:
-            return (self.data_fim - self.data_inicio).days + 1
-        return 0
+            dias = (self.data_fim - self.data_inicio).days + 1
+        else:
+            dias = 0
+        
+        self._dias_cache = (self.data_inicio, self.data_fim, dias)
+        return dias
+
+
+# Nomes dos campos, na ordem da declaração (usados por to_dict)
+Afastamento._CAMPOS = tuple(campo.name for campo in fields(Afastamento) if campo.init)
@@ -2,12 +2,12 @@
 Modelo de dados para Funcionários.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Funcionario:
     """Classe que representa um funcionário."""
     
@@ -27,9 +27,13 @@ class Funcionario:
     
     def to_dict(self):
         """Converte o objeto para dicionário."""
-        return asdict(self)
+        return {campo: getattr(self, campo) for campo in self._CAMPOS}
     
     @classmethod
     def from_dict(cls, data: dict):
         """Cria um objeto Funcionario a partir de um dicionário."""
         return cls(**data)
+
+
+# Nomes dos campos, na ordem da declaração (usados por to_dict)
+Funcionario._CAMPOS = tuple(campo.name for campo in fields(Funcionario))
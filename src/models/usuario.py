@@ -2,11 +2,28 @@
 Modelo de dados para Usuários.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from enum import Enum
 import hashlib
+import hmac
+from functools import lru_cache
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+
+# Argon2id com custo ajustado para ~200-400ms por verificação
+_PH = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=4)
+
+# Senhas podem chegar já codificadas (bytes) para evitar re-encodes
+Senha = Union[str, bytes]
+
+
+@lru_cache(maxsize=1)
+def _hash_ficticio() -> str:
+    """Hash descartável usado para igualar o tempo de logins com usuário inexistente."""
+    return _PH.hash("senha-ficticia-sem-usuario")
 
 
 class PerfilUsuario(Enum):
@@ -17,7 +34,32 @@ class PerfilUsuario(Enum):
     FUNCIONARIO = "Funcionário"
 
 
-@dataclass
+# Ações permitidas por perfil (montadas uma vez, na importação)
+_PERMISSOES = {
+    PerfilUsuario.ADMIN.value: frozenset({
+        "criar_usuario", "editar_usuario", "deletar_usuario",
+        "criar_funcionario", "editar_funcionario", "deletar_funcionario",
+        "criar_afastamento", "editar_afastamento", "deletar_afastamento",
+        "gerar_relatorio", "exportar_dados", "backup", "configuracoes"
+    }),
+    PerfilUsuario.GERENTE.value: frozenset({
+        "criar_funcionario", "editar_funcionario",
+        "criar_afastamento", "editar_afastamento",
+        "gerar_relatorio", "exportar_dados"
+    }),
+    PerfilUsuario.RH.value: frozenset({
+        "criar_funcionario", "editar_funcionario", "deletar_funcionario",
+        "criar_afastamento", "editar_afastamento", "deletar_afastamento",
+        "gerar_relatorio", "exportar_dados"
+    }),
+    PerfilUsuario.FUNCIONARIO.value: frozenset({
+        "visualizar_dados_pessoais", "solicitar_afastamento"
+    })
+}
+_SEM_PERMISSOES = frozenset()
+
+
+@dataclass(slots=True)
 class Usuario:
     """Classe que representa um usuário do sistema."""
     
@@ -34,7 +76,7 @@ class Usuario:
     
     def to_dict(self):
         """Converte o objeto para dicionário."""
-        return asdict(self)
+        return {campo: getattr(self, campo) for campo in self._CAMPOS}
     
     @classmethod
     def from_dict(cls, data: dict):
@@ -42,40 +84,47 @@ class Usuario:
         return cls(**data)
     
     @staticmethod
-    def hash_senha(senha: str) -> str:
-        """Gera o hash de uma senha usando SHA-256."""
-        return hashlib.sha256(senha.encode()).hexdigest()
+    def hash_senha(senha: Senha) -> str:
+        """Gera o hash de uma senha usando Argon2id (com salt)."""
+        return _PH.hash(senha)
+    
+    def _hash_legado(self) -> bool:
+        """Indica se o hash armazenado é do formato antigo (SHA-256 sem salt)."""
+        return not self.senha_hash.startswith('$argon2')
     
-    def verificar_senha(self, senha: str) -> bool:
+    def verificar_senha(self, senha: Senha) -> bool:
         """Verifica se a senha fornecida corresponde ao hash armazenado."""
-        return self.senha_hash == self.hash_senha(senha)
+        if self._hash_legado():
+            if isinstance(senha, str):
+                senha = senha.encode()
+            legado = hashlib.sha256(senha).hexdigest()
+            return hmac.compare_digest(self.senha_hash, legado)
+        
+        try:
+            return _PH.verify(self.senha_hash, senha)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    @staticmethod
+    def simular_verificacao(senha: Senha) -> None:
+        """Faz uma verificação Argon2 descartável, com o mesmo custo de um login real."""
+        try:
+            _PH.verify(_hash_ficticio(), senha)
+        except VerificationError:
+            pass
+    
+    def precisa_rehash(self) -> bool:
+        """Indica se a senha deve ser refeita com os parâmetros atuais (ou migrada do SHA-256)."""
+        return self._hash_legado() or _PH.check_needs_rehash(self.senha_hash)
     
-    def definir_senha(self, senha: str):
+    def definir_senha(self, senha: Senha):
         """Define uma nova senha (armazenada como hash)."""
         self.senha_hash = self.hash_senha(senha)
     
     def tem_permissao(self, acao: str) -> bool:
         """Verifica se o usuário tem permissão para realizar uma ação."""
-        permissoes = {
-            PerfilUsuario.ADMIN.value: [
-                "criar_usuario", "editar_usuario", "deletar_usuario",
-                "criar_funcionario", "editar_funcionario", "deletar_funcionario",
-                "criar_afastamento", "editar_afastamento", "deletar_afastamento",
-                "gerar_relatorio", "exportar_dados", "backup", "configuracoes"
-            ],
-            PerfilUsuario.GERENTE.value: [
-                "criar_funcionario", "editar_funcionario",
-                "criar_afastamento", "editar_afastamento",
-                "gerar_relatorio", "exportar_dados"
-            ],
-            PerfilUsuario.RH.value: [
-                "criar_funcionario", "editar_funcionario", "deletar_funcionario",
-                "criar_afastamento", "editar_afastamento", "deletar_afastamento",
-                "gerar_relatorio", "exportar_dados"
-            ],
-            PerfilUsuario.FUNCIONARIO.value: [
-                "visualizar_dados_pessoais", "solicitar_afastamento"
-            ]
-        }
-        
-        return acao in permissoes.get(self.perfil, [])
+        return acao in _PERMISSOES.get(self.perfil, _SEM_PERMISSOES)
+
+
+# Nomes dos campos, na ordem da declaração (usados por to_dict)
+Usuario._CAMPOS = tuple(campo.name for campo in fields(Usuario))
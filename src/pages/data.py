@@ -0,0 +1,240 @@
+"""
+Leituras cacheadas compartilhadas pelas páginas.
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from src.models import Funcionario, Afastamento, Usuario
+from src.utils.bootstrap import get_db
+from src.utils.ferias import FeriasManager
+
+
+# Entidades com revisão própria: as leituras cacheadas recebem a revisão das
+# entidades de que dependem, então uma alteração só invalida essas leituras
+ENTIDADES = ('funcionarios', 'afastamentos', 'usuarios')
+
+
+@st.cache_resource
+def _revisoes() -> Dict[str, int]:
+    """Contadores de revisão por entidade, compartilhados entre as sessões."""
+    return dict.fromkeys(ENTIDADES, 0)
+
+
+def _revisao(*entidades: str) -> Tuple[int, ...]:
+    """Retorna a revisão atual das entidades informadas."""
+    revisoes = _revisoes()
+    return tuple(revisoes[entidade] for entidade in entidades)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _funcionarios(revisao: Tuple[int, ...], apenas_ativos: bool = True) -> Tuple[Funcionario, ...]:
+    """Consulta cacheada de get_funcionarios."""
+    return tuple(get_db().iter_funcionarios(apenas_ativos=apenas_ativos))
+
+
+def get_funcionarios(apenas_ativos: bool = True) -> Tuple[Funcionario, ...]:
+    """Lista os funcionários (cacheado por revisão dos dados)."""
+    return _funcionarios(_revisao('funcionarios'), apenas_ativos)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _funcionarios_por_id(revisao: Tuple[int, ...], apenas_ativos: bool = True) -> Dict[int, Funcionario]:
+    """Consulta cacheada de get_funcionarios_por_id."""
+    return {f.id: f for f in get_funcionarios(apenas_ativos=apenas_ativos)}
+
+
+def get_funcionarios_por_id(apenas_ativos: bool = True) -> Dict[int, Funcionario]:
+    """Indexa os funcionários por ID (cacheado por revisão dos dados)."""
+    return _funcionarios_por_id(_revisao('funcionarios'), apenas_ativos)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _opcoes_funcionarios(revisao: Tuple[int, ...], apenas_ativos: bool = True) -> Tuple[Tuple[int, str], ...]:
+    """Consulta cacheada de get_opcoes_funcionarios."""
+    return tuple(get_db().listar_funcionarios_tuplas(['id', 'nome'], apenas_ativos=apenas_ativos))
+
+
+def get_opcoes_funcionarios(apenas_ativos: bool = True) -> Tuple[Tuple[int, str], ...]:
+    """Lista pares (id, nome) dos funcionários para selectboxes (cacheado por revisão dos dados)."""
+    return _opcoes_funcionarios(_revisao('funcionarios'), apenas_ativos)
+
+
+@lru_cache(maxsize=32)
+def _dtype_categorias(valores: frozenset) -> pd.CategoricalDtype:
+    """Dtype categórico (ordenado) para um conjunto de valores, reaproveitado entre revisões."""
+    return pd.CategoricalDtype(sorted(valores))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _funcionarios_df(revisao: Tuple[int, ...], apenas_ativos: bool = True) -> pd.DataFrame:
+    """Consulta cacheada de get_funcionarios_df."""
+    colunas = ['id', 'nome', 'loja', 'cargo', 'salario', 'ativo']
+    rows = get_db().listar_funcionarios_tuplas(colunas, apenas_ativos=apenas_ativos)
+    df = pd.DataFrame.from_records(rows, columns=colunas).fillna({'loja': '', 'cargo': ''})
+    # Loja e cargo como categorias: agrupamentos por código inteiro e menos memória por linha
+    return df.astype({
+        'id': 'int32',
+        'loja': _dtype_categorias(frozenset(df['loja'].unique())),
+        'cargo': _dtype_categorias(frozenset(df['cargo'].unique())),
+        'ativo': bool
+    })
+
+
+def get_funcionarios_df(apenas_ativos: bool = True) -> pd.DataFrame:
+    """Carrega os campos usados nos gráficos em um DataFrame (cacheado por revisão dos dados)."""
+    return _funcionarios_df(_revisao('funcionarios'), apenas_ativos)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _tabela_funcionarios(revisao: Tuple[int, ...]) -> pd.DataFrame:
+    """Consulta cacheada de get_tabela_funcionarios."""
+    rows = get_db().listar_funcionarios_tuplas(['id', 'nome', 'cpf', 'email', 'cargo', 'loja', 'salario'])
+    return pd.DataFrame.from_records(rows, columns=['ID', 'Nome', 'CPF', 'Email', 'Cargo', 'Loja', 'Salário'])
+
+
+def get_tabela_funcionarios() -> pd.DataFrame:
+    """Monta a listagem de funcionários ativos direto das tuplas do banco (cacheado por revisão dos dados)."""
+    return _tabela_funcionarios(_revisao('funcionarios'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _estatisticas_funcionarios(revisao: Tuple[int, ...]) -> Dict[str, Any]:
+    """Consulta cacheada de get_estatisticas_funcionarios."""
+    return get_db().obter_estatisticas_funcionarios(apenas_ativos=True)
+
+
+def get_estatisticas_funcionarios() -> Dict[str, Any]:
+    """Retorna as métricas do dashboard calculadas no banco (cacheado por revisão dos dados)."""
+    return _estatisticas_funcionarios(_revisao('funcionarios'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _afastamentos(revisao: Tuple[int, ...], funcionario_ids: Optional[Tuple[int, ...]] = None, tipo: Optional[str] = None) -> Tuple[Afastamento, ...]:
+    """Consulta cacheada de get_afastamentos."""
+    ids = list(funcionario_ids) if funcionario_ids is not None else None
+    return tuple(get_db().listar_afastamentos(funcionario_ids=ids, tipo=tipo))
+
+
+def get_afastamentos(funcionario_ids: Optional[Tuple[int, ...]] = None, tipo: Optional[str] = None) -> Tuple[Afastamento, ...]:
+    """Lista os afastamentos em uma única consulta (cacheado por revisão dos dados)."""
+    return _afastamentos(_revisao('afastamentos'), funcionario_ids, tipo)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _afastamentos_por_id(revisao: Tuple[int, ...]) -> Dict[int, Afastamento]:
+    """Consulta cacheada de get_afastamentos_por_id."""
+    return {aft.id: aft for aft in get_afastamentos()}
+
+
+def get_afastamentos_por_id() -> Dict[int, Afastamento]:
+    """Indexa todos os afastamentos por ID (cacheado por revisão dos dados)."""
+    return _afastamentos_por_id(_revisao('afastamentos'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _tabela_afastamentos(revisao: Tuple[int, ...], pagina: int, tamanho: int) -> pd.DataFrame:
+    """Consulta cacheada de get_tabela_afastamentos."""
+    rows = get_db().listar_afastamentos_pagina((pagina - 1) * tamanho, tamanho)
+    df = pd.DataFrame.from_records(rows, columns=['Funcionário', 'Tipo', 'Início', 'Fim', 'Dias', 'Motivo'])
+    for coluna in ('Início', 'Fim'):
+        df[coluna] = pd.to_datetime(df[coluna]).dt.strftime('%d/%m/%Y').fillna('N/A')
+    return df
+
+
+def get_tabela_afastamentos(pagina: int = 1, tamanho: int = 50) -> pd.DataFrame:
+    """Monta uma página da listagem de afastamentos direto das tuplas do banco (cacheado por revisão dos dados)."""
+    return _tabela_afastamentos(_revisao('funcionarios', 'afastamentos'), pagina, tamanho)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _total_afastamentos(revisao: Tuple[int, ...]) -> int:
+    """Consulta cacheada de get_total_afastamentos."""
+    return get_db().contar_afastamentos()
+
+
+def get_total_afastamentos() -> int:
+    """Conta os afastamentos da listagem (cacheado por revisão dos dados)."""
+    return _total_afastamentos(_revisao('funcionarios', 'afastamentos'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _afastamentos_por_periodo(revisao: Tuple[int, ...], data_inicio: datetime, data_fim: datetime) -> pd.DataFrame:
+    """Consulta cacheada de get_afastamentos_por_periodo."""
+    rows = get_db().listar_afastamentos_por_periodo_com_nome(data_inicio, data_fim)
+    df = pd.DataFrame.from_records(
+        rows,
+        columns=['funcionario_id', 'Funcionário', 'Tipo', 'Início', 'Fim', 'Dias', 'Motivo']
+    )
+    df['Funcionário'] = df['Funcionário'].fillna('N/A')
+    for coluna in ('Início', 'Fim'):
+        df[coluna] = pd.to_datetime(df[coluna]).dt.strftime('%d/%m/%Y')
+    return df
+
+
+def get_afastamentos_por_periodo(data_inicio: datetime, data_fim: datetime) -> pd.DataFrame:
+    """Monta o relatório de afastamentos de um período, com o nome do funcionário (cacheado por revisão dos dados)."""
+    return _afastamentos_por_periodo(_revisao('funcionarios', 'afastamentos'), data_inicio, data_fim)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _relatorio_ferias(revisao: Tuple[int, ...]) -> pd.DataFrame:
+    """Consulta cacheada de get_relatorio_ferias."""
+    rows = get_db().relatorio_ferias(apenas_ativos=True)
+    df = pd.DataFrame.from_records(rows, columns=['id', 'Nome', 'Data Admissão', 'Dias Utilizados'])
+    admissao = pd.to_datetime(df['Data Admissão'])
+    df['Dias Disponíveis'] = FeriasManager.calcular_dias_ferias_disponiveis_vec(admissao)
+    df['Saldo'] = df['Dias Disponíveis'] - df['Dias Utilizados']
+    df['Data Admissão'] = admissao.dt.strftime('%d/%m/%Y').fillna('N/A')
+    return df[['Nome', 'Data Admissão', 'Dias Disponíveis', 'Dias Utilizados', 'Saldo']]
+
+
+def get_relatorio_ferias() -> pd.DataFrame:
+    """Monta o relatório de férias dos funcionários ativos (cacheado por revisão dos dados)."""
+    return _relatorio_ferias(_revisao('funcionarios', 'afastamentos'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _resumo_afastamentos_por_tipo(revisao: Tuple[int, ...]) -> pd.DataFrame:
+    """Consulta cacheada de get_resumo_afastamentos_por_tipo."""
+    rows = get_db().resumo_afastamentos_por_tipo()
+    return pd.DataFrame.from_records(rows, columns=['Tipo', 'Quantidade', 'Total de Dias'])
+
+
+def get_resumo_afastamentos_por_tipo() -> pd.DataFrame:
+    """Resumo de afastamentos por tipo calculado no banco (cacheado por revisão dos dados)."""
+    return _resumo_afastamentos_por_tipo(_revisao('afastamentos'))
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _usuarios(revisao: Tuple[int, ...], apenas_ativos: bool = True) -> Tuple[Usuario, ...]:
+    """Consulta cacheada de get_usuarios."""
+    return tuple(get_db().iter_usuarios(apenas_ativos=apenas_ativos))
+
+
+def get_usuarios(apenas_ativos: bool = True) -> Tuple[Usuario, ...]:
+    """Lista os usuários (cacheado por revisão dos dados)."""
+    return _usuarios(_revisao('usuarios'), apenas_ativos)
+
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _tabela_usuarios(revisao: Tuple[int, ...]) -> pd.DataFrame:
+    """Consulta cacheada de get_tabela_usuarios."""
+    rows = get_db().listar_usuarios_tuplas(['nome', 'email', 'username', 'perfil', 'ultimo_acesso'])
+    df = pd.DataFrame.from_records(rows, columns=['Nome', 'Email', 'Usuário', 'Perfil', 'Último Acesso'])
+    df['Último Acesso'] = pd.to_datetime(df['Último Acesso']).dt.strftime('%d/%m/%Y %H:%M').fillna('Nunca')
+    return df
+
+
+def get_tabela_usuarios() -> pd.DataFrame:
+    """Monta a listagem de usuários ativos direto das tuplas do banco (cacheado por revisão dos dados)."""
+    return _tabela_usuarios(_revisao('usuarios'))
+
+
+def limpar_cache(*entidades: str) -> None:
+    """Avança a revisão das entidades alteradas (todas, se nenhuma for informada), invalidando só as leituras que dependem delas."""
+    revisoes = _revisoes()
+    for entidade in entidades or ENTIDADES:
+        revisoes[entidade] += 1
@@ -0,0 +1,75 @@
+"""
+Gráficos cacheados compartilhados pelas páginas.
+
+Os gráficos leem os próprios dados de src.pages.data e são cacheados pela
+revisão das entidades (o mesmo contador das consultas): enquanto os dados
+não mudam, nem o DataFrame é re-hasheado nem o gráfico é remontado.
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from typing import Dict, Tuple
+from src.pages.data import _revisao, get_funcionarios_df, get_resumo_afastamentos_por_tipo
+from src.utils.charts import ChartManager
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _agregados_funcionarios(revisao: Tuple[int, ...]) -> Dict[str, pd.DataFrame]:
+    """Agregados de todos os gráficos de funcionários ativos, calculados uma vez por revisão."""
+    return ChartManager.agregados_funcionarios(get_funcionarios_df(apenas_ativos=True))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_funcionarios_por_loja(revisao: Tuple[int, ...]) -> go.Figure:
+    """Consulta cacheada de grafico_funcionarios_por_loja."""
+    return ChartManager.gráfico_funcionarios_por_loja(None, _agregados_funcionarios(revisao))
+
+
+def grafico_funcionarios_por_loja() -> go.Figure:
+    """Gráfico de funcionários ativos por loja (cacheado por revisão dos dados)."""
+    return _grafico_funcionarios_por_loja(_revisao('funcionarios'))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_distribuicao_cargos(revisao: Tuple[int, ...]) -> go.Figure:
+    """Consulta cacheada de grafico_distribuicao_cargos."""
+    return ChartManager.gráfico_distribuicao_cargos(None, _agregados_funcionarios(revisao))
+
+
+def grafico_distribuicao_cargos() -> go.Figure:
+    """Gráfico de distribuição de cargos (cacheado por revisão dos dados)."""
+    return _grafico_distribuicao_cargos(_revisao('funcionarios'))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_folha_pagamento_por_loja(revisao: Tuple[int, ...]) -> go.Figure:
+    """Consulta cacheada de grafico_folha_pagamento_por_loja."""
+    return ChartManager.gráfico_folha_pagamento_por_loja(None, _agregados_funcionarios(revisao))
+
+
+def grafico_folha_pagamento_por_loja() -> go.Figure:
+    """Gráfico de folha de pagamento por loja (cacheado por revisão dos dados)."""
+    return _grafico_folha_pagamento_por_loja(_revisao('funcionarios'))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_salarios_por_cargo(revisao: Tuple[int, ...]) -> go.Figure:
+    """Consulta cacheada de grafico_salarios_por_cargo."""
+    return ChartManager.gráfico_salarios_por_cargo(None, _agregados_funcionarios(revisao))
+
+
+def grafico_salarios_por_cargo() -> go.Figure:
+    """Gráfico de salários por cargo (cacheado por revisão dos dados)."""
+    return _grafico_salarios_por_cargo(_revisao('funcionarios'))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _grafico_afastamentos_por_tipo(revisao: Tuple[int, ...]) -> go.Figure:
+    """Consulta cacheada de grafico_afastamentos_por_tipo."""
+    return ChartManager.gráfico_afastamentos_por_tipo(get_resumo_afastamentos_por_tipo())
+
+
+def grafico_afastamentos_por_tipo() -> go.Figure:
+    """Gráfico de afastamentos por tipo (cacheado por revisão dos dados)."""
+    return _grafico_afastamentos_por_tipo(_revisao('afastamentos'))
@@ -1,8 +1,27 @@
 """Utilitários da aplicação."""
 
-from .database import DatabaseManager
-from .database_sql import DatabaseSQL
-from .validators import Validators
-from .auth import AuthManager
+import importlib
+
+# Nome exportado -> submódulo que o define (importado só no primeiro acesso)
+_EXPORTS = {
+    "DatabaseManager": ".database",
+    "DatabaseSQL": ".database_sql",
+    "Validators": ".validators",
+    "AuthManager": ".auth",
+}
 
 __all__ = ["DatabaseManager", "DatabaseSQL", "Validators", "AuthManager"]
+
+
+def __getattr__(name: str):
+    """Importa sob demanda o submódulo do nome pedido (PEP 562)."""
+    if name in _EXPORTS:
+        valor = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Inclui os nomes ainda não importados (para autocompletar)."""
+    return sorted(set(globals()) | set(__all__))
@@ -2,29 +2,39 @@
 Gerenciador de autenticação e controle de acesso.
 """
 
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from src.models import Usuario, PerfilUsuario
-from src.utils.database import DatabaseManager
+from src.utils.database_sql import DatabaseSQL
+
+logger = logging.getLogger(__name__)
+
+# Gravações do último acesso, feitas em segundo plano (o login não espera por elas)
+_ACESSOS = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ultimo-acesso")
+
+
+def _informar_falha(futuro: Future) -> None:
+    """Registra no log a falha de uma gravação em segundo plano."""
+    erro = futuro.exception()
+    if erro is not None:
+        logger.error("Erro ao registrar o último acesso", exc_info=erro)
 
 
 class AuthManager:
     """Gerenciador de autenticação de usuários."""
     
-    def __init__(self, db: DatabaseManager):
+    # Motivos de recusa devolvidos por criar_usuario
+    ERRO_USERNAME_EM_USO = "username_taken"
+    ERRO_EMAIL_EM_USO = "email_taken"
+    
+    def __init__(self, db: DatabaseSQL):
         """Inicializa o gerenciador de autenticação."""
         self.db = db
     
-    def criar_usuario(self, nome: str, email: str, username: str, senha: str, perfil: str = PerfilUsuario.FUNCIONARIO.value) -> Optional[Usuario]:
-        """Cria um novo usuário."""
-        # Verifica se o username já existe
-        if self.obter_usuario_por_username(username):
-            return None
-        
-        # Verifica se o email já existe
-        if self.obter_usuario_por_email(email):
-            return None
-        
+    def criar_usuario(self, nome: str, email: str, username: str, senha: str, perfil: str = PerfilUsuario.FUNCIONARIO.value) -> Tuple[Optional[Usuario], Optional[str]]:
+        """Cria um novo usuário; retorna (usuário, None) ou (None, motivo da recusa)."""
         usuario = Usuario(
             nome=nome,
             email=email,
@@ -33,21 +43,42 @@ class AuthManager:
             ativo=True
         )
         
-        usuario.definir_senha(senha)
-        
-        return self.db.criar_usuario(usuario)
+        # Verificação (uma consulta) e inserção na mesma conexão
+        with self.db.sessao():
+            existente = self.db.obter_usuario_por_username_ou_email(username, email)
+            if existente:
+                if existente.username == username:
+                    return None, self.ERRO_USERNAME_EM_USO
+                return None, self.ERRO_EMAIL_EM_USO
+            
+            usuario.definir_senha(senha)
+            return self.db.criar_usuario(usuario), None
     
     def autenticar(self, username: str, senha: str) -> Optional[Usuario]:
         """Autentica um usuário com username e senha."""
         usuario = self.obter_usuario_por_username(username)
         
-        if usuario and usuario.ativo and usuario.verificar_senha(senha):
-            # Atualiza o último acesso
-            usuario.ultimo_acesso = datetime.now()
-            self.db.atualizar_usuario(usuario)
-            return usuario
+        if usuario is None:
+            # Mesmo custo de um login real, para não revelar quais usernames existem
+            Usuario.simular_verificacao(senha)
+            return None
         
-        return None
+        if not (usuario.ativo and usuario.verificar_senha(senha)):
+            return None
+        
+        usuario.ultimo_acesso = datetime.now()
+        
+        if usuario.precisa_rehash():
+            # Migra hashes antigos (ou com parâmetros desatualizados) no login: o novo
+            # hash é gravado antes de o login terminar, para que uma falha não passe despercebida
+            usuario.definir_senha(senha)
+            self.db.atualizar_usuario(usuario)
+        else:
+            # Só o último acesso (e só essa coluna): gravado em segundo plano, o login não espera pelo UPDATE
+            _ACESSOS.submit(
+                self.db.registrar_ultimo_acesso, usuario.id, usuario.ultimo_acesso
+            ).add_done_callback(_informar_falha)
+        return usuario
     
     def obter_usuario_por_username(self, username: str) -> Optional[Usuario]:
         """Obtém um usuário pelo username."""
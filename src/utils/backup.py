@@ -2,11 +2,34 @@
 Sistema de backup automático de dados.
 """
 
-import shutil
+import os
 import json
+import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+METADATA = "metadata.json"
+
+
+def _serializar_json(dados: Any) -> bytes:
+    """Serializa JSON com orjson (datetimes nativos), ou com o json padrão se não estiver instalado."""
+    if orjson is not None:
+        return orjson.dumps(dados, option=orjson.OPT_INDENT_2)
+    return json.dumps(dados, indent=4, ensure_ascii=False, default=lambda v: v.isoformat()).encode('utf-8')
+
+
+def _desserializar_json(conteudo: bytes) -> Any:
+    """Lê JSON com orjson, ou com o json padrão se não estiver instalado."""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
 
 
 class BackupManager:
@@ -18,29 +41,37 @@ class BackupManager:
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
     
+    def _caminho_backup(self, backup_name: str) -> Path:
+        """Caminho do arquivo .zip de um backup."""
+        return self.backup_dir / f"{backup_name}.zip"
+    
+    def _ler_metadata(self, backup_file: Path) -> dict:
+        """Lê os metadados gravados dentro do .zip de um backup."""
+        with zipfile.ZipFile(backup_file) as zf:
+            return _desserializar_json(zf.read(METADATA))
+    
     def criar_backup(self, descricao: str = "") -> Optional[str]:
-        """Cria um backup completo dos dados."""
+        """Cria um backup completo dos dados (um único .zip por backup)."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"backup_{timestamp}"
-        backup_path = self.backup_dir / backup_name
+        backup_path = self._caminho_backup(backup_name)
         
         try:
-            # Cria o diretório de backup
-            backup_path.mkdir(parents=True, exist_ok=True)
+            # Lista os arquivos JSON uma única vez
+            with os.scandir(self.data_dir) as entradas:
+                arquivos = [e for e in entradas if e.is_file() and e.name.endswith('.json')]
             
-            # Copia todos os arquivos JSON
-            for arquivo in self.data_dir.glob("*.json"):
-                shutil.copy2(arquivo, backup_path / arquivo.name)
-            
-            # Cria um arquivo de metadados
             metadata = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': datetime.now(),
                 'descricao': descricao,
-                'arquivos': [f.name for f in self.data_dir.glob("*.json")]
+                'arquivos': [f.name for f in arquivos]
             }
             
-            with open(backup_path / "metadata.json", 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=4, ensure_ascii=False)
+            # Compacta os arquivos e os metadados no mesmo .zip
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+                for arquivo in arquivos:
+                    zf.write(arquivo.path, arquivo.name)
+                zf.writestr(METADATA, _serializar_json(metadata))
             
             return str(backup_path)
         
@@ -52,35 +83,30 @@ class BackupManager:
         """Lista todos os backups disponíveis."""
         backups = []
         
-        for backup_dir in sorted(self.backup_dir.iterdir(), reverse=True):
-            if backup_dir.is_dir():
-                metadata_file = backup_dir / "metadata.json"
+        for backup_file in sorted(self.backup_dir.glob("*.zip"), reverse=True):
+            try:
+                metadata = self._ler_metadata(backup_file)
+                
+                # O tamanho do backup é o do próprio .zip
+                tamanho = backup_file.stat().st_size
                 
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        # Calcula o tamanho do backup
-                        tamanho = sum(f.stat().st_size for f in backup_dir.glob("*"))
-                        
-                        backups.append({
-                            'nome': backup_dir.name,
-                            'caminho': str(backup_dir),
-                            'timestamp': metadata.get('timestamp'),
-                            'descricao': metadata.get('descricao', ''),
-                            'arquivos': metadata.get('arquivos', []),
-                            'tamanho': tamanho,
-                            'tamanho_formatado': self._formatar_tamanho(tamanho)
-                        })
-                    except Exception as e:
-                        print(f"Erro ao ler backup {backup_dir.name}: {e}")
+                backups.append({
+                    'nome': backup_file.stem,
+                    'caminho': str(backup_file),
+                    'timestamp': metadata.get('timestamp'),
+                    'descricao': metadata.get('descricao', ''),
+                    'arquivos': metadata.get('arquivos', []),
+                    'tamanho': tamanho,
+                    'tamanho_formatado': self._formatar_tamanho(tamanho)
+                })
+            except Exception as e:
+                print(f"Erro ao ler backup {backup_file.name}: {e}")
         
         return backups
     
     def restaurar_backup(self, backup_name: str) -> bool:
         """Restaura um backup anterior."""
-        backup_path = self.backup_dir / backup_name
+        backup_path = self._caminho_backup(backup_name)
         
         if not backup_path.exists():
             return False
@@ -89,10 +115,13 @@ class BackupManager:
             # Cria um backup da situação atual antes de restaurar
             self.criar_backup(descricao="Backup automático antes de restauração")
             
-            # Copia os arquivos do backup para o diretório de dados
-            for arquivo in backup_path.glob("*.json"):
-                if arquivo.name != "metadata.json":
-                    shutil.copy2(arquivo, self.data_dir / arquivo.name)
+            # Extrai os arquivos do backup para o diretório de dados
+            with zipfile.ZipFile(backup_path) as zf:
+                membros = [
+                    nome for nome in zf.namelist()
+                    if nome != METADATA and nome == Path(nome).name
+                ]
+                zf.extractall(self.data_dir, members=membros)
             
             return True
         
@@ -102,19 +131,27 @@ class BackupManager:
     
     def deletar_backup(self, backup_name: str) -> bool:
         """Deleta um backup."""
-        backup_path = self.backup_dir / backup_name
+        backup_path = self._caminho_backup(backup_name)
         
         if not backup_path.exists():
             return False
         
         try:
-            shutil.rmtree(backup_path)
+            backup_path.unlink()
             return True
         
         except Exception as e:
             print(f"Erro ao deletar backup: {e}")
             return False
     
+    def _data_backup(self, backup_file: Path) -> Optional[datetime]:
+        """Data de um backup, lida do nome do arquivo (ou dos metadados, se o nome for fora do padrão)."""
+        try:
+            return datetime.strptime(backup_file.stem, "backup_%Y%m%d_%H%M%S")
+        except ValueError:
+            timestamp_str = self._ler_metadata(backup_file).get('timestamp')
+            return datetime.fromisoformat(timestamp_str) if timestamp_str else None
+    
     def limpar_backups_antigos(self, dias: int = 30) -> int:
         """Remove backups com mais de X dias."""
         from datetime import timedelta
@@ -122,25 +159,16 @@ class BackupManager:
         data_limite = datetime.now() - timedelta(days=dias)
         backups_deletados = 0
         
-        for backup_dir in self.backup_dir.iterdir():
-            if backup_dir.is_dir():
-                metadata_file = backup_dir / "metadata.json"
+        for backup_file in self.backup_dir.glob("*.zip"):
+            try:
+                timestamp = self._data_backup(backup_file)
                 
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        timestamp_str = metadata.get('timestamp')
-                        if timestamp_str:
-                            timestamp = datetime.fromisoformat(timestamp_str)
-                            
-                            if timestamp < data_limite:
-                                self.deletar_backup(backup_dir.name)
-                                backups_deletados += 1
-                    
-                    except Exception as e:
-                        print(f"Erro ao processar backup {backup_dir.name}: {e}")
+                if timestamp and timestamp < data_limite:
+                    self.deletar_backup(backup_file.stem)
+                    backups_deletados += 1
+            
+            except Exception as e:
+                print(f"Erro ao processar backup {backup_file.name}: {e}")
         
         return backups_deletados
     
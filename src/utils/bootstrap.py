@@ -0,0 +1,22 @@
+"""
+Recursos compartilhados entre todas as sessões do Streamlit.
+
+Apenas objetos sem estado do usuário ficam aqui (st.cache_resource é
+global); o usuário logado continua em st.session_state.
+"""
+
+import streamlit as st
+from src.utils.database_sql import DatabaseSQL
+from src.utils.auth import AuthManager
+
+
+@st.cache_resource
+def get_db() -> DatabaseSQL:
+    """Retorna a instância do banco de dados compartilhada entre as sessões."""
+    return DatabaseSQL()
+
+
+@st.cache_resource
+def get_auth() -> AuthManager:
+    """Retorna o gerenciador de autenticação compartilhado entre as sessões."""
+    return AuthManager(get_db())
@@ -4,149 +4,291 @@ Utilitários para criação de gráficos e visualizações.
 
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from src.models import Afastamento, Funcionario
 
 
+def _afastamentos_df(afastamentos: List[Afastamento]) -> pd.DataFrame:
+    """Monta, de uma vez, o DataFrame de afastamentos usado pelas agregações (com a coluna de dias)."""
+    df = pd.DataFrame({
+        'funcionario_id': np.array([a.funcionario_id for a in afastamentos], dtype=np.int32),
+        'tipo': pd.Categorical([a.tipo for a in afastamentos]),
+        'data_inicio': pd.to_datetime([a.data_inicio for a in afastamentos], errors='coerce'),
+        'data_fim': pd.to_datetime([a.data_fim for a in afastamentos], errors='coerce'),
+    })
+    # Mesmo cálculo de Afastamento.dias_afastamento(): fim - início + 1, ou 0 sem datas
+    df['dias'] = ((df['data_fim'] - df['data_inicio']).dt.days + 1).fillna(0).astype(np.int32)
+    return df
+
+
+def _agregar_salarios(codigos, salarios, n_grupos):
+    """Conta, soma e tira mínimo/máximo dos salários por grupo, em uma única passada."""
+    contagem = np.zeros(n_grupos, np.int64)
+    validos = np.zeros(n_grupos, np.int64)
+    soma = np.zeros(n_grupos, np.float64)
+    minimo = np.full(n_grupos, np.inf)
+    maximo = np.full(n_grupos, -np.inf)
+    
+    for i in range(codigos.size):
+        g = codigos[i]
+        v = salarios[i]
+        contagem[g] += 1
+        if v != v:  # NaN não entra na soma nem nos extremos
+            continue
+        validos[g] += 1
+        soma[g] += v
+        if v < minimo[g]:
+            minimo[g] = v
+        if v > maximo[g]:
+            maximo[g] = v
+    
+    return contagem, validos, soma, minimo, maximo
+
+
+@lru_cache(maxsize=1)
+def _kernel_salarios():
+    """Compila o agregador de salários com numba, se disponível."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_agregar_salarios)
+
+
+def _agrupar_salarios(base: pd.DataFrame, chaves: List[str]) -> pd.DataFrame:
+    """Agrega n/validos/folha/mínimo/máximo de salário por chaves (numba quando disponível, senão groupby)."""
+    kernel = _kernel_salarios()
+    if kernel is None:
+        return base.groupby(chaves, sort=False, observed=True)['salario'].agg(
+            n='size', validos='count', folha='sum', minimo='min', maximo='max'
+        )
+    
+    codigos, grupos = pd.factorize(pd.MultiIndex.from_frame(base[chaves]))
+    contagem, validos, soma, minimo, maximo = kernel(
+        codigos.astype(np.int64), base['salario'].to_numpy(np.float64), len(grupos)
+    )
+    
+    # Grupos sem salário válido ficam com NaN nos extremos, como no groupby
+    minimo[np.isinf(minimo)] = np.nan
+    maximo[np.isinf(maximo)] = np.nan
+    return pd.DataFrame(
+        {'n': contagem, 'validos': validos, 'folha': soma, 'minimo': minimo, 'maximo': maximo},
+        index=grupos.set_names(chaves)
+    )
+
+
+# Layouts base, montados uma vez e aplicados com um único update_layout
+_LAYOUT_BARRAS = dict(template='plotly_white', showlegend=False, hovermode='x unified')
+_LAYOUT_PIZZA = dict(template='plotly_white')
+
+# Figura exibida quando não há dados (copiada a cada uso, já que figuras são mutáveis)
+_FIGURA_VAZIA = go.Figure().add_annotation(text="Sem dados para exibir").update_layout(**_LAYOUT_PIZZA)
+
+
+def _figura_vazia() -> go.Figure:
+    """Retorna uma cópia da figura de aviso para gráficos sem dados."""
+    return go.Figure(_FIGURA_VAZIA)
+
+
+def _cores_escala(valores: np.ndarray, escala: str) -> List[str]:
+    """Converte os valores nas cores da escala contínua (calculadas aqui, não no navegador)."""
+    if len(valores) == 0:
+        return []
+    valores = valores.astype(np.float64)
+    minimo, maximo = np.nanmin(valores), np.nanmax(valores)
+    if maximo > minimo:
+        posicoes = (valores - minimo) / (maximo - minimo)
+    else:
+        posicoes = np.ones_like(valores)
+    return sample_colorscale(escala, np.nan_to_num(posicoes).tolist())
+
+
+def _figura_barras(df: pd.DataFrame, x: str, y: str, titulo: str, titulo_valor: str,
+                   escala: str, horizontal: bool = False) -> go.Figure:
+    """Monta um gráfico de barras direto com go.Bar, coloridas pelo valor (sem passar pelo px)."""
+    eixo_x = df[x].to_numpy()
+    eixo_y = df[y].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=eixo_x,
+        y=eixo_y,
+        orientation='h' if horizontal else 'v',
+        marker_color=_cores_escala(eixo_x if horizontal else eixo_y, escala),
+        meta=escala  # usada por atualizar_barras para recolorir
+    ))
+    
+    fig.update_layout(
+        title=titulo,
+        xaxis_title=titulo_valor if horizontal else x,
+        yaxis_title=y if horizontal else titulo_valor,
+        **_LAYOUT_BARRAS
+    )
+    
+    return fig
+
+
 class ChartManager:
     """Gerenciador de gráficos e visualizações."""
     
     @staticmethod
-    def gráfico_funcionarios_por_loja(funcionarios: List[Funcionario]) -> go.Figure:
-        """Cria um gráfico de funcionários por loja."""
-        lojas_count = {}
-        for func in funcionarios:
-            if func.loja:
-                lojas_count[func.loja] = lojas_count.get(func.loja, 0) + 1
+    def atualizar_barras(fig: go.Figure, df: pd.DataFrame, x: str, y: str) -> go.Figure:
+        """Atualiza os dados de um gráfico de barras já montado, sem recriar a figura."""
+        barras = fig.data[0]
+        barras.x = df[x].to_numpy()
+        barras.y = df[y].to_numpy()
+        valores = barras.x if barras.orientation == 'h' else barras.y
+        barras.marker.color = _cores_escala(np.asarray(valores), barras.meta)
+        return fig
+    
+    @staticmethod
+    def agregados_funcionarios(funcionarios: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Calcula, com um único agrupamento, os dados de todos os gráficos de funcionários.
+        
+        Agrupa por (ativo, loja, cargo) uma vez e deriva daí as visões por loja
+        e por cargo, em vez de percorrer o DataFrame uma vez por gráfico.
+        
+        Args:
+            funcionarios: DataFrame com as colunas loja, cargo, salario e ativo
+            
+        Returns:
+            Dicionário com os DataFrames 'por_loja', 'folha_por_loja',
+            'por_cargo' e 'salarios_por_cargo'
+        """
+        base = funcionarios.assign(
+            ativo=funcionarios['ativo'].astype(bool),
+            loja=funcionarios['loja'].fillna(''),
+            cargo=funcionarios['cargo'].fillna('')
+        )
+        grupos = _agrupar_salarios(base, ['ativo', 'loja', 'cargo'])
         
-        df = pd.DataFrame(list(lojas_count.items()), columns=['Loja', 'Quantidade'])
+        # Contagem por loja considera todos os funcionários recebidos
+        por_loja = grupos.groupby(level='loja', sort=False, observed=True)['n'].sum()
+        por_loja = por_loja[por_loja.index != '']
         
-        fig = px.bar(
-            df,
-            x='Loja',
-            y='Quantidade',
-            title='Distribuição de Funcionários por Loja',
-            labels={'Quantidade': 'Número de Funcionários'},
-            color='Quantidade',
-            color_continuous_scale='Blues'
-        )
+        # Os demais gráficos consideram só os ativos
+        ativos = grupos[grupos.index.get_level_values('ativo')].droplevel('ativo')
         
-        fig.update_layout(
-            showlegend=False,
-            hovermode='x unified',
-            template='plotly_white'
-        )
+        folha = ativos.groupby(level='loja', sort=False, observed=True)['folha'].sum()
+        folha = folha[folha.index != '']
         
-        return fig
+        cargos = ativos.groupby(level='cargo', sort=False, observed=True).agg(
+            n=('n', 'sum'), validos=('validos', 'sum'), folha=('folha', 'sum'),
+            minimo=('minimo', 'min'), maximo=('maximo', 'max')
+        )
+        cargos = cargos[cargos.index != '']
+        
+        return {
+            'por_loja': por_loja.rename_axis('Loja').reset_index(name='Quantidade'),
+            'folha_por_loja': (
+                folha.rename_axis('Loja').reset_index(name='Folha de Pagamento')
+                .sort_values('Folha de Pagamento', ascending=False)
+            ),
+            'por_cargo': (
+                cargos['n'].rename_axis('Cargo').reset_index(name='Quantidade')
+                .sort_values('Quantidade', ascending=True)
+            ),
+            'salarios_por_cargo': (
+                pd.DataFrame({
+                    'Salário Médio': cargos['folha'] / cargos['validos'],
+                    'Salário Mínimo': cargos['minimo'],
+                    'Salário Máximo': cargos['maximo']
+                })
+                .rename_axis('Cargo').reset_index()
+                .sort_values('Salário Médio', ascending=False)
+            )
+        }
     
     @staticmethod
-    def gráfico_afastamentos_por_tipo(afastamentos: List[Afastamento]) -> go.Figure:
-        """Cria um gráfico de afastamentos por tipo."""
-        tipos_count = {}
-        for aft in afastamentos:
-            tipos_count[aft.tipo] = tipos_count.get(aft.tipo, 0) + 1
-        
-        df = pd.DataFrame(list(tipos_count.items()), columns=['Tipo', 'Quantidade'])
-        
-        fig = px.pie(
-            df,
-            names='Tipo',
-            values='Quantidade',
-            title='Distribuição de Afastamentos por Tipo',
-            hole=0.3
+    def gráfico_funcionarios_por_loja(funcionarios: pd.DataFrame, agregados: Optional[Dict[str, pd.DataFrame]] = None) -> go.Figure:
+        """Cria um gráfico de funcionários por loja (reaproveita os agregados, se informados)."""
+        df = (agregados or ChartManager.agregados_funcionarios(funcionarios))['por_loja']
+        if df.empty:
+            return _figura_vazia()
+        
+        return _figura_barras(
+            df, 'Loja', 'Quantidade',
+            titulo='Distribuição de Funcionários por Loja',
+            titulo_valor='Número de Funcionários',
+            escala='Blues'
         )
+    
+    @staticmethod
+    def gráfico_afastamentos_por_tipo(resumo: pd.DataFrame) -> go.Figure:
+        """Cria um gráfico de afastamentos por tipo a partir do resumo (colunas Tipo e Quantidade)."""
+        if resumo.empty:
+            return _figura_vazia()
+        
+        fig = go.Figure(go.Pie(
+            labels=resumo['Tipo'].to_numpy(),
+            values=resumo['Quantidade'].to_numpy(),
+            hole=0.3
+        ))
         
-        fig.update_layout(template='plotly_white')
+        fig.update_layout(title='Distribuição de Afastamentos por Tipo', **_LAYOUT_PIZZA)
         
         return fig
     
     @staticmethod
     def gráfico_dias_afastamento_por_tipo(afastamentos: List[Afastamento]) -> go.Figure:
         """Cria um gráfico de dias de afastamento por tipo."""
-        tipos_dias = {}
-        for aft in afastamentos:
-            dias = aft.dias_afastamento()
-            tipos_dias[aft.tipo] = tipos_dias.get(aft.tipo, 0) + dias
-        
-        df = pd.DataFrame(list(tipos_dias.items()), columns=['Tipo', 'Dias'])
-        df = df.sort_values('Dias', ascending=False)
+        if not afastamentos:
+            return _figura_vazia()
         
-        fig = px.bar(
-            df,
-            x='Tipo',
-            y='Dias',
-            title='Total de Dias de Afastamento por Tipo',
-            labels={'Dias': 'Número de Dias'},
-            color='Dias',
-            color_continuous_scale='Reds'
+        df = (
+            _afastamentos_df(afastamentos).groupby('tipo', sort=False, observed=True)['dias'].sum()
+            .rename_axis('Tipo').reset_index(name='Dias')
+            .sort_values('Dias', ascending=False)
         )
         
-        fig.update_layout(
-            showlegend=False,
-            hovermode='x unified',
-            template='plotly_white'
+        return _figura_barras(
+            df, 'Tipo', 'Dias',
+            titulo='Total de Dias de Afastamento por Tipo',
+            titulo_valor='Número de Dias',
+            escala='Reds'
         )
-        
-        return fig
     
     @staticmethod
     def gráfico_afastamentos_por_mes(afastamentos: List[Afastamento]) -> go.Figure:
         """Cria um gráfico de afastamentos por mês."""
-        meses_count = {}
+        if not afastamentos:
+            return _figura_vazia()
         
-        for aft in afastamentos:
-            if aft.data_inicio:
-                mes_ano = aft.data_inicio.strftime('%Y-%m')
-                meses_count[mes_ano] = meses_count.get(mes_ano, 0) + 1
+        inicios = _afastamentos_df(afastamentos)['data_inicio'].dropna()
+        meses = inicios.dt.to_period('M').value_counts().sort_index()
+        df = pd.DataFrame({'Mês': meses.index.astype(str), 'Quantidade': meses.to_numpy()})
         
-        df = pd.DataFrame(list(meses_count.items()), columns=['Mês', 'Quantidade'])
-        df = df.sort_values('Mês')
-        
-        fig = px.line(
-            df,
-            x='Mês',
-            y='Quantidade',
-            title='Afastamentos por Mês',
-            labels={'Quantidade': 'Número de Afastamentos'},
-            markers=True
-        )
+        fig = go.Figure(go.Scatter(
+            x=df['Mês'].to_numpy(),
+            y=df['Quantidade'].to_numpy(),
+            mode='lines+markers'
+        ))
         
         fig.update_layout(
-            showlegend=False,
-            hovermode='x unified',
-            template='plotly_white'
+            title='Afastamentos por Mês',
+            xaxis_title='Mês',
+            yaxis_title='Número de Afastamentos',
+            **_LAYOUT_BARRAS
         )
         
         return fig
     
     @staticmethod
-    def gráfico_folha_pagamento_por_loja(funcionarios: List[Funcionario]) -> go.Figure:
-        """Cria um gráfico de folha de pagamento por loja."""
-        lojas_salario = {}
-        
-        for func in funcionarios:
-            if func.loja and func.ativo:
-                lojas_salario[func.loja] = lojas_salario.get(func.loja, 0) + func.salario
-        
-        df = pd.DataFrame(list(lojas_salario.items()), columns=['Loja', 'Folha de Pagamento'])
-        df = df.sort_values('Folha de Pagamento', ascending=False)
-        
-        fig = px.bar(
-            df,
-            x='Loja',
-            y='Folha de Pagamento',
-            title='Folha de Pagamento por Loja',
-            labels={'Folha de Pagamento': 'Valor (R$)'},
-            color='Folha de Pagamento',
-            color_continuous_scale='Greens'
-        )
-        
-        fig.update_layout(
-            showlegend=False,
-            hovermode='x unified',
-            template='plotly_white'
+    def gráfico_folha_pagamento_por_loja(funcionarios: pd.DataFrame, agregados: Optional[Dict[str, pd.DataFrame]] = None) -> go.Figure:
+        """Cria um gráfico de folha de pagamento por loja (reaproveita os agregados, se informados)."""
+        df = (agregados or ChartManager.agregados_funcionarios(funcionarios))['folha_por_loja']
+        if df.empty:
+            return _figura_vazia()
+        
+        fig = _figura_barras(
+            df, 'Loja', 'Folha de Pagamento',
+            titulo='Folha de Pagamento por Loja',
+            titulo_valor='Valor (R$)',
+            escala='Greens'
         )
         
         # Formata o eixo Y como moeda
@@ -155,54 +297,40 @@ class ChartManager:
         return fig
     
     @staticmethod
-    def gráfico_distribuicao_cargos(funcionarios: List[Funcionario]) -> go.Figure:
-        """Cria um gráfico de distribuição de cargos."""
-        cargos_count = {}
-        
-        for func in funcionarios:
-            if func.cargo and func.ativo:
-                cargos_count[func.cargo] = cargos_count.get(func.cargo, 0) + 1
-        
-        df = pd.DataFrame(list(cargos_count.items()), columns=['Cargo', 'Quantidade'])
-        df = df.sort_values('Quantidade', ascending=True)
-        
-        fig = px.barh(
-            df,
-            x='Quantidade',
-            y='Cargo',
-            title='Distribuição de Funcionários por Cargo',
-            labels={'Quantidade': 'Número de Funcionários'},
-            color='Quantidade',
-            color_continuous_scale='Purples'
-        )
-        
-        fig.update_layout(
-            showlegend=False,
-            hovermode='y unified',
-            template='plotly_white'
+    def gráfico_distribuicao_cargos(funcionarios: pd.DataFrame, agregados: Optional[Dict[str, pd.DataFrame]] = None) -> go.Figure:
+        """Cria um gráfico de distribuição de cargos (reaproveita os agregados, se informados)."""
+        df = (agregados or ChartManager.agregados_funcionarios(funcionarios))['por_cargo']
+        if df.empty:
+            return _figura_vazia()
+        
+        fig = _figura_barras(
+            df, 'Quantidade', 'Cargo',
+            titulo='Distribuição de Funcionários por Cargo',
+            titulo_valor='Número de Funcionários',
+            escala='Purples',
+            horizontal=True
         )
+        fig.update_layout(hovermode='y unified')
         
         return fig
     
     @staticmethod
     def gráfico_timeline_afastamentos(afastamentos: List[Afastamento], funcionarios_dict: Dict) -> go.Figure:
         """Cria um gráfico de timeline de afastamentos."""
-        data = []
-        
-        for aft in afastamentos:
-            funcionario = funcionarios_dict.get(aft.funcionario_id)
-            if funcionario and aft.data_inicio and aft.data_fim:
-                data.append({
-                    'Funcionário': funcionario.nome,
-                    'Tipo': aft.tipo,
-                    'Início': aft.data_inicio,
-                    'Fim': aft.data_fim
-                })
+        # Reaproveita as datas já convertidas (datetime64) do DataFrame de afastamentos
+        base = _afastamentos_df(afastamentos)
+        nomes = base['funcionario_id'].map({fid: f.nome for fid, f in funcionarios_dict.items()})
+        validos = nomes.notna() & base['data_inicio'].notna() & base['data_fim'].notna()
         
-        if not data:
-            return go.Figure().add_annotation(text="Nenhum afastamento para exibir")
+        if not validos.any():
+            return _figura_vazia()
         
-        df = pd.DataFrame(data)
+        df = pd.DataFrame({
+            'Funcionário': nomes[validos],
+            'Tipo': base.loc[validos, 'tipo'].astype(str),
+            'Início': base.loc[validos, 'data_inicio'],
+            'Fim': base.loc[validos, 'data_fim']
+        })
         
         fig = px.timeline(
             df,
@@ -223,33 +351,17 @@ class ChartManager:
         return fig
     
     @staticmethod
-    def gráfico_salarios_por_cargo(funcionarios: List[Funcionario]) -> go.Figure:
-        """Cria um gráfico de salários por cargo."""
-        cargo_salarios = {}
-        
-        for func in funcionarios:
-            if func.cargo and func.ativo:
-                if func.cargo not in cargo_salarios:
-                    cargo_salarios[func.cargo] = []
-                cargo_salarios[func.cargo].append(func.salario)
-        
-        data = []
-        for cargo, salarios in cargo_salarios.items():
-            data.append({
-                'Cargo': cargo,
-                'Salário Médio': sum(salarios) / len(salarios),
-                'Salário Mínimo': min(salarios),
-                'Salário Máximo': max(salarios)
-            })
-        
-        df = pd.DataFrame(data)
-        df = df.sort_values('Salário Médio', ascending=False)
+    def gráfico_salarios_por_cargo(funcionarios: pd.DataFrame, agregados: Optional[Dict[str, pd.DataFrame]] = None) -> go.Figure:
+        """Cria um gráfico de salários por cargo (reaproveita os agregados, se informados)."""
+        df = (agregados or ChartManager.agregados_funcionarios(funcionarios))['salarios_por_cargo']
+        if df.empty:
+            return _figura_vazia()
         
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=df['Cargo'],
-            y=df['Salário Médio'],
+            x=df['Cargo'].to_numpy(),
+            y=df['Salário Médio'].to_numpy(),
             name='Salário Médio',
             marker_color='lightblue'
         ))
@@ -269,8 +381,13 @@ class ChartManager:
     @staticmethod
     def gráfico_taxa_afastamento(funcionarios: List[Funcionario], afastamentos: List[Afastamento]) -> go.Figure:
         """Cria um gráfico de taxa de afastamento."""
-        total_funcionarios = len([f for f in funcionarios if f.ativo])
-        funcionarios_afastados = len(set(aft.funcionario_id for aft in afastamentos))
+        if not funcionarios:
+            return _figura_vazia()
+        
+        total_funcionarios = int(np.fromiter((f.ativo for f in funcionarios), bool, len(funcionarios)).sum())
+        funcionarios_afastados = np.unique(
+            np.fromiter((a.funcionario_id for a in afastamentos), np.int64, len(afastamentos))
+        ).size
         
         taxa = (funcionarios_afastados / total_funcionarios * 100) if total_funcionarios > 0 else 0
         
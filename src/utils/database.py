@@ -11,12 +11,108 @@ Data: 2024
 Versão: 1.0 (Legado)
 """
 
+import atexit
+import hmac
 import json
+import mmap
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from collections import Counter
+from datetime import date, datetime
+import numpy as np
+from typing import Callable, List, Dict, Optional, Any, Tuple
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+from src.models.afastamento import Afastamento
+from src.models.funcionario import Funcionario
+from src.models.usuario import PerfilUsuario, Usuario
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Acima deste tamanho, o arquivo é lido via mmap (somente com orjson)
+LIMITE_MMAP = 64 * 1024
+
+# Estilos do cabeçalho das planilhas exportadas (compartilhados entre as exportações)
+_HDR_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+_HDR_FONT = Font(bold=True, color="FFFFFF")
+_HDR_ALIGN = Alignment(horizontal="center", vertical="center")
+
+
+def _serializar_json(dados: Any) -> bytes:
+    """Serializa JSON compacto com orjson, ou com o json padrão se não estiver instalado."""
+    if orjson is not None:
+        return orjson.dumps(dados, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _desserializar_json(conteudo: bytes) -> Any:
+    """Lê JSON com orjson, ou com o json padrão se não estiver instalado."""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+
+def _copia(registro: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Cópia de um registro do cache (os registros têm só valores simples), ou None."""
+    return dict(registro) if registro is not None else None
+
+
+def _copias(registros: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cópias dos registros do cache, para devolver a quem chama."""
+    return [dict(registro) for registro in registros]
+
+
+def _sincronizado(metodo: Callable) -> Callable:
+    """Executa o método do DatabaseManager com o lock da instância (uma thread por vez)."""
+    @wraps(metodo)
+    def executar(self, *args, **kwargs):
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return executar
+
+
+def _trigramas(texto: str) -> frozenset:
+    """Conjunto de trigramas (substrings de 3 caracteres) de um texto."""
+    return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+
+
+def _copiar_arquivo(origem: str, destino: str) -> None:
+    """
+    Copia um arquivo preservando os metadados (como shutil.copy2).
+    
+    No Linux a cópia é feita no kernel com os.copy_file_range (sem passar
+    pelo espaço do usuário); em outros sistemas, ou se a chamada falhar,
+    usa shutil.copyfile.
+    """
+    try:
+        with open(origem, 'rb') as src, open(destino, 'wb') as dst:
+            restante = os.fstat(src.fileno()).st_size
+            while restante > 0:
+                copiados = os.copy_file_range(src.fileno(), dst.fileno(), restante)
+                if copiados == 0:
+                    break
+                restante -= copiados
+    except (AttributeError, OSError):
+        shutil.copyfile(origem, destino)
+    
+    shutil.copystat(origem, destino)
+
+
+def _copiar_arquivos(pares: List[Tuple[str, str]]) -> None:
+    """Copia vários arquivos independentes em paralelo (origem, destino)."""
+    with ThreadPoolExecutor(max_workers=len(pares)) as executor:
+        # list() propaga a exceção de qualquer cópia que falhar
+        list(executor.map(lambda par: _copiar_arquivo(*par), pares))
 
 
 # ============================================================================
@@ -37,25 +133,49 @@ class DatabaseManager:
         employees_file (str): Caminho do arquivo de funcionários
         afastamentos_file (str): Caminho do arquivo de afastamentos (compatibilidade)
         users_file (str): Caminho do arquivo de usuários
+        version (int): Versão dos dados, incrementada a cada recarga
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", commit_every: int = 1):
         """
         Inicializa o gerenciador de banco de dados JSON.
         
         Args:
             data_dir: Diretório para armazenamento dos arquivos JSON
+            commit_every: Quantas alterações acumular em memória antes de
+                gravá-las no journal (1 grava a cada alteração)
         """
         self.data_dir = data_dir
         self.employees_file = os.path.join(data_dir, "employees.json")
         self.afastamentos_file = os.path.join(data_dir, "absences.json") # Renomeado para compatibilidade com o código do usuário
         self.users_file = os.path.join(data_dir, "users.json")
         
+        # Cache em memória dos arquivos JSON: caminho -> (assinatura, dados)
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], List[Dict[str, Any]]]] = {}
+        
+        # Índices e outras estruturas derivadas: (arquivo, ...) -> (assinatura, estrutura),
+        # reconstruídos sob demanda quando o arquivo muda
+        self._indices: Dict[tuple, Tuple[Tuple[int, int, int], Any]] = {}
+        
+        # A mesma instância é compartilhada entre as sessões (threads) do Streamlit:
+        # leitura-alteração-gravação do cache, journal e compactação ficam sob este
+        # lock (reentrante, pois os métodos se chamam entre si)
+        self._lock = threading.RLock()
+        
+        # Alterações ainda não gravadas no journal, por arquivo
+        self.commit_every = commit_every
+        self._pendentes: Dict[str, List[Dict[str, Any]]] = {}
+        if commit_every > 1:
+            atexit.register(self.flush)
+        
         # Criar diretório de dados se não existir
         self._ensure_data_directory()
         
         # Inicializar arquivos JSON se não existirem
         self._initialize_files()
+        
+        # Versão dos dados persistidos (incrementada a cada recarga)
+        self.version = 0
     
     # ========================================================================
     # MÉTODOS DE INICIALIZAÇÃO
@@ -77,13 +197,35 @@ class DatabaseManager:
         if not os.path.exists(self.users_file):
             self._save_json(self.users_file, [])
     
+    @_sincronizado
+    def reload(self) -> None:
+        """
+        Recarrega os dados persistidos sem recriar o gerenciador.
+        
+        Garante que o diretório e os arquivos existam e incrementa a versão
+        dos dados, para que caches dependentes possam ser invalidados.
+        """
+        self.flush()
+        self._ensure_data_directory()
+        self._initialize_files()
+        self._cache.clear()
+        self._indices.clear()
+        self.version += 1
+    
     # ========================================================================
     # MÉTODOS AUXILIARES DE ARQUIVO (PRIVADOS PARA COMPATIBILIDADE)
     # ========================================================================
     
-    def _load_json(self, filepath: str) -> List[Dict[str, Any]]:
+    @_sincronizado
+    def _registros(self, filepath: str) -> List[Dict[str, Any]]:
         """
-        Carrega dados de um arquivo JSON.
+        Retorna a lista de registros de um arquivo JSON mantida em cache.
+        
+        O conteúdo (arquivo base + journal) só é relido do disco quando o
+        arquivo ou seu journal mudam (por exemplo, editados por outro
+        processo). A lista e os registros devolvidos são os do próprio cache:
+        uso interno, sob o lock da instância (os métodos públicos devolvem
+        cópias, com _copias).
         
         Args:
             filepath: Caminho do arquivo JSON
@@ -91,41 +233,296 @@ class DatabaseManager:
         Returns:
             Lista de dicionários com os dados carregados
         """
+        assinatura = self._assinatura(filepath)
+        if assinatura is None:
+            self._cache.pop(filepath, None)
+            return []
+        
+        cached = self._cache.get(filepath)
+        if cached is not None and cached[0] == assinatura:
+            return cached[1]
+        
+        if filepath in self._pendentes:
+            # Arquivo alterado por fora: grava o que está pendente e relê
+            self.flush()
+            return self._registros(filepath)
+        
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                if orjson is not None and os.fstat(f.fileno()).st_size > LIMITE_MMAP:
+                    # Arquivos grandes: o orjson lê direto das páginas mapeadas
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as buffer:
+                            data = orjson.loads(buffer)
+                else:
+                    data = _desserializar_json(f.read())
         except (FileNotFoundError, json.JSONDecodeError):
             return []
+        
+        if assinatura[2]:
+            data = self._aplicar_journal(filepath, data)
+        
+        self._cache[filepath] = (assinatura, data)
+        return data
+    
+    @_sincronizado
+    def _load_json(self, filepath: str) -> List[Dict[str, Any]]:
+        """
+        Carrega dados de um arquivo JSON, aplicando o journal pendente.
+        
+        Args:
+            filepath: Caminho do arquivo JSON
+            
+        Returns:
+            Lista de dicionários com os dados carregados
+        """
+        # Cópias: quem chama pode alterar a lista e os registros sem afetar o cache
+        return _copias(self._registros(filepath))
     
+    @_sincronizado
     def _save_json(self, filepath: str, data: List[Dict[str, Any]]) -> None:
         """
-        Salva dados em um arquivo JSON.
+        Salva dados em um arquivo JSON (compacto, sem indentação).
+        
+        Reescreve o arquivo inteiro e descarta o journal, que passa a estar
+        incorporado ao arquivo base (compactação), junto com as alterações
+        ainda pendentes. A gravação é atômica: o conteúdo vai para um arquivo
+        temporário, que substitui o original.
         
         Args:
             filepath: Caminho do arquivo JSON
             data: Lista de dicionários para salvar
         """
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        tmp = filepath + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_serializar_json(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filepath)
+        
+        try:
+            os.remove(self._journal(filepath))
+        except FileNotFoundError:
+            pass
+        
+        self._pendentes.pop(filepath, None)
+        self._atualizar_cache(filepath, data)
+    
+    @_sincronizado
+    def _registrar_alteracao(self, filepath: str, data: List[Dict[str, Any]], entrada: Dict[str, Any]) -> None:
+        """
+        Registra uma alteração de um único registro, já aplicada à lista em cache.
+        
+        A alteração fica pendente até que ``commit_every`` alterações se
+        acumulem; então todas são anexadas ao journal (``<arquivo>.log``)
+        em vez de reescrever o arquivo inteiro. Inclusões vão para o journal
+        na hora (junto com as pendentes): o novo ID precisa estar em disco
+        para que outras instâncias não gerem o mesmo ID.
+        
+        Args:
+            filepath: Caminho do arquivo JSON
+            data: Lista de registros (de _registros) já com a alteração
+            entrada: Operação do journal ({'op': 'add'|'set', 'rec': ...} ou
+                {'op': 'del', 'id': ...})
+        """
+        if self._cache.get(filepath, (None, None))[1] is not data:
+            # Arquivo ausente ou ilegível (fora do cache): grava a lista inteira
+            self._save_json(filepath, data)
+            return
+        
+        maior_id = self._indices.get((filepath, 'max_id'))
+        
+        self._pendentes.setdefault(filepath, []).append(entrada)
+        self._descartar_derivados(filepath)
+        
+        if entrada['op'] == 'add' or sum(len(entradas) for entradas in self._pendentes.values()) >= self.commit_every:
+            self.flush()
+        
+        # Inclusões só aumentam o maior ID: atualiza o contador sem percorrer a lista
+        if entrada['op'] == 'add' and maior_id is not None and filepath in self._cache:
+            self._indices[(filepath, 'max_id')] = (
+                self._cache[filepath][0],
+                max(maior_id[1], entrada['rec'].get('id', 0))
+            )
+    
+    @_sincronizado
+    def flush(self) -> None:
+        """
+        Anexa as alterações pendentes aos journals.
+        
+        Cada arquivo é compactado quando seu journal passa da metade do
+        tamanho do arquivo base.
+        """
+        for filepath, entradas in list(self._pendentes.items()):
+            cached = self._cache.get(filepath)
+            alterado_por_fora = cached is None or cached[0] != self._assinatura(filepath)
+            
+            journal = self._journal(filepath)
+            with open(journal, 'ab') as f:
+                f.write(b''.join(_serializar_json(entrada) + b'\n' for entrada in entradas))
+            del self._pendentes[filepath]
+            
+            if alterado_por_fora:
+                # O cache não tem as alterações externas: relê na próxima consulta
+                self._cache.pop(filepath, None)
+                self._descartar_derivados(filepath)
+            elif os.path.getsize(journal) > os.path.getsize(filepath) / 2:
+                self._save_json(filepath, cached[1])
+            else:
+                self._atualizar_cache(filepath, cached[1])
+    
+    def _aplicar_journal(self, filepath: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Reaplica as operações do journal sobre os dados do arquivo base.
+        
+        Args:
+            filepath: Caminho do arquivo JSON
+            data: Registros lidos do arquivo base
+            
+        Returns:
+            Lista de registros com o journal aplicado
+        """
+        por_id = {item.get('id'): item for item in data}
+        
+        with open(self._journal(filepath), 'rb') as f:
+            for linha in f:
+                try:
+                    entrada = _desserializar_json(linha)
+                except json.JSONDecodeError:
+                    # Linha incompleta (escrita interrompida): ignora
+                    continue
+                
+                if entrada['op'] == 'del':
+                    por_id.pop(entrada['id'], None)
+                else:
+                    por_id[entrada['rec'].get('id')] = entrada['rec']
+        
+        return list(por_id.values())
+    
+    def _atualizar_cache(self, filepath: str, data: List[Dict[str, Any]]) -> None:
+        """Guarda os dados recém-persistidos no cache e descarta as estruturas derivadas do arquivo."""
+        self._cache[filepath] = (self._assinatura(filepath), data)
+        self._descartar_derivados(filepath)
+    
+    def _descartar_derivados(self, filepath: str) -> None:
+        """Descarta os índices e demais estruturas derivadas de um arquivo."""
+        self._indices = {
+            chave: indice for chave, indice in self._indices.items()
+            if chave[0] != filepath
+        }
+    
+    @_sincronizado
+    def commit(self) -> None:
+        """
+        Incorpora as alterações pendentes e os journals aos arquivos base (gravados com fsync).
+        """
+        self.flush()
+        for filepath in (self.employees_file, self.afastamentos_file, self.users_file):
+            if os.path.exists(self._journal(filepath)):
+                self._save_json(filepath, self._load_json(filepath))
+    
+    @_sincronizado
+    def _derivado(self, filepath: str, chave: tuple, construir: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        """
+        Retorna uma estrutura derivada dos registros de um arquivo JSON.
+        
+        A estrutura é construída uma vez e reaproveitada enquanto o arquivo
+        (e seu journal) não mudarem.
+        
+        Args:
+            filepath: Caminho do arquivo JSON
+            chave: Identifica a estrutura entre as derivadas do mesmo arquivo
+            construir: Função que monta a estrutura a partir dos registros
+            
+        Returns:
+            A estrutura construída por ``construir``
+        """
+        assinatura = self._assinatura(filepath)
+        chave = (filepath,) + chave
+        
+        cached = self._indices.get(chave)
+        if cached is not None and cached[0] == assinatura:
+            return cached[1]
+        
+        valor = construir(self._registros(filepath))
+        self._indices[chave] = (assinatura, valor)
+        return valor
     
-    def _generate_id(self, data: List[Dict[str, Any]]) -> int:
+    def _indice(self, filepath: str, campo: str = 'id', agrupar: bool = False) -> Dict[Any, Any]:
+        """
+        Retorna um índice dos registros de um arquivo JSON por um campo.
+        
+        Args:
+            filepath: Caminho do arquivo JSON
+            campo: Campo usado como chave do índice
+            agrupar: Se True, cada chave mapeia para a lista de registros com
+                aquele valor; caso contrário, para o primeiro registro
+            
+        Returns:
+            Dicionário mapeando o valor do campo para o(s) registro(s)
+        """
+        def construir(data: List[Dict[str, Any]]) -> Dict[Any, Any]:
+            indice: Dict[Any, Any] = {}
+            if agrupar:
+                for item in data:
+                    indice.setdefault(item.get(campo), []).append(item)
+            else:
+                for item in data:
+                    indice.setdefault(item.get(campo), item)
+            return indice
+        
+        return self._derivado(filepath, ('indice', campo, agrupar), construir)
+    
+    @staticmethod
+    def _journal(filepath: str) -> str:
+        """Caminho do journal (append-only) de um arquivo de dados."""
+        return filepath + '.log'
+    
+    @classmethod
+    def _assinatura(cls, filepath: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Identifica a versão em disco de um arquivo e de seu journal.
+        
+        Returns:
+            (st_mtime_ns do arquivo, st_mtime_ns do journal, tamanho do
+            journal), ou None se o arquivo não existir
+        """
+        try:
+            base = os.stat(filepath).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        try:
+            journal = os.stat(cls._journal(filepath))
+        except FileNotFoundError:
+            return (base, 0, 0)
+        
+        return (base, journal.st_mtime_ns, journal.st_size)
+    
+    def _generate_id(self, filepath: str) -> int:
         """
         Gera um novo ID único baseado nos dados existentes.
         
+        O maior ID de cada arquivo fica em cache e é atualizado a cada
+        inclusão; só é recalculado quando o arquivo muda de outra forma.
+        
         Args:
-            data: Lista de dicionários com dados existentes
+            filepath: Caminho do arquivo JSON
             
         Returns:
             Novo ID único
         """
-        if not data:
-            return 1
-        return max(item.get('id', 0) for item in data) + 1
+        maior_id = self._derivado(
+            filepath, ('max_id',),
+            lambda data: max((item.get('id', 0) for item in data), default=0)
+        )
+        return maior_id + 1
     
     # ========================================================================
     # OPERAÇÕES CRUD - FUNCIONÁRIOS (Nomenclatura em Português)
     # ========================================================================
     
+    @_sincronizado
     def adicionar_funcionario(self, employee_data: Dict[str, Any]) -> int:
         """
         Adiciona um novo funcionário ao banco de dados.
@@ -136,19 +533,21 @@ class DatabaseManager:
         Returns:
             ID do funcionário criado
         """
-        employees = self._load_json(self.employees_file)
+        employees = self._registros(self.employees_file)
         
         # Gerar novo ID
-        new_id = self._generate_id(employees)
+        new_id = self._generate_id(self.employees_file)
         employee_data['id'] = new_id
         
         # Adicionar timestamp de criação
-        employee_data['created_at'] = datetime.now().isoformat()
-        employee_data['updated_at'] = datetime.now().isoformat()
+        now = time.time_ns()
+        employee_data['created_at'] = now
+        employee_data['updated_at'] = now
         
-        # Adicionar à lista e salvar
-        employees.append(employee_data)
-        self._save_json(self.employees_file, employees)
+        # Adicionar à lista e salvar (uma cópia: o dict de quem chama fica fora do cache)
+        registro = dict(employee_data)
+        employees.append(registro)
+        self._registrar_alteracao(self.employees_file, employees, {'op': 'add', 'rec': registro})
         
         return new_id
     
@@ -162,13 +561,7 @@ class DatabaseManager:
         Returns:
             Dicionário com dados do funcionário ou None se não encontrado
         """
-        employees = self._load_json(self.employees_file)
-        
-        for employee in employees:
-            if employee.get('id') == employee_id:
-                return employee
-        
-        return None
+        return _copia(self._indice(self.employees_file).get(employee_id))
     
     def listar_funcionarios(self, apenas_ativos: bool = False) -> List[Dict[str, Any]]:
         """
@@ -185,6 +578,7 @@ class DatabaseManager:
         
         return self._load_json(self.employees_file)
     
+    @_sincronizado
     def atualizar_funcionario(self, employee_id: int, employee_data: Dict[str, Any]) -> bool:
         """
         Atualiza os dados de um funcionário.
@@ -196,22 +590,24 @@ class DatabaseManager:
         Returns:
             True se atualizado com sucesso, False caso contrário
         """
-        employees = self._load_json(self.employees_file)
-        
-        for i, employee in enumerate(employees):
-            if employee.get('id') == employee_id:
-                # Manter ID e timestamp de criação
-                employee_data['id'] = employee_id
-                employee_data['created_at'] = employee.get('created_at', datetime.now().isoformat())
-                employee_data['updated_at'] = datetime.now().isoformat()
-                
-                # Atualizar funcionário
-                employees[i] = employee_data
-                self._save_json(self.employees_file, employees)
-                return True
+        employee = self._indice(self.employees_file).get(employee_id)
+        if employee is None:
+            return False
         
-        return False
+        # Manter ID e timestamp de criação
+        employee_data['id'] = employee_id
+        now = time.time_ns()
+        employee_data['created_at'] = employee.get('created_at', now)
+        employee_data['updated_at'] = now
+        
+        # Atualizar funcionário
+        employees = self._registros(self.employees_file)
+        registro = dict(employee_data)
+        employees[employees.index(employee)] = registro
+        self._registrar_alteracao(self.employees_file, employees, {'op': 'set', 'rec': registro})
+        return True
     
+    @_sincronizado
     def remover_funcionario(self, employee_id: int) -> bool:
         """
         Remove um funcionário do banco de dados.
@@ -222,15 +618,14 @@ class DatabaseManager:
         Returns:
             True se removido com sucesso, False caso contrário
         """
-        employees = self._load_json(self.employees_file)
-        
-        for i, employee in enumerate(employees):
-            if employee.get('id') == employee_id:
-                employees.pop(i)
-                self._save_json(self.employees_file, employees)
-                return True
+        employee = self._indice(self.employees_file).get(employee_id)
+        if employee is None:
+            return False
         
-        return False
+        employees = self._registros(self.employees_file)
+        employees.remove(employee)
+        self._registrar_alteracao(self.employees_file, employees, {'op': 'del', 'id': employee_id})
+        return True
     
     def buscar_funcionarios(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -242,19 +637,38 @@ class DatabaseManager:
         Returns:
             Lista de funcionários que correspondem à busca
         """
-        employees = self._load_json(self.employees_file)
         query_lower = query.lower()
+        indice = self._indice_busca_funcionarios()
+        
+        # Consultas curtas não têm trigramas: testa a substring direto
+        if len(query_lower) < 3:
+            return [dict(employee) for texto, _, employee in indice if query_lower in texto]
+        
+        # Só testa a substring nos textos que contêm todos os trigramas da consulta
+        trigramas = _trigramas(query_lower)
+        return [
+            dict(employee) for texto, trigramas_texto, employee in indice
+            if trigramas <= trigramas_texto and query_lower in texto
+        ]
+    
+    def _indice_busca_funcionarios(self) -> List[Tuple[str, frozenset, Dict[str, Any]]]:
+        """
+        Retorna, para cada funcionário, o texto de busca já normalizado.
         
-        results = []
-        for employee in employees:
-            name = employee.get('name', '').lower()
-            matricula = str(employee.get('matricula', '')).lower()
-            
-            if query_lower in name or query_lower in matricula:
-                results.append(employee)
+        Returns:
+            Lista de (nome e matrícula em minúsculas, trigramas do texto, funcionário)
+        """
+        def construir(employees: List[Dict[str, Any]]) -> List[Tuple[str, frozenset, Dict[str, Any]]]:
+            indice = []
+            for employee in employees:
+                # \x1f separa os campos para que a busca não case entre eles
+                texto = f"{employee.get('name', '').lower()}\x1f{str(employee.get('matricula', '')).lower()}"
+                indice.append((texto, _trigramas(texto), employee))
+            return indice
         
-        return results
+        return self._derivado(self.employees_file, ('busca',), construir)
     
+    @_sincronizado
     def buscar_funcionarios_por_status(self, status: str) -> List[Dict[str, Any]]:
         """
         Retorna funcionários filtrados por status.
@@ -265,14 +679,15 @@ class DatabaseManager:
         Returns:
             Lista de funcionários com o status especificado
         """
-        employees = self._load_json(self.employees_file)
+        employees = self._registros(self.employees_file)
         
-        return [emp for emp in employees if emp.get('status') == status]
+        return [dict(emp) for emp in employees if emp.get('status') == status]
     
     # ========================================================================
     # OPERAÇÕES CRUD - AFASTAMENTOS (Nomenclatura em Português)
     # ========================================================================
     
+    @_sincronizado
     def adicionar_afastamento(self, absence_data: Dict[str, Any]) -> int:
         """
         Adiciona um novo afastamento ao banco de dados.
@@ -283,19 +698,21 @@ class DatabaseManager:
         Returns:
             ID do afastamento criado
         """
-        absences = self._load_json(self.afastamentos_file)
+        absences = self._registros(self.afastamentos_file)
         
         # Gerar novo ID
-        new_id = self._generate_id(absences)
+        new_id = self._generate_id(self.afastamentos_file)
         absence_data['id'] = new_id
         
         # Adicionar timestamp de criação
-        absence_data['created_at'] = datetime.now().isoformat()
-        absence_data['updated_at'] = datetime.now().isoformat()
+        now = time.time_ns()
+        absence_data['created_at'] = now
+        absence_data['updated_at'] = now
         
-        # Adicionar à lista e salvar
-        absences.append(absence_data)
-        self._save_json(self.afastamentos_file, absences)
+        # Adicionar à lista e salvar (uma cópia: o dict de quem chama fica fora do cache)
+        registro = dict(absence_data)
+        absences.append(registro)
+        self._registrar_alteracao(self.afastamentos_file, absences, {'op': 'add', 'rec': registro})
         
         return new_id
     
@@ -309,13 +726,7 @@ class DatabaseManager:
         Returns:
             Dicionário com dados do afastamento ou None se não encontrado
         """
-        absences = self._load_json(self.afastamentos_file)
-        
-        for absence in absences:
-            if absence.get('id') == absence_id:
-                return absence
-        
-        return None
+        return _copia(self._indice(self.afastamentos_file).get(absence_id))
     
     def listar_afastamentos(self) -> List[Dict[str, Any]]:
         """
@@ -326,6 +737,7 @@ class DatabaseManager:
         """
         return self._load_json(self.afastamentos_file)
     
+    @_sincronizado
     def buscar_afastamentos_por_funcionario(self, employee_id: int) -> List[Dict[str, Any]]:
         """
         Retorna todos os afastamentos de um funcionário específico.
@@ -336,10 +748,9 @@ class DatabaseManager:
         Returns:
             Lista de afastamentos do funcionário
         """
-        absences = self._load_json(self.afastamentos_file)
-        
-        return [abs for abs in absences if abs.get('employee_id') == employee_id]
+        return _copias(self._indice(self.afastamentos_file, 'employee_id', agrupar=True).get(employee_id, []))
     
+    @_sincronizado
     def atualizar_afastamento(self, absence_id: int, absence_data: Dict[str, Any]) -> bool:
         """
         Atualiza os dados de um afastamento.
@@ -351,22 +762,24 @@ class DatabaseManager:
         Returns:
             True se atualizado com sucesso, False caso contrário
         """
-        absences = self._load_json(self.afastamentos_file)
-        
-        for i, absence in enumerate(absences):
-            if absence.get('id') == absence_id:
-                # Manter ID e timestamp de criação
-                absence_data['id'] = absence_id
-                absence_data['created_at'] = absence.get('created_at', datetime.now().isoformat())
-                absence_data['updated_at'] = datetime.now().isoformat()
-                
-                # Atualizar afastamento
-                absences[i] = absence_data
-                self._save_json(self.afastamentos_file, absences)
-                return True
+        absence = self._indice(self.afastamentos_file).get(absence_id)
+        if absence is None:
+            return False
         
-        return False
+        # Manter ID e timestamp de criação
+        absence_data['id'] = absence_id
+        now = time.time_ns()
+        absence_data['created_at'] = absence.get('created_at', now)
+        absence_data['updated_at'] = now
+        
+        # Atualizar afastamento
+        absences = self._registros(self.afastamentos_file)
+        registro = dict(absence_data)
+        absences[absences.index(absence)] = registro
+        self._registrar_alteracao(self.afastamentos_file, absences, {'op': 'set', 'rec': registro})
+        return True
     
+    @_sincronizado
     def remover_afastamento(self, absence_id: int) -> bool:
         """
         Remove um afastamento do banco de dados.
@@ -377,16 +790,16 @@ class DatabaseManager:
         Returns:
             True se removido com sucesso, False caso contrário
         """
-        absences = self._load_json(self.afastamentos_file)
-        
-        for i, absence in enumerate(absences):
-            if absence.get('id') == absence_id:
-                absences.pop(i)
-                self._save_json(self.afastamentos_file, absences)
-                return True
+        absence = self._indice(self.afastamentos_file).get(absence_id)
+        if absence is None:
+            return False
         
-        return False
+        absences = self._registros(self.afastamentos_file)
+        absences.remove(absence)
+        self._registrar_alteracao(self.afastamentos_file, absences, {'op': 'del', 'id': absence_id})
+        return True
     
+    @_sincronizado
     def listar_afastamentos_ativos(self) -> List[Dict[str, Any]]:
         """
         Retorna todos os afastamentos ativos (não finalizados).
@@ -394,25 +807,13 @@ class DatabaseManager:
         Returns:
             Lista de afastamentos ativos
         """
-        absences = self._load_json(self.afastamentos_file)
-        today = datetime.now().date()
-        
-        active = []
-        for absence in absences:
-            # Verificar se tem data de retorno
-            if absence.get('return_date'):
-                try:
-                    return_date = datetime.fromisoformat(absence['return_date']).date()
-                    if return_date >= today:
-                        active.append(absence)
-                except (ValueError, TypeError):
-                    pass
-            else:
-                # Se não tem data de retorno, considera ativo
-                active.append(absence)
+        absences, _, retorno, sem_retorno = self._datas_afastamentos()
         
-        return active
+        # Sem data de retorno, considera ativo; datas inválidas (NaT) ficam de fora
+        mask = sem_retorno | (retorno >= np.datetime64(date.today(), 'D'))
+        return [dict(absences[i]) for i in np.flatnonzero(mask)]
     
+    @_sincronizado
     def buscar_afastamentos_por_periodo(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
         Retorna afastamentos em um período específico.
@@ -424,37 +825,48 @@ class DatabaseManager:
         Returns:
             Lista de afastamentos no período
         """
-        absences = self._load_json(self.afastamentos_file)
-        
         try:
-            start = datetime.fromisoformat(start_date).date()
-            end = datetime.fromisoformat(end_date).date()
+            start = np.datetime64(datetime.fromisoformat(start_date).date(), 'D')
+            end = np.datetime64(datetime.fromisoformat(end_date).date(), 'D')
         except (ValueError, TypeError):
             return []
         
-        results = []
-        for absence in absences:
+        absences, inicio, retorno, sem_retorno = self._datas_afastamentos()
+        
+        # Sem data de retorno, o afastamento vai até hoje
+        fim = np.where(sem_retorno, np.datetime64(date.today(), 'D'), retorno)
+        
+        # Verificar sobreposição de períodos (datas inválidas são NaT e ficam de fora)
+        mask = (inicio <= end) & (fim >= start)
+        return [dict(absences[i]) for i in np.flatnonzero(mask)]
+    
+    def _datas_afastamentos(self) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna as datas dos afastamentos como arrays datetime64[D].
+        
+        Returns:
+            (afastamentos, início, retorno, sem data de retorno), alinhados
+            por posição; datas inválidas viram NaT
+        """
+        def para_data(valor: Any) -> np.datetime64:
             try:
-                absence_start = datetime.fromisoformat(absence.get('start_date', '')).date()
-                
-                # Verificar se o afastamento está no período
-                if absence.get('return_date'):
-                    absence_end = datetime.fromisoformat(absence['return_date']).date()
-                else:
-                    absence_end = datetime.now().date()
-                
-                # Verificar sobreposição de períodos
-                if absence_start <= end and absence_end >= start:
-                    results.append(absence)
+                return np.datetime64(datetime.fromisoformat(valor).date(), 'D')
             except (ValueError, TypeError):
-                continue
+                return np.datetime64('NaT', 'D')
         
-        return results
+        def construir(absences: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray, np.ndarray]:
+            inicio = np.array([para_data(a.get('start_date', '')) for a in absences], dtype='datetime64[D]')
+            retorno = np.array([para_data(a.get('return_date')) for a in absences], dtype='datetime64[D]')
+            sem_retorno = np.array([not a.get('return_date') for a in absences], dtype=bool)
+            return absences, inicio, retorno, sem_retorno
+        
+        return self._derivado(self.afastamentos_file, ('datas',), construir)
     
     # ========================================================================
     # OPERAÇÕES CRUD - USUÁRIOS (Nomenclatura em Português)
     # ========================================================================
     
+    @_sincronizado
     def adicionar_usuario(self, user_data: Dict[str, Any]) -> int:
         """
         Adiciona um novo usuário ao banco de dados.
@@ -465,19 +877,22 @@ class DatabaseManager:
         Returns:
             ID do usuário criado
         """
-        users = self._load_json(self.users_file)
+        users = self._registros(self.users_file)
         
         # Gerar novo ID
-        new_id = self._generate_id(users)
+        new_id = self._generate_id(self.users_file)
         user_data['id'] = new_id
+        self._hash_senha(user_data)
         
         # Adicionar timestamp de criação
-        user_data['created_at'] = datetime.now().isoformat()
-        user_data['updated_at'] = datetime.now().isoformat()
+        now = time.time_ns()
+        user_data['created_at'] = now
+        user_data['updated_at'] = now
         
-        # Adicionar à lista e salvar
-        users.append(user_data)
-        self._save_json(self.users_file, users)
+        # Adicionar à lista e salvar (uma cópia: o dict de quem chama fica fora do cache)
+        registro = dict(user_data)
+        users.append(registro)
+        self._registrar_alteracao(self.users_file, users, {'op': 'add', 'rec': registro})
         
         return new_id
     
@@ -491,13 +906,7 @@ class DatabaseManager:
         Returns:
             Dicionário com dados do usuário ou None se não encontrado
         """
-        users = self._load_json(self.users_file)
-        
-        for user in users:
-            if user.get('id') == user_id:
-                return user
-        
-        return None
+        return _copia(self._indice(self.users_file).get(user_id))
     
     def obter_usuario_por_username(self, username: str) -> Optional[Dict[str, Any]]:
         """
@@ -509,13 +918,7 @@ class DatabaseManager:
         Returns:
             Dicionário com dados do usuário ou None se não encontrado
         """
-        users = self._load_json(self.users_file)
-        
-        for user in users:
-            if user.get('username') == username:
-                return user
-        
-        return None
+        return _copia(self._indice(self.users_file, 'username').get(username))
     
     def listar_usuarios(self) -> List[Dict[str, Any]]:
         """
@@ -526,6 +929,7 @@ class DatabaseManager:
         """
         return self._load_json(self.users_file)
     
+    @_sincronizado
     def atualizar_usuario(self, user_id: int, user_data: Dict[str, Any]) -> bool:
         """
         Atualiza os dados de um usuário.
@@ -537,22 +941,25 @@ class DatabaseManager:
         Returns:
             True se atualizado com sucesso, False caso contrário
         """
-        users = self._load_json(self.users_file)
-        
-        for i, user in enumerate(users):
-            if user.get('id') == user_id:
-                # Manter ID e timestamp de criação
-                user_data['id'] = user_id
-                user_data['created_at'] = user.get('created_at', datetime.now().isoformat())
-                user_data['updated_at'] = datetime.now().isoformat()
-                
-                # Atualizar usuário
-                users[i] = user_data
-                self._save_json(self.users_file, users)
-                return True
+        user = self._indice(self.users_file).get(user_id)
+        if user is None:
+            return False
         
-        return False
+        # Manter ID e timestamp de criação
+        user_data['id'] = user_id
+        self._hash_senha(user_data)
+        now = time.time_ns()
+        user_data['created_at'] = user.get('created_at', now)
+        user_data['updated_at'] = now
+        
+        # Atualizar usuário
+        users = self._registros(self.users_file)
+        registro = dict(user_data)
+        users[users.index(user)] = registro
+        self._registrar_alteracao(self.users_file, users, {'op': 'set', 'rec': registro})
+        return True
     
+    @_sincronizado
     def remover_usuario(self, user_id: int) -> bool:
         """
         Remove um usuário do banco de dados.
@@ -563,15 +970,14 @@ class DatabaseManager:
         Returns:
             True se removido com sucesso, False caso contrário
         """
-        users = self._load_json(self.users_file)
-        
-        for i, user in enumerate(users):
-            if user.get('id') == user_id:
-                users.pop(i)
-                self._save_json(self.users_file, users)
-                return True
+        user = self._indice(self.users_file).get(user_id)
+        if user is None:
+            return False
         
-        return False
+        users = self._registros(self.users_file)
+        users.remove(user)
+        self._registrar_alteracao(self.users_file, users, {'op': 'del', 'id': user_id})
+        return True
     
     def validar_usuario(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """
@@ -586,15 +992,72 @@ class DatabaseManager:
         """
         user = self.obter_usuario_por_username(username)
         
-        if user and user.get('password') == password:
-            return user
+        if user is None:
+            # Mesmo custo de um login real, para não revelar se o usuário existe
+            Usuario.simular_verificacao(password)
+            return None
         
-        return None
+        if 'password_hash' in user:
+            valido = Usuario(senha_hash=user['password_hash']).verificar_senha(password)
+        else:
+            # Registro antigo com senha em texto puro: compara em tempo constante
+            # e migra para o hash no primeiro login válido
+            valido = hmac.compare_digest(str(user.get('password', '')).encode(), password.encode())
+            if valido:
+                self.atualizar_usuario(user['id'], {**user, 'password': password})
+                user = self.buscar_usuario(user['id'])
+        
+        return user if valido else None
+    
+    @staticmethod
+    def _hash_senha(user_data: Dict[str, Any]) -> None:
+        """Troca a senha em texto puro de user_data ('password') pelo hash Argon2 ('password_hash')."""
+        if 'password' in user_data:
+            user_data['password_hash'] = Usuario.hash_senha(user_data.pop('password'))
     
     # ========================================================================
     # MÉTODOS DE EXPORTAÇÃO (Nomenclatura em Português)
     # ========================================================================
     
+    def _exportar_para_excel(self, filepath: str, titulo: str, headers: List[str],
+                             campos: List[str], registros: List[Dict[str, Any]]) -> None:
+        """
+        Grava registros em uma planilha Excel em modo streaming (write-only).
+        
+        As linhas vão direto para o XML da planilha, sem criar um objeto de
+        célula por valor em memória.
+        
+        Args:
+            filepath: Caminho do arquivo Excel de destino
+            titulo: Nome da planilha
+            headers: Cabeçalhos das colunas
+            campos: Chave de cada coluna nos registros
+            registros: Lista de dicionários a exportar
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(titulo)
+        
+        # Ajustar largura das colunas (precisa vir antes das linhas)
+        for col in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col)].width = 15
+        
+        # Estilizar cabeçalhos
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = _HDR_FILL
+            cell.font = _HDR_FONT
+            cell.alignment = _HDR_ALIGN
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        # Adicionar dados
+        for registro in registros:
+            ws.append([registro.get(campo, '') for campo in campos])
+        
+        # Salvar arquivo
+        wb.save(filepath)
+    
     def exportar_funcionarios_para_excel(self, filepath: str) -> bool:
         """
         Exporta dados de funcionários para arquivo Excel.
@@ -606,48 +1069,19 @@ class DatabaseManager:
             True se exportado com sucesso, False caso contrário
         """
         try:
-            employees = self.listar_funcionarios()
-            
-            # Criar workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Funcionários"
-            
-            # Definir cabeçalhos
-            headers = [
-                "ID", "Matrícula", "Nome", "CPF", "Cargo", 
-                "Setor", "Status", "Data Admissão", "Telefone", "Email"
-            ]
-            
-            # Estilizar cabeçalhos
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for col, header in enumerate(headers, start=1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Adicionar dados
-            for row, employee in enumerate(employees, start=2):
-                ws.cell(row=row, column=1, value=employee.get('id', ''))
-                ws.cell(row=row, column=2, value=employee.get('matricula', ''))
-                ws.cell(row=row, column=3, value=employee.get('name', ''))
-                ws.cell(row=row, column=4, value=employee.get('cpf', ''))
-                ws.cell(row=row, column=5, value=employee.get('cargo', ''))
-                ws.cell(row=row, column=6, value=employee.get('setor', ''))
-                ws.cell(row=row, column=7, value=employee.get('status', ''))
-                ws.cell(row=row, column=8, value=employee.get('data_admissao', ''))
-                ws.cell(row=row, column=9, value=employee.get('telefone', ''))
-                ws.cell(row=row, column=10, value=employee.get('email', ''))
-            
-            # Ajustar largura das colunas
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[chr(64 + col)].width = 15
-            
-            # Salvar arquivo
-            wb.save(filepath)
+            self._exportar_para_excel(
+                filepath,
+                "Funcionários",
+                [
+                    "ID", "Matrícula", "Nome", "CPF", "Cargo", 
+                    "Setor", "Status", "Data Admissão", "Telefone", "Email"
+                ],
+                [
+                    'id', 'matricula', 'name', 'cpf', 'cargo',
+                    'setor', 'status', 'data_admissao', 'telefone', 'email'
+                ],
+                self.listar_funcionarios()
+            )
             return True
             
         except Exception as e:
@@ -665,46 +1099,19 @@ class DatabaseManager:
             True se exportado com sucesso, False caso contrário
         """
         try:
-            absences = self.listar_afastamentos()
-            
-            # Criar workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Afastamentos"
-            
-            # Definir cabeçalhos
-            headers = [
-                "ID", "ID Funcionário", "Tipo", "Data Início", 
-                "Data Retorno", "Dias", "Motivo", "Observações"
-            ]
-            
-            # Estilizar cabeçalhos
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for col, header in enumerate(headers, start=1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Adicionar dados
-            for row, absence in enumerate(absences, start=2):
-                ws.cell(row=row, column=1, value=absence.get('id', ''))
-                ws.cell(row=row, column=2, value=absence.get('employee_id', ''))
-                ws.cell(row=row, column=3, value=absence.get('type', ''))
-                ws.cell(row=row, column=4, value=absence.get('start_date', ''))
-                ws.cell(row=row, column=5, value=absence.get('return_date', ''))
-                ws.cell(row=row, column=6, value=absence.get('days', ''))
-                ws.cell(row=row, column=7, value=absence.get('reason', ''))
-                ws.cell(row=row, column=8, value=absence.get('observations', ''))
-            
-            # Ajustar largura das colunas
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[chr(64 + col)].width = 15
-            
-            # Salvar arquivo
-            wb.save(filepath)
+            self._exportar_para_excel(
+                filepath,
+                "Afastamentos",
+                [
+                    "ID", "ID Funcionário", "Tipo", "Data Início", 
+                    "Data Retorno", "Dias", "Motivo", "Observações"
+                ],
+                [
+                    'id', 'employee_id', 'type', 'start_date',
+                    'return_date', 'days', 'reason', 'observations'
+                ],
+                self.listar_afastamentos()
+            )
             return True
             
         except Exception as e:
@@ -715,6 +1122,7 @@ class DatabaseManager:
     # MÉTODOS DE ESTATÍSTICAS E RELATÓRIOS (Nomenclatura em Português)
     # ========================================================================
     
+    @_sincronizado
     def obter_estatisticas(self) -> Dict[str, Any]:
         """
         Retorna estatísticas gerais do sistema.
@@ -722,29 +1130,34 @@ class DatabaseManager:
         Returns:
             Dicionário com estatísticas do sistema
         """
-        employees = self.listar_funcionarios()
-        absences = self.listar_afastamentos()
+        employees = self._registros(self.employees_file)
+        absences = self._registros(self.afastamentos_file)
+        today = datetime.now().date()
         
         # Contar funcionários por status
-        status_count = {}
-        for employee in employees:
-            status = employee.get('status', 'Desconhecido')
-            status_count[status] = status_count.get(status, 0) + 1
+        status_count = dict(Counter(employee.get('status', 'Desconhecido') for employee in employees))
         
-        # Contar afastamentos por tipo
-        absence_type_count = {}
+        # Contar afastamentos por tipo e ativos numa única passada
+        absence_type_count = Counter()
+        active_absences = 0
         for absence in absences:
-            absence_type = absence.get('type', 'Desconhecido')
-            absence_type_count[absence_type] = absence_type_count.get(absence_type, 0) + 1
-        
-        # Contar afastamentos ativos
-        active_absences = len(self.listar_afastamentos_ativos())
+            absence_type_count[absence.get('type', 'Desconhecido')] += 1
+            
+            # Sem data de retorno, considera ativo
+            if not absence.get('return_date'):
+                active_absences += 1
+                continue
+            try:
+                if datetime.fromisoformat(absence['return_date']).date() >= today:
+                    active_absences += 1
+            except (ValueError, TypeError):
+                pass
         
         return {
             'total_employees': len(employees),
             'employees_by_status': status_count,
             'total_absences': len(absences),
-            'absences_by_type': absence_type_count,
+            'absences_by_type': dict(absence_type_count),
             'active_absences': active_absences
         }
     
@@ -774,6 +1187,7 @@ class DatabaseManager:
     # MÉTODOS DE BACKUP E MANUTENÇÃO (Nomenclatura em Português)
     # ========================================================================
     
+    @_sincronizado
     def fazer_backup(self, backup_dir: str) -> bool:
         """
         Cria backup de todos os arquivos de dados.
@@ -785,8 +1199,6 @@ class DatabaseManager:
             True se backup criado com sucesso, False caso contrário
         """
         try:
-            import shutil
-            
             # Criar diretório de backup se não existir
             if not os.path.exists(backup_dir):
                 os.makedirs(backup_dir)
@@ -796,10 +1208,14 @@ class DatabaseManager:
             backup_subdir = os.path.join(backup_dir, f"backup_{timestamp}")
             os.makedirs(backup_subdir)
             
+            # Incorporar os journals pendentes antes de copiar
+            self.commit()
+            
             # Copiar arquivos
-            shutil.copy2(self.employees_file, backup_subdir)
-            shutil.copy2(self.afastamentos_file, backup_subdir)
-            shutil.copy2(self.users_file, backup_subdir)
+            _copiar_arquivos([
+                (filepath, os.path.join(backup_subdir, os.path.basename(filepath)))
+                for filepath in (self.employees_file, self.afastamentos_file, self.users_file)
+            ])
             
             return True
             
@@ -807,6 +1223,7 @@ class DatabaseManager:
             print(f"Erro ao criar backup: {e}")
             return False
     
+    @_sincronizado
     def restaurar_backup(self, backup_dir: str) -> bool:
         """
         Restaura dados de um backup.
@@ -818,8 +1235,6 @@ class DatabaseManager:
             True se restaurado com sucesso, False caso contrário
         """
         try:
-            import shutil
-            
             # Verificar se os arquivos de backup existem
             backup_employees = os.path.join(backup_dir, "employees.json")
             backup_absences = os.path.join(backup_dir, "absences.json")
@@ -828,10 +1243,18 @@ class DatabaseManager:
             if not all(os.path.exists(f) for f in [backup_employees, backup_absences, backup_users]):
                 return False
             
-            # Restaurar arquivos
-            shutil.copy2(backup_employees, self.employees_file)
-            shutil.copy2(backup_absences, self.afastamentos_file)
-            shutil.copy2(backup_users, self.users_file)
+            # Restaurar arquivos (os journals atuais deixam de valer)
+            for filepath in (self.employees_file, self.afastamentos_file, self.users_file):
+                if os.path.exists(self._journal(filepath)):
+                    os.remove(self._journal(filepath))
+            _copiar_arquivos([
+                (backup_employees, self.employees_file),
+                (backup_absences, self.afastamentos_file),
+                (backup_users, self.users_file),
+            ])
+            self._pendentes.clear()
+            self._cache.clear()
+            self._indices.clear()
             
             return True
             
@@ -839,6 +1262,7 @@ class DatabaseManager:
             print(f"Erro ao restaurar backup: {e}")
             return False
     
+    @_sincronizado
     def limpar_todos_dados(self) -> bool:
         """
         Remove todos os dados do sistema (usar com cuidado).
@@ -850,6 +1274,7 @@ class DatabaseManager:
             self._save_json(self.employees_file, [])
             self._save_json(self.afastamentos_file, [])
             self._save_json(self.users_file, [])
+            self._cache.clear()
             return True
         except Exception as e:
             print(f"Erro ao limpar dados: {e}")
@@ -870,32 +1295,104 @@ def create_default_database() -> DatabaseManager:
     return DatabaseManager()
 
 
+def _data_json(valor: Any) -> Optional[datetime]:
+    """Converte uma data ISO de um registro JSON em datetime (None se vazia ou inválida)."""
+    try:
+        return datetime.fromisoformat(valor)
+    except (ValueError, TypeError):
+        return None
+
+
+def _funcionario_de_json(employee: Dict[str, Any]) -> Funcionario:
+    """Converte um funcionário do banco JSON para o modelo do banco SQL."""
+    return Funcionario(
+        nome=employee.get('name', ''),
+        cpf=str(employee.get('cpf', '')),
+        email=employee.get('email', ''),
+        telefone=employee.get('telefone', ''),
+        endereco=employee.get('endereco', ''),
+        loja=employee.get('setor', ''),
+        data_admissao=_data_json(employee.get('data_admissao')),
+        cargo=employee.get('cargo', ''),
+        salario=employee.get('salario', 0.0),
+        ativo=employee.get('status') != 'Desligado'
+    )
+
+
+def _afastamento_de_json(absence: Dict[str, Any], funcionario_id: int) -> Afastamento:
+    """Converte um afastamento do banco JSON para o modelo do banco SQL."""
+    data_inicio = _data_json(absence.get('start_date'))
+    return Afastamento(
+        funcionario_id=funcionario_id,
+        tipo=absence.get('type', ''),
+        data_inicio=data_inicio,
+        # Sem data de retorno, o afastamento termina no próprio início
+        data_fim=_data_json(absence.get('return_date')) or data_inicio,
+        motivo=absence.get('reason') or '',
+        observacoes=absence.get('observations') or ''
+    )
+
+
+def _usuario_de_json(user: Dict[str, Any]) -> Usuario:
+    """Converte um usuário do banco JSON para o modelo do banco SQL."""
+    username = user.get('username', '')
+    usuario = Usuario(
+        nome=user.get('name') or username,
+        email=user.get('email') or username,
+        username=username,
+        senha_hash=user.get('password_hash', ''),
+        perfil=user.get('perfil', PerfilUsuario.FUNCIONARIO.value)
+    )
+    if not usuario.senha_hash:
+        usuario.definir_senha(user.get('password', ''))
+    return usuario
+
+
 def migrate_to_sql(json_db: DatabaseManager, sql_db) -> bool:
     """
     Migra dados do banco JSON para o banco SQL.
     
+    Tudo é inserido em lote, numa única transação de carga em massa (com os
+    índices secundários recriados só no fim); os afastamentos são religados
+    aos novos IDs dos funcionários. Se a origem já for um banco SQLite (um
+    DatabaseSQL), a cópia é feita inteira dentro do SQLite.
+    
     Args:
-        json_db: Instância do DatabaseManager (JSON)
+        json_db: Instância do DatabaseManager (JSON), ou de um DatabaseSQL de origem
         sql_db: Instância do DatabaseSQL
         
     Returns:
             True se migração bem-sucedida, False caso contrário
     """
     try:
-        # Migrar funcionários
-        employees = json_db.listar_funcionarios()
-        for employee in employees:
-            sql_db.add_employee(employee)
-        
-        # Migrar afastamentos
-        absences = json_db.listar_afastamentos()
-        for absence in absences:
-            sql_db.add_absence(absence)
+        # Origem SQLite: ATTACH + INSERT ... SELECT, sem passar pelo Python
+        origem_sqlite = getattr(json_db, 'db_path', None)
+        if origem_sqlite is not None:
+            sql_db.importar_sqlite(origem_sqlite)
+            return True
         
-        # Migrar usuários
-        users = json_db.listar_usuarios()
-        for user in users:
-            sql_db.add_user(user)
+        with sql_db.carga_em_massa():
+            # Migrar funcionários
+            employees = json_db.listar_funcionarios()
+            funcionarios = sql_db.criar_funcionarios_em_lote(
+                [_funcionario_de_json(employee) for employee in employees]
+            )
+            novos_ids = {
+                employee.get('id'): funcionario.id
+                for employee, funcionario in zip(employees, funcionarios)
+            }
+            
+            # Migrar afastamentos (de funcionários migrados)
+            absences = json_db.listar_afastamentos()
+            sql_db.criar_afastamentos_em_lote([
+                _afastamento_de_json(absence, novos_ids[absence.get('employee_id')])
+                for absence in absences
+                if absence.get('employee_id') in novos_ids
+            ])
+            
+            # Migrar usuários
+            users = json_db.listar_usuarios()
+            sql_db.criar_usuarios_em_lote([_usuario_de_json(user) for user in users])
         
         return True
         
@@ -2,130 +2,391 @@
 Gerenciador de banco de dados SQL usando SQLite.
 """
 
-import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+from src.config import DB_TIMEOUT
+from src.utils.db_pool import SQLitePool
 from src.models import Funcionario, Afastamento, Usuario, PerfilUsuario
 
 
 class DatabaseSQL:
     """Gerenciador de banco de dados SQL."""
     
-    def __init__(self, db_path: str = "src/data/rh_control.db"):
+    # Colunas que podem ser consultadas diretamente, por tabela
+    COLUNAS_FUNCIONARIOS = {
+        'id', 'nome', 'cpf', 'email', 'telefone', 'endereco', 'loja',
+        'data_admissao', 'cargo', 'salario', 'ativo', 'data_criacao', 'data_atualizacao'
+    }
+    COLUNAS_USUARIOS = {
+        'id', 'nome', 'email', 'username', 'perfil', 'ativo',
+        'data_criacao', 'data_atualizacao', 'ultimo_acesso'
+    }
+    
+    # Limite de parâmetros por comando nas inserções em lote (o mínimo garantido pelo SQLite)
+    MAX_VARIAVEIS_SQL = 999
+    
+    # Linhas buscadas por fetchmany nas consultas em streaming
+    LOTE_LEITURA = 500
+    
+    # Dias de um afastamento (fim - início + 1), o mesmo que Afastamento.dias_afastamento()
+    DIAS_AFASTAMENTO_SQL = "COALESCE(CAST(julianday(data_fim) - julianday(data_inicio) AS INTEGER) + 1, 0)"
+    
+    # Índices das consultas mais frequentes, por nome (cpf, username e email já têm os índices do UNIQUE)
+    INDICES = {
+        # Listagens de ativos ordenadas por nome: índices parciais, só com as linhas ativas
+        'idx_func_ativo_nome': "funcionarios(nome) WHERE ativo = 1",
+        'idx_usuarios_ativo_nome': "usuarios(nome) WHERE ativo = 1",
+        # Afastamentos de um funcionário, dos mais recentes para os mais antigos
+        'idx_afast_func_inicio': "afastamentos(funcionario_id, data_inicio DESC)",
+        # Consultas por período
+        'idx_afast_periodo': "afastamentos(data_inicio, data_fim, tipo)",
+        # Notificações de um usuário (só as não lidas, ou todas), das mais recentes para as mais antigas
+        'idx_notif_usuario': "notificacoes(usuario_id, lida, data_criacao DESC)",
+    }
+    
+    # Colunas da tabela notificacoes lidas pelas consultas (as chaves dos dicts de notificação)
+    CAMPOS_NOTIFICACAO = (
+        'id', 'usuario_id', 'titulo', 'mensagem', 'tipo', 'lida', 'data_criacao', 'data_leitura'
+    )
+    
+    # Consultas com a lista explícita de colunas, na ordem dos campos de cada modelo:
+    # as linhas vão para o construtor por posição, então a ordem não pode depender
+    # da ordem das colunas na tabela (ALTER TABLE, bancos migrados)
+    _SELECT_FUNCIONARIOS = f"SELECT {', '.join(Funcionario._CAMPOS)} FROM funcionarios"
+    _SELECT_AFASTAMENTOS = f"SELECT {', '.join(Afastamento._CAMPOS)} FROM afastamentos"
+    _SELECT_USUARIOS = f"SELECT {', '.join(Usuario._CAMPOS)} FROM usuarios"
+    _SELECT_NOTIFICACOES = f"SELECT {', '.join(CAMPOS_NOTIFICACAO)} FROM notificacoes"
+    
+    def __init__(self, db_path: str = "src/data/rh_control.db", timeout: float = DB_TIMEOUT):
         """Inicializa o gerenciador de banco de dados SQL."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.pool = SQLitePool(self.db_path, timeout=timeout)
         self._criar_tabelas()
     
-    def _get_connection(self):
-        """Obtém uma conexão com o banco de dados."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+    @contextmanager
+    def sessao(self):
+        """
+        Reaproveita uma única conexão para todas as operações do bloco.
+        
+        Sessões aninhadas (na mesma thread) usam a conexão da sessão externa.
+        
+        Yields:
+            A conexão compartilhada pelo bloco
+        """
+        with self.pool.acquire() as conn:
+            yield conn
+    
+    @contextmanager
+    def transacao(self):
+        """
+        Executa todas as escritas do bloco em uma única transação (um só fsync).
+        
+        Os commits de criar_*, atualizar_* e deletar_* chamados dentro do
+        bloco são adiados para o fim dele; se o bloco falhar, nada é gravado.
+        
+        Exemplo:
+            with db.transacao():
+                for funcionario in funcionarios:
+                    db.criar_funcionario(funcionario)
+        
+        Yields:
+            A conexão da transação
+        """
+        with self.pool.transaction() as conn:
+            yield conn
+    
+    def pool_health(self) -> Dict[str, int]:
+        """Retorna os contadores de uso do pool de conexões."""
+        return self.pool.pool_health()
     
     def _criar_tabelas(self):
         """Cria as tabelas do banco de dados."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Tabela de Funcionários
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS funcionarios (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                cpf TEXT UNIQUE NOT NULL,
-                email TEXT NOT NULL,
-                telefone TEXT NOT NULL,
-                endereco TEXT NOT NULL,
-                loja TEXT NOT NULL,
-                data_admissao DATETIME,
-                cargo TEXT NOT NULL,
-                salario REAL,
-                ativo BOOLEAN DEFAULT 1,
-                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Tabela de Afastamentos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS afastamentos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                funcionario_id INTEGER NOT NULL,
-                tipo TEXT NOT NULL,
-                data_inicio DATETIME NOT NULL,
-                data_fim DATETIME NOT NULL,
-                motivo TEXT,
-                observacoes TEXT,
-                documento_anexo TEXT,
-                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id)
-            )
-        """)
-        
-        # Tabela de Usuários
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS usuarios (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                username TEXT UNIQUE NOT NULL,
-                senha_hash TEXT NOT NULL,
-                perfil TEXT DEFAULT 'Funcionário',
-                ativo BOOLEAN DEFAULT 1,
-                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                ultimo_acesso DATETIME
-            )
-        """)
-        
-        # Tabela de Notificações
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notificacoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                usuario_id INTEGER NOT NULL,
-                titulo TEXT NOT NULL,
-                mensagem TEXT NOT NULL,
-                tipo TEXT DEFAULT 'info',
-                lida BOOLEAN DEFAULT 0,
-                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_leitura DATETIME,
-                FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
-            )
-        """)
-        
-        # Tabela de Logs de Auditoria
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS auditoria (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                usuario_id INTEGER,
-                acao TEXT NOT NULL,
-                tabela TEXT NOT NULL,
-                registro_id INTEGER,
-                dados_anteriores TEXT,
-                dados_novos TEXT,
-                data_acao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Tabela de Funcionários
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS funcionarios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    cpf TEXT UNIQUE NOT NULL,
+                    email TEXT NOT NULL,
+                    telefone TEXT NOT NULL,
+                    endereco TEXT NOT NULL,
+                    loja TEXT NOT NULL,
+                    data_admissao DATETIME,
+                    cargo TEXT NOT NULL,
+                    salario REAL,
+                    ativo BOOLEAN DEFAULT 1,
+                    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Tabela de Afastamentos
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS afastamentos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    funcionario_id INTEGER NOT NULL,
+                    tipo TEXT NOT NULL,
+                    data_inicio DATETIME NOT NULL,
+                    data_fim DATETIME NOT NULL,
+                    motivo TEXT,
+                    observacoes TEXT,
+                    documento_anexo TEXT,
+                    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id)
+                )
+            """)
+            
+            # Tabela de Usuários
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS usuarios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    username TEXT UNIQUE NOT NULL,
+                    senha_hash TEXT NOT NULL,
+                    perfil TEXT DEFAULT 'Funcionário',
+                    ativo BOOLEAN DEFAULT 1,
+                    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    ultimo_acesso DATETIME
+                )
+            """)
+            
+            # Tabela de Notificações
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notificacoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    usuario_id INTEGER NOT NULL,
+                    titulo TEXT NOT NULL,
+                    mensagem TEXT NOT NULL,
+                    tipo TEXT DEFAULT 'info',
+                    lida BOOLEAN DEFAULT 0,
+                    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    data_leitura DATETIME,
+                    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+                )
+            """)
+            
+            # Tabela de Logs de Auditoria
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS auditoria (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    usuario_id INTEGER,
+                    acao TEXT NOT NULL,
+                    tabela TEXT NOT NULL,
+                    registro_id INTEGER,
+                    dados_anteriores TEXT,
+                    dados_novos TEXT,
+                    data_acao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+                )
+            """)
+            
+            self.pool.commit(conn)
+        
+        self.criar_indices()
+    
+    def criar_indices(self) -> None:
+        """Cria os índices de INDICES que ainda não existem."""
+        with self.pool.acquire() as conn:
+            for nome, definicao in self.INDICES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+            self.pool.commit(conn)
+    
+    def remover_indices(self) -> None:
+        """Remove os índices de INDICES (as chaves primárias e os UNIQUE continuam)."""
+        with self.pool.acquire() as conn:
+            for nome in self.INDICES:
+                conn.execute(f"DROP INDEX IF EXISTS {nome}")
+            self.pool.commit(conn)
+    
+    @contextmanager
+    def carga_em_massa(self):
+        """
+        Prepara o banco para uma carga grande de dados (por exemplo, a migração do JSON).
+        
+        Os índices secundários são removidos antes e recriados uma vez no fim,
+        em vez de atualizados a cada linha inserida; todas as escritas do
+        bloco formam uma única transação, gravada com synchronous = OFF
+        (a carga pode ser refeita se o processo cair no meio).
+        
+        Yields:
+            A conexão usada pela carga
+        """
+        self.remover_indices()
+        try:
+            with self.pool.acquire() as conn:
+                # O nível de sincronização não pode mudar dentro de uma transação
+                conn.execute("PRAGMA synchronous = OFF")
+                try:
+                    with self.pool.transaction():
+                        yield conn
+                finally:
+                    conn.execute("PRAGMA synchronous = NORMAL")
+        finally:
+            self.criar_indices()
+    
+    def importar_sqlite(self, caminho: str) -> Dict[str, int]:
+        """
+        Copia funcionários, afastamentos e usuários de outro banco SQLite.
+        
+        Os dados passam de um banco ao outro dentro do próprio SQLite (ATTACH
+        + INSERT ... SELECT), sem virar objetos Python, numa carga em massa.
+        Os registros recebem novos IDs; os afastamentos são religados aos
+        funcionários copiados pelo CPF.
+        
+        Args:
+            caminho: Arquivo do banco de origem (mesmo esquema)
+            
+        Returns:
+            Quantidade de registros copiados por tabela
+        """
+        with self.pool.acquire() as conn:
+            # ATTACH/DETACH não podem ocorrer dentro de uma transação
+            conn.execute("ATTACH DATABASE ? AS origem", (str(caminho),))
+            try:
+                with self.carga_em_massa():
+                    funcionarios = conn.execute("""
+                        INSERT INTO funcionarios
+                        (nome, cpf, email, telefone, endereco, loja, data_admissao, cargo, salario, ativo,
+                         data_criacao, data_atualizacao)
+                        SELECT nome, cpf, email, telefone, endereco, loja, data_admissao, cargo, salario, ativo,
+                               data_criacao, data_atualizacao
+                        FROM origem.funcionarios
+                        ORDER BY id
+                    """).rowcount
+                    
+                    afastamentos = conn.execute("""
+                        INSERT INTO afastamentos
+                        (funcionario_id, tipo, data_inicio, data_fim, motivo, observacoes, documento_anexo,
+                         data_criacao, data_atualizacao)
+                        SELECT f.id, a.tipo, a.data_inicio, a.data_fim, a.motivo, a.observacoes, a.documento_anexo,
+                               a.data_criacao, a.data_atualizacao
+                        FROM origem.afastamentos a
+                        JOIN origem.funcionarios fo ON fo.id = a.funcionario_id
+                        JOIN main.funcionarios f ON f.cpf = fo.cpf
+                        ORDER BY a.id
+                    """).rowcount
+                    
+                    usuarios = conn.execute("""
+                        INSERT INTO usuarios
+                        (nome, email, username, senha_hash, perfil, ativo, data_criacao, data_atualizacao, ultimo_acesso)
+                        SELECT nome, email, username, senha_hash, perfil, ativo, data_criacao, data_atualizacao, ultimo_acesso
+                        FROM origem.usuarios
+                        ORDER BY id
+                    """).rowcount
+            finally:
+                conn.execute("DETACH DATABASE origem")
+        
+        return {'funcionarios': funcionarios, 'afastamentos': afastamentos, 'usuarios': usuarios}
+    
+    def _inserir_em_lote(self, tabela: str, colunas: Tuple[str, ...], registros: List[Any],
+                         parametros: Callable[[Any], tuple]) -> List[Any]:
+        """
+        Insere vários registros com INSERTs de várias linhas, em uma única transação.
+        
+        Cada comando leva tantas linhas quanto cabem em MAX_VARIAVEIS_SQL
+        parâmetros, então o SQLite compila um comando a cada dezenas de
+        linhas (e só dois textos distintos: o lote cheio e o último). Como
+        nenhuma outra escrita intercala a transação, os IDs gerados em cada
+        comando são consecutivos e terminam em last_insert_rowid().
+        
+        Args:
+            tabela: Tabela de destino
+            colunas: Colunas preenchidas, na ordem dos parâmetros
+            registros: Objetos a inserir (recebem o ID gerado)
+            parametros: Função que monta a tupla de parâmetros de um objeto
+            
+        Returns:
+            A mesma lista de registros, com os IDs preenchidos
+        """
+        por_comando = max(1, self.MAX_VARIAVEIS_SQL // len(colunas))
+        prefixo = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES "
+        linha = f"({', '.join('?' * len(colunas))})"
+        
+        with self.pool.transaction() as conn:
+            for inicio in range(0, len(registros), por_comando):
+                lote = registros[inicio:inicio + por_comando]
+                sql = prefixo + ', '.join([linha] * len(lote))
+                conn.execute(sql, list(chain.from_iterable(map(parametros, lote))))
+                
+                ultimo_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                for registro_id, registro in enumerate(lote, start=ultimo_id - len(lote) + 1):
+                    registro.id = registro_id
+        
+        return registros
+    
+    def _iterar(self, sql: str, parametros: tuple, conversor: Callable[[Any], Any]) -> Iterator[Any]:
+        """
+        Executa uma consulta e gera os registros convertidos, lote a lote.
+        
+        Apenas LOTE_LEITURA linhas ficam em memória de cada vez. A consulta usa
+        uma conexão própria do pool (não a da thread), emprestada até o
+        gerador ser esgotado ou fechado, então as operações feitas enquanto
+        ele está pausado não compartilham a conexão com ele.
+        
+        Args:
+            sql: Comando SELECT parametrizado
+            parametros: Parâmetros do comando
+            conversor: Função que converte uma linha no objeto gerado
+            
+        Yields:
+            Os objetos convertidos, na ordem da consulta
+        """
+        with self.pool.acquire_separada() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = self.LOTE_LEITURA
+            try:
+                cursor.execute(sql, parametros)
+                while rows := cursor.fetchmany():
+                    for row in rows:
+                        yield conversor(row)
+            finally:
+                cursor.close()
     
     # ============ OPERAÇÕES COM FUNCIONÁRIOS ============
     
     def criar_funcionario(self, funcionario: Funcionario) -> Funcionario:
         """Cria um novo funcionário."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO funcionarios 
-            (nome, cpf, email, telefone, endereco, loja, data_admissao, cargo, salario, ativo)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO funcionarios 
+                (nome, cpf, email, telefone, endereco, loja, data_admissao, cargo, salario, ativo)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                funcionario.nome,
+                funcionario.cpf,
+                funcionario.email,
+                funcionario.telefone,
+                funcionario.endereco,
+                funcionario.loja,
+                funcionario.data_admissao,
+                funcionario.cargo,
+                funcionario.salario,
+                funcionario.ativo
+            ))
+            
+            funcionario.id = cursor.lastrowid
+            self.pool.commit(conn)
+        
+        return funcionario
+    
+    def criar_funcionarios_em_lote(self, funcionarios: List[Funcionario]) -> List[Funcionario]:
+        """Cria vários funcionários em uma única transação."""
+        return self._inserir_em_lote('funcionarios', (
+            'nome', 'cpf', 'email', 'telefone', 'endereco', 'loja', 'data_admissao', 'cargo', 'salario', 'ativo'
+        ), funcionarios, lambda funcionario: (
             funcionario.nome,
             funcionario.cpf,
             funcionario.email,
@@ -137,21 +398,14 @@ class DatabaseSQL:
             funcionario.salario,
             funcionario.ativo
         ))
-        
-        funcionario.id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return funcionario
     
     def obter_funcionario(self, funcionario_id: int) -> Optional[Funcionario]:
         """Obtém um funcionário pelo ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM funcionarios WHERE id = ?", (funcionario_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"{self._SELECT_FUNCIONARIOS} WHERE id = ?", (funcionario_id,))
+            row = cursor.fetchone()
         
         if row:
             return self._row_to_funcionario(row)
@@ -159,64 +413,103 @@ class DatabaseSQL:
     
     def listar_funcionarios(self, apenas_ativos: bool = True) -> List[Funcionario]:
         """Lista todos os funcionários."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
+        return list(self.iter_funcionarios(apenas_ativos))
+    
+    def iter_funcionarios(self, apenas_ativos: bool = True) -> Iterator[Funcionario]:
+        """Gera os funcionários ordenados por nome, sem carregar a tabela inteira."""
         if apenas_ativos:
-            cursor.execute("SELECT * FROM funcionarios WHERE ativo = 1 ORDER BY nome")
+            sql = f"{self._SELECT_FUNCIONARIOS} WHERE ativo = 1 ORDER BY nome"
         else:
-            cursor.execute("SELECT * FROM funcionarios ORDER BY nome")
+            sql = f"{self._SELECT_FUNCIONARIOS} ORDER BY nome"
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [self._row_to_funcionario(row) for row in rows]
+        return self._iterar(sql, (), self._row_to_funcionario)
+    
+    def listar_funcionarios_tuplas(self, colunas: List[str], apenas_ativos: bool = True) -> List[tuple]:
+        """Lista apenas as colunas pedidas dos funcionários, como tuplas (sem montar objetos)."""
+        return self._listar_tuplas('funcionarios', colunas, self.COLUNAS_FUNCIONARIOS, apenas_ativos)
+    
+    def _listar_tuplas(self, tabela: str, colunas: List[str], permitidas: set, apenas_ativos: bool) -> List[tuple]:
+        """Seleciona colunas de uma tabela, ordenadas por nome, validando-as contra a lista permitida."""
+        invalidas = set(colunas) - permitidas
+        if invalidas:
+            raise ValueError(f"Colunas inválidas: {', '.join(sorted(invalidas))}")
+        
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            query = f"SELECT {', '.join(colunas)} FROM {tabela}"
+            if apenas_ativos:
+                query += " WHERE ativo = 1"
+            query += " ORDER BY nome"
+            
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        
+        return rows
+    
+    def obter_estatisticas_funcionarios(self, apenas_ativos: bool = True) -> Dict[str, Any]:
+        """Calcula total, lojas, cargos e folha de pagamento em uma única consulta."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT COUNT(*) AS total,
+                       COUNT(DISTINCT NULLIF(loja, '')) AS lojas,
+                       COUNT(DISTINCT NULLIF(cargo, '')) AS cargos,
+                       COALESCE(SUM(salario), 0) AS salario_total
+                FROM funcionarios
+            """
+            if apenas_ativos:
+                query += " WHERE ativo = 1"
+            
+            cursor.execute(query)
+            row = cursor.fetchone()
+            colunas = [descricao[0] for descricao in cursor.description]
+        
+        return dict(zip(colunas, row))
     
     def atualizar_funcionario(self, funcionario: Funcionario) -> bool:
         """Atualiza um funcionário."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE funcionarios
-            SET nome = ?, email = ?, telefone = ?, endereco = ?, loja = ?, cargo = ?, salario = ?, data_atualizacao = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (
-            funcionario.nome,
-            funcionario.email,
-            funcionario.telefone,
-            funcionario.endereco,
-            funcionario.loja,
-            funcionario.cargo,
-            funcionario.salario,
-            funcionario.id
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE funcionarios
+                SET nome = ?, email = ?, telefone = ?, endereco = ?, loja = ?, cargo = ?, salario = ?, data_atualizacao = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (
+                funcionario.nome,
+                funcionario.email,
+                funcionario.telefone,
+                funcionario.endereco,
+                funcionario.loja,
+                funcionario.cargo,
+                funcionario.salario,
+                funcionario.id
+            ))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
     def deletar_funcionario(self, funcionario_id: int) -> bool:
         """Deleta um funcionário (soft delete)."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("UPDATE funcionarios SET ativo = 0, data_atualizacao = CURRENT_TIMESTAMP WHERE id = ?", (funcionario_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE funcionarios SET ativo = 0, data_atualizacao = CURRENT_TIMESTAMP WHERE id = ?", (funcionario_id,))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
     def obter_funcionario_por_cpf(self, cpf: str) -> Optional[Funcionario]:
         """Obtém um funcionário pelo CPF."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM funcionarios WHERE cpf = ? AND ativo = 1", (cpf,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"{self._SELECT_FUNCIONARIOS} WHERE cpf = ? AND ativo = 1", (cpf,))
+            row = cursor.fetchone()
         
         if row:
             return self._row_to_funcionario(row)
@@ -226,14 +519,32 @@ class DatabaseSQL:
     
     def criar_afastamento(self, afastamento: Afastamento) -> Afastamento:
         """Cria um novo afastamento."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO afastamentos 
-            (funcionario_id, tipo, data_inicio, data_fim, motivo, observacoes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO afastamentos 
+                (funcionario_id, tipo, data_inicio, data_fim, motivo, observacoes)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                afastamento.funcionario_id,
+                afastamento.tipo,
+                afastamento.data_inicio,
+                afastamento.data_fim,
+                afastamento.motivo,
+                afastamento.observacoes
+            ))
+            
+            afastamento.id = cursor.lastrowid
+            self.pool.commit(conn)
+        
+        return afastamento
+    
+    def criar_afastamentos_em_lote(self, afastamentos: List[Afastamento]) -> List[Afastamento]:
+        """Cria vários afastamentos em uma única transação."""
+        return self._inserir_em_lote('afastamentos', (
+            'funcionario_id', 'tipo', 'data_inicio', 'data_fim', 'motivo', 'observacoes'
+        ), afastamentos, lambda afastamento: (
             afastamento.funcionario_id,
             afastamento.tipo,
             afastamento.data_inicio,
@@ -241,72 +552,184 @@ class DatabaseSQL:
             afastamento.motivo,
             afastamento.observacoes
         ))
+    
+    def listar_afastamentos(self, funcionario_ids: Optional[List[int]] = None, tipo: Optional[str] = None) -> List[Afastamento]:
+        """Lista afastamentos, opcionalmente filtrando por funcionários e tipo, em uma única consulta."""
+        if funcionario_ids is not None and not funcionario_ids:
+            return []
+        
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            condicoes = []
+            parametros = []
+            
+            if funcionario_ids is not None:
+                condicoes.append(f"funcionario_id IN ({', '.join('?' * len(funcionario_ids))})")
+                parametros.extend(funcionario_ids)
+            
+            if tipo is not None:
+                condicoes.append("tipo = ?")
+                parametros.append(tipo)
+            
+            where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+            cursor.execute(f"{self._SELECT_AFASTAMENTOS} {where} ORDER BY data_inicio DESC", parametros)
+            rows = cursor.fetchall()
         
-        afastamento.id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return afastamento
+        return [self._row_to_afastamento(row) for row in rows]
     
     def listar_afastamentos_por_funcionario(self, funcionario_id: int) -> List[Afastamento]:
         """Lista afastamentos de um funcionário."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM afastamentos WHERE funcionario_id = ? ORDER BY data_inicio DESC", (funcionario_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [self._row_to_afastamento(row) for row in rows]
+        return list(self._iterar(
+            f"{self._SELECT_AFASTAMENTOS} WHERE funcionario_id = ? ORDER BY data_inicio DESC",
+            (funcionario_id,), self._row_to_afastamento
+        ))
     
     def listar_afastamentos_por_periodo(self, data_inicio: datetime, data_fim: datetime) -> List[Afastamento]:
         """Lista afastamentos em um período."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM afastamentos 
+        return list(self.iter_afastamentos_por_periodo(data_inicio, data_fim))
+    
+    def iter_afastamentos_por_periodo(self, data_inicio: datetime, data_fim: datetime) -> Iterator[Afastamento]:
+        """Gera os afastamentos em um período, sem carregar todos de uma vez."""
+        # Busca pelo índice idx_afast_periodo; as datas vão como texto no mesmo
+        # formato gravado no banco, sem passar pelos adaptadores do sqlite3
+        return self._iterar(f"""
+            {self._SELECT_AFASTAMENTOS} 
             WHERE data_inicio <= ? AND data_fim >= ?
             ORDER BY data_inicio
-        """, (data_fim, data_inicio))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [self._row_to_afastamento(row) for row in rows]
+        """, (str(data_fim), str(data_inicio)), self._row_to_afastamento)
+    
+    def contar_afastamentos(self) -> int:
+        """Conta os afastamentos listados em listar_afastamentos_pagina."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM afastamentos a
+                JOIN funcionarios f ON f.id = a.funcionario_id
+            """)
+            
+            total = cursor.fetchone()[0]
+        
+        return total
+    
+    def listar_afastamentos_pagina(self, offset: int, limite: int) -> List[tuple]:
+        """Lista uma página de (funcionário, tipo, início, fim, dias, motivo), dos afastamentos mais recentes para os mais antigos."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT f.nome, a.tipo, a.data_inicio, a.data_fim, {self.DIAS_AFASTAMENTO_SQL}, a.motivo
+                FROM afastamentos a
+                JOIN funcionarios f ON f.id = a.funcionario_id
+                ORDER BY a.data_inicio DESC, a.id DESC
+                LIMIT ? OFFSET ?
+            """, (limite, offset))
+            
+            rows = cursor.fetchall()
+        
+        return rows
+    
+    def listar_afastamentos_por_periodo_com_nome(self, data_inicio: datetime, data_fim: datetime) -> List[tuple]:
+        """Lista (funcionario_id, funcionário, tipo, início, fim, dias, motivo) dos afastamentos em um período (JOIN em uma única consulta)."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT a.funcionario_id, f.nome, a.tipo, a.data_inicio, a.data_fim, {self.DIAS_AFASTAMENTO_SQL}, a.motivo
+                FROM afastamentos a
+                LEFT JOIN funcionarios f ON f.id = a.funcionario_id
+                WHERE a.data_inicio <= ? AND a.data_fim >= ?
+                ORDER BY a.data_inicio
+            """, (str(data_fim), str(data_inicio)))
+            
+            rows = cursor.fetchall()
+        
+        return rows
+    
+    def relatorio_ferias(self, apenas_ativos: bool = True) -> List[tuple]:
+        """Retorna (id, nome, data de admissão, dias de férias utilizados) por funcionário em uma única consulta."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            query = f"""
+                SELECT f.id, f.nome, f.data_admissao, COALESCE(SUM({self.DIAS_AFASTAMENTO_SQL}), 0)
+                FROM funcionarios f
+                LEFT JOIN afastamentos a ON a.funcionario_id = f.id AND a.tipo = ?
+            """
+            if apenas_ativos:
+                query += " WHERE f.ativo = 1"
+            query += " GROUP BY f.id ORDER BY f.nome"
+            
+            cursor.execute(query, ("Férias",))
+            rows = cursor.fetchall()
+        
+        return rows
+    
+    def dias_ferias_usados(self, funcionario_id: int) -> int:
+        """Soma no banco os dias de férias já utilizados por um funcionário."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT COALESCE(SUM({self.DIAS_AFASTAMENTO_SQL}), 0)
+                FROM afastamentos
+                WHERE funcionario_id = ? AND tipo = ?
+            """, (funcionario_id, "Férias"))
+            
+            total = cursor.fetchone()[0]
+        
+        return int(total)
+    
+    def resumo_afastamentos_por_tipo(self) -> List[tuple]:
+        """Retorna (tipo, quantidade, total de dias) por tipo de afastamento, agregados no banco."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT tipo,
+                       COUNT(*),
+                       COALESCE(SUM({self.DIAS_AFASTAMENTO_SQL}), 0)
+                FROM afastamentos
+                GROUP BY tipo
+                ORDER BY COUNT(*) DESC
+            """)
+            
+            rows = cursor.fetchall()
+        
+        return rows
     
     def atualizar_afastamento(self, afastamento: Afastamento) -> bool:
         """Atualiza um afastamento."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE afastamentos
-            SET tipo = ?, data_inicio = ?, data_fim = ?, motivo = ?, observacoes = ?, data_atualizacao = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (
-            afastamento.tipo,
-            afastamento.data_inicio,
-            afastamento.data_fim,
-            afastamento.motivo,
-            afastamento.observacoes,
-            afastamento.id
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE afastamentos
+                SET tipo = ?, data_inicio = ?, data_fim = ?, motivo = ?, observacoes = ?, data_atualizacao = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (
+                afastamento.tipo,
+                afastamento.data_inicio,
+                afastamento.data_fim,
+                afastamento.motivo,
+                afastamento.observacoes,
+                afastamento.id
+            ))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
     def deletar_afastamento(self, afastamento_id: int) -> bool:
         """Deleta um afastamento."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM afastamentos WHERE id = ?", (afastamento_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM afastamentos WHERE id = ?", (afastamento_id,))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
@@ -314,14 +737,32 @@ class DatabaseSQL:
     
     def criar_usuario(self, usuario: Usuario) -> Usuario:
         """Cria um novo usuário."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO usuarios 
-            (nome, email, username, senha_hash, perfil, ativo)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO usuarios 
+                (nome, email, username, senha_hash, perfil, ativo)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                usuario.nome,
+                usuario.email,
+                usuario.username,
+                usuario.senha_hash,
+                usuario.perfil,
+                usuario.ativo
+            ))
+            
+            usuario.id = cursor.lastrowid
+            self.pool.commit(conn)
+        
+        return usuario
+    
+    def criar_usuarios_em_lote(self, usuarios: List[Usuario]) -> List[Usuario]:
+        """Cria vários usuários em uma única transação."""
+        return self._inserir_em_lote('usuarios', (
+            'nome', 'email', 'username', 'senha_hash', 'perfil', 'ativo'
+        ), usuarios, lambda usuario: (
             usuario.nome,
             usuario.email,
             usuario.username,
@@ -329,21 +770,14 @@ class DatabaseSQL:
             usuario.perfil,
             usuario.ativo
         ))
-        
-        usuario.id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return usuario
     
     def obter_usuario(self, usuario_id: int) -> Optional[Usuario]:
         """Obtém um usuário pelo ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM usuarios WHERE id = ?", (usuario_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"{self._SELECT_USUARIOS} WHERE id = ?", (usuario_id,))
+            row = cursor.fetchone()
         
         if row:
             return self._row_to_usuario(row)
@@ -351,12 +785,11 @@ class DatabaseSQL:
     
     def obter_usuario_por_username(self, username: str) -> Optional[Usuario]:
         """Obtém um usuário pelo username."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM usuarios WHERE username = ? AND ativo = 1", (username,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"{self._SELECT_USUARIOS} WHERE username = ? AND ativo = 1", (username,))
+            row = cursor.fetchone()
         
         if row:
             return self._row_to_usuario(row)
@@ -364,12 +797,40 @@ class DatabaseSQL:
     
     def obter_usuario_por_email(self, email: str) -> Optional[Usuario]:
         """Obtém um usuário pelo email."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"{self._SELECT_USUARIOS} WHERE email = ? AND ativo = 1", (email,))
+            row = cursor.fetchone()
         
-        cursor.execute("SELECT * FROM usuarios WHERE email = ? AND ativo = 1", (email,))
-        row = cursor.fetchone()
-        conn.close()
+        if row:
+            return self._row_to_usuario(row)
+        return None
+    
+    def obter_usuario_por_username_ou_email(self, username: str, email: str) -> Optional[Usuario]:
+        """
+        Obtém, em uma única consulta, o usuário que já usa o username ou o email.
+        
+        Considera também usuários inativos, já que ambas as colunas são UNIQUE.
+        Se houver conflito nos dois, o dono do username tem preferência.
+        
+        Args:
+            username: Username a verificar
+            email: Email a verificar
+            
+        Returns:
+            O usuário em conflito, ou None se ambos estiverem livres
+        """
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                {self._SELECT_USUARIOS}
+                WHERE username = ? OR email = ?
+                ORDER BY username = ? DESC
+                LIMIT 1
+            """, (username, email, username))
+            row = cursor.fetchone()
         
         if row:
             return self._row_to_usuario(row)
@@ -377,103 +838,177 @@ class DatabaseSQL:
     
     def listar_usuarios(self, apenas_ativos: bool = True) -> List[Usuario]:
         """Lista todos os usuários."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
+        return list(self.iter_usuarios(apenas_ativos))
+    
+    def iter_usuarios(self, apenas_ativos: bool = True) -> Iterator[Usuario]:
+        """Gera os usuários ordenados por nome, sem carregar a tabela inteira."""
         if apenas_ativos:
-            cursor.execute("SELECT * FROM usuarios WHERE ativo = 1 ORDER BY nome")
+            sql = f"{self._SELECT_USUARIOS} WHERE ativo = 1 ORDER BY nome"
         else:
-            cursor.execute("SELECT * FROM usuarios ORDER BY nome")
-        
-        rows = cursor.fetchall()
-        conn.close()
+            sql = f"{self._SELECT_USUARIOS} ORDER BY nome"
         
-        return [self._row_to_usuario(row) for row in rows]
+        return self._iterar(sql, (), self._row_to_usuario)
+    
+    def listar_usuarios_tuplas(self, colunas: List[str], apenas_ativos: bool = True) -> List[tuple]:
+        """Lista apenas as colunas pedidas dos usuários, como tuplas (sem montar objetos)."""
+        return self._listar_tuplas('usuarios', colunas, self.COLUNAS_USUARIOS, apenas_ativos)
     
     def atualizar_usuario(self, usuario: Usuario) -> bool:
         """Atualiza um usuário."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE usuarios
-            SET nome = ?, email = ?, perfil = ?, senha_hash = ?, ultimo_acesso = ?, data_atualizacao = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (
-            usuario.nome,
-            usuario.email,
-            usuario.perfil,
-            usuario.senha_hash,
-            usuario.ultimo_acesso,
-            usuario.id
-        ))
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE usuarios
+                SET nome = ?, email = ?, perfil = ?, senha_hash = ?, ultimo_acesso = ?, data_atualizacao = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (
+                usuario.nome,
+                usuario.email,
+                usuario.perfil,
+                usuario.senha_hash,
+                usuario.ultimo_acesso,
+                usuario.id
+            ))
+            
+            self.pool.commit(conn)
         
-        conn.commit()
-        conn.close()
+        return cursor.rowcount > 0
+    
+    def registrar_ultimo_acesso(self, usuario_id: int, quando: datetime) -> bool:
+        """Grava só o último acesso de um usuário (sem tocar nos demais campos)."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE usuarios SET ultimo_acesso = ? WHERE id = ?", (str(quando), usuario_id))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
     def deletar_usuario(self, usuario_id: int) -> bool:
         """Deleta um usuário (soft delete)."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE usuarios SET ativo = 0, data_atualizacao = CURRENT_TIMESTAMP WHERE id = ?", (usuario_id,))
+            
+            self.pool.commit(conn)
         
-        cursor.execute("UPDATE usuarios SET ativo = 0, data_atualizacao = CURRENT_TIMESTAMP WHERE id = ?", (usuario_id,))
+        return cursor.rowcount > 0
+    
+    # ============ OPERAÇÕES COM NOTIFICAÇÕES ============
+    
+    def criar_notificacoes(self, notificacoes: List[dict]) -> List[dict]:
+        """
+        Grava várias notificações em uma única transação.
+        
+        Args:
+            notificacoes: Dicts com as chaves de CAMPOS_NOTIFICACAO (o 'id' é ignorado)
+            
+        Returns:
+            A mesma lista, com os IDs gerados preenchidos
+        """
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            for notificacao in notificacoes:
+                cursor.execute("""
+                    INSERT INTO notificacoes
+                    (usuario_id, titulo, mensagem, tipo, lida, data_criacao, data_leitura)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    notificacao['usuario_id'],
+                    notificacao['titulo'],
+                    notificacao['mensagem'],
+                    notificacao['tipo'],
+                    notificacao['lida'],
+                    str(notificacao['data_criacao']),
+                    str(notificacao['data_leitura']) if notificacao['data_leitura'] else None
+                ))
+                notificacao['id'] = cursor.lastrowid
+        
+        return notificacoes
+    
+    def listar_notificacoes(self, usuario_id: int, apenas_nao_lidas: bool = False) -> List[dict]:
+        """Lista as notificações de um usuário, das mais recentes para as mais antigas."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            if apenas_nao_lidas:
+                cursor.execute(f"""
+                    {self._SELECT_NOTIFICACOES} WHERE usuario_id = ? AND lida = 0
+                    ORDER BY data_criacao DESC
+                """, (usuario_id,))
+            else:
+                cursor.execute(
+                    f"{self._SELECT_NOTIFICACOES} WHERE usuario_id = ? ORDER BY data_criacao DESC",
+                    (usuario_id,)
+                )
+            
+            return [self._row_to_notificacao(row) for row in cursor.fetchall()]
+    
+    def marcar_notificacao_lida(self, notificacao_id: int) -> bool:
+        """Marca uma notificação como lida."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                "UPDATE notificacoes SET lida = 1, data_leitura = ? WHERE id = ?",
+                (str(datetime.now()), notificacao_id)
+            )
+            
+            self.pool.commit(conn)
         
-        conn.commit()
-        conn.close()
+        return cursor.rowcount > 0
+    
+    def deletar_notificacao(self, notificacao_id: int) -> bool:
+        """Deleta uma notificação."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM notificacoes WHERE id = ?", (notificacao_id,))
+            
+            self.pool.commit(conn)
         
         return cursor.rowcount > 0
     
+    def limpar_notificacoes_lidas(self, data_limite: datetime) -> int:
+        """Remove as notificações lidas criadas até data_limite e retorna quantas foram removidas."""
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                "DELETE FROM notificacoes WHERE lida = 1 AND data_criacao <= ?",
+                (str(data_limite),)
+            )
+            
+            self.pool.commit(conn)
+        
+        return cursor.rowcount
+    
     # ============ MÉTODOS AUXILIARES ============
     
+    # As linhas de _SELECT_* são tuplas com as colunas na ordem dos campos dos
+    # modelos (_CAMPOS); já convertidas (DATETIME/BOOLEAN) pelo cursor, vão
+    # direto para o construtor por posição, sem montar kwargs por linha.
+    
     @staticmethod
     def _row_to_funcionario(row) -> Funcionario:
         """Converte uma linha do banco para um objeto Funcionario."""
-        return Funcionario(
-            id=row['id'],
-            nome=row['nome'],
-            cpf=row['cpf'],
-            email=row['email'],
-            telefone=row['telefone'],
-            endereco=row['endereco'],
-            loja=row['loja'],
-            data_admissao=datetime.fromisoformat(row['data_admissao']) if row['data_admissao'] else None,
-            cargo=row['cargo'],
-            salario=row['salario'],
-            ativo=bool(row['ativo']),
-            data_criacao=datetime.fromisoformat(row['data_criacao']) if row['data_criacao'] else None,
-            data_atualizacao=datetime.fromisoformat(row['data_atualizacao']) if row['data_atualizacao'] else None
-        )
+        return Funcionario(*row)
     
     @staticmethod
     def _row_to_afastamento(row) -> Afastamento:
         """Converte uma linha do banco para um objeto Afastamento."""
-        return Afastamento(
-            id=row['id'],
-            funcionario_id=row['funcionario_id'],
-            tipo=row['tipo'],
-            data_inicio=datetime.fromisoformat(row['data_inicio']) if row['data_inicio'] else None,
-            data_fim=datetime.fromisoformat(row['data_fim']) if row['data_fim'] else None,
-            motivo=row['motivo'],
-            observacoes=row['observacoes'],
-            documento_anexo=row['documento_anexo'],
-            data_criacao=datetime.fromisoformat(row['data_criacao']) if row['data_criacao'] else None,
-            data_atualizacao=datetime.fromisoformat(row['data_atualizacao']) if row['data_atualizacao'] else None
-        )
+        return Afastamento(*row)
     
     @staticmethod
     def _row_to_usuario(row) -> Usuario:
         """Converte uma linha do banco para um objeto Usuario."""
-        return Usuario(
-            id=row['id'],
-            nome=row['nome'],
-            email=row['email'],
-            username=row['username'],
-            senha_hash=row['senha_hash'],
-            perfil=row['perfil'],
-            ativo=bool(row['ativo']),
-            data_criacao=datetime.fromisoformat(row['data_criacao']) if row['data_criacao'] else None,
-            data_atualizacao=datetime.fromisoformat(row['data_atualizacao']) if row['data_atualizacao'] else None,
-            ultimo_acesso=datetime.fromisoformat(row['ultimo_acesso']) if row['ultimo_acesso'] else None
-        )
+        return Usuario(*row)
+    
+    @classmethod
+    def _row_to_notificacao(cls, row) -> dict:
+        """Converte uma linha do banco para o dict de uma notificação."""
+        return dict(zip(cls.CAMPOS_NOTIFICACAO, row))
@@ -0,0 +1,224 @@
+"""
+Pool de conexões SQLite compartilhado entre threads.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Union
+from src.config import DB_CACHED_STATEMENTS, DB_MMAP_SIZE, DB_TIMEOUT
+
+
+def _converter_datetime(valor: bytes):
+    """Converte um valor de coluna DATETIME (texto ISO) em datetime, ou None se vazio."""
+    return datetime.fromisoformat(valor.decode()) if valor else None
+
+
+def _converter_booleano(valor: bytes) -> bool:
+    """Converte um valor de coluna BOOLEAN (0/1) em bool."""
+    return valor != b'0'
+
+
+# Colunas declaradas como DATETIME/BOOLEAN já saem do cursor convertidas (NULL continua None)
+sqlite3.register_converter("DATETIME", _converter_datetime)
+sqlite3.register_converter("BOOLEAN", _converter_booleano)
+
+
+class SQLitePool:
+    """
+    Pool limitado de conexões SQLite (modo WAL) reaproveitadas entre threads.
+
+    Cada conexão é usada por uma thread de cada vez; dentro de uma mesma
+    thread, acquire() aninhados devolvem a conexão já em uso.
+    """
+
+    def __init__(self, db_path: Union[str, Path], min_size: int = 2, max_size: int = 10,
+                 timeout: float = DB_TIMEOUT):
+        """
+        Inicializa o pool, abrindo as conexões mínimas.
+
+        Args:
+            db_path: Caminho do arquivo do banco
+            min_size: Conexões abertas já na criação do pool
+            max_size: Máximo de conexões abertas ao mesmo tempo
+            timeout: Segundos esperando o lock do SQLite (e uma conexão livre)
+        """
+        self.db_path = str(db_path)
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._ociosas: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.total_connections = 0
+        self.active_connections = 0
+        self.total_acquisitions = 0
+
+        for _ in range(min_size):
+            self._ociosas.put(self._conectar())
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão do pool."""
+        # Conexões de vida longa: com um cache de comandos maior, cada SQL é
+        # compilado uma vez por conexão e reaproveitado nas chamadas seguintes
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=DB_CACHED_STATEMENTS,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+        # Linhas como tuplas simples: os modelos são montados por posição
+        # (DatabaseSQL._row_to_*), sem o custo de um sqlite3.Row por linha
+        conn.row_factory = None
+
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")
+        # Leituras direto das páginas mapeadas, sem cópia para o cache do SQLite
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE:d}")
+
+        with self._lock:
+            self.total_connections += 1
+        return conn
+
+    def _retirar(self) -> sqlite3.Connection:
+        """Pega uma conexão ociosa, abrindo outra se o limite permitir."""
+        try:
+            return self._ociosas.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            pode_abrir = self.total_connections < self.max_size
+            if pode_abrir:
+                # Reserva a vaga antes de conectar (fora do lock)
+                self.total_connections += 1
+
+        if pode_abrir:
+            try:
+                conn = self._conectar()
+            finally:
+                with self._lock:
+                    self.total_connections -= 1
+            return conn
+
+        try:
+            return self._ociosas.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("Nenhuma conexão livre no pool do SQLite") from None
+
+    @contextmanager
+    def acquire(self):
+        """
+        Empresta uma conexão do pool durante o bloco.
+
+        Se o bloco terminar com uma transação aberta (por exemplo, após um
+        erro), ela é desfeita antes de a conexão voltar ao pool.
+
+        Yields:
+            A conexão emprestada
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._retirar()
+        with self._lock:
+            self.active_connections += 1
+            self.total_acquisitions += 1
+        self._local.conn = conn
+
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self.active_connections -= 1
+            self._ociosas.put(conn)
+
+    @contextmanager
+    def acquire_separada(self):
+        """
+        Empresta uma conexão do pool só para o bloco, sem vinculá-la à thread.
+        
+        Para leituras em streaming (geradores): enquanto o gerador está
+        pausado, os acquire()/transaction() da thread continuam usando a
+        própria conexão, e a devolução pode acontecer em qualquer thread.
+        
+        Yields:
+            A conexão emprestada
+        """
+        conn = self._retirar()
+        with self._lock:
+            self.active_connections += 1
+            self.total_acquisitions += 1
+        
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self.active_connections -= 1
+            self._ociosas.put(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa todas as escritas do bloco em uma única transação.
+        
+        Dentro do bloco, commit() não faz nada: a transação é confirmada uma
+        vez, no fim, ou desfeita por inteiro se houver erro. Transações
+        aninhadas (na mesma thread) fazem parte da transação externa.
+        
+        Yields:
+            A conexão da transação
+        """
+        with self.acquire() as conn:
+            if getattr(self._local, 'transacao', False):
+                yield conn
+                return
+            
+            self._local.transacao = True
+            try:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._local.transacao = False
+    
+    def commit(self, conn: sqlite3.Connection) -> None:
+        """Confirma as escritas da conexão, a menos que ela esteja dentro de transaction()."""
+        if not getattr(self._local, 'transacao', False):
+            conn.commit()
+    
+    def pool_health(self) -> Dict[str, int]:
+        """Retorna os contadores de uso do pool."""
+        with self._lock:
+            return {
+                'total_connections': self.total_connections,
+                'active_connections': self.active_connections,
+                'idle_connections': self._ociosas.qsize(),
+                'total_acquisitions': self.total_acquisitions,
+                'max_size': self.max_size
+            }
+
+    def close(self) -> None:
+        """Fecha as conexões ociosas do pool."""
+        while True:
+            try:
+                conn = self._ociosas.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self.total_connections -= 1
@@ -2,14 +2,78 @@
 Sistema de envio de emails.
 """
 
+import atexit
+import base64
 import smtplib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 from typing import List, Optional
 from pathlib import Path
-from src.config import SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, EMAIL_FROM
+from src.config import SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, EMAIL_FROM, SMTP_NOOP_INTERVALO
+
+
+# Threads que fazem os envios em segundo plano (handshake SMTP + TLS levam segundos)
+_ENVIOS = ThreadPoolExecutor(max_workers=4, thread_name_prefix="email")
+
+
+# Bytes lidos por vez dos anexos (múltiplo de 57: cada bloco vira linhas base64 completas)
+_BLOCO_ANEXO = 57 * 1024
+
+# Corpos dos emails, montados uma vez; cada envio só preenche os campos
+_CORPO_RELATORIO = (
+    "Prezado(a),\n"
+    "\n"
+    "Segue em anexo o relatório solicitado: {titulo}\n"
+    "\n"
+    "{corpo_adicional}\n"
+    "\n"
+    "Atenciosamente,\n"
+    "RH Control\n"
+)
+
+_CORPO_NOTIFICACAO_AFASTAMENTO = (
+    "Prezado(a),\n"
+    "\n"
+    "Informamos que o funcionário {funcionario_nome} será afastado do trabalho.\n"
+    "\n"
+    "Detalhes do Afastamento:\n"
+    "- Tipo: {tipo_afastamento}\n"
+    "- Data de Início: {data_inicio}\n"
+    "- Data de Término: {data_fim}\n"
+    "\n"
+    "Favor tomar as devidas providências.\n"
+    "\n"
+    "Atenciosamente,\n"
+    "RH Control\n"
+)
+
+_CORPO_CONVITE_USUARIO = (
+    "Prezado(a) {nome},\n"
+    "\n"
+    "Você foi convidado para usar o sistema RH Control.\n"
+    "\n"
+    "Dados de Acesso:\n"
+    "- Usuário: {username}\n"
+    "- Senha Temporária: {senha_temporaria}\n"
+    "\n"
+    "Acesse o sistema e altere sua senha na primeira oportunidade.\n"
+    "\n"
+    "Atenciosamente,\n"
+    "RH Control\n"
+)
+
+_CORPO_RELATORIO_PERIODICO = (
+    "Prezado(a),\n"
+    "\n"
+    "Segue em anexo o relatório periódico referente ao período de {periodo}.\n"
+    "\n"
+    "Atenciosamente,\n"
+    "RH Control\n"
+)
 
 
 class EmailSender:
@@ -22,6 +86,47 @@ class EmailSender:
         self.username = SMTP_USERNAME
         self.password = SMTP_PASSWORD
         self.email_from = EMAIL_FROM
+        
+        # Conexão SMTP autenticada, reaproveitada entre envios (uma thread por vez)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._ultimo_uso = 0.0
+        atexit.register(self.close)
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Retorna a conexão SMTP autenticada, abrindo (ou reabrindo) se preciso."""
+        # Conexão ociosa há muito tempo: confirma com NOOP que o servidor não a fechou
+        if self._smtp is not None and time.monotonic() - self._ultimo_uso > SMTP_NOOP_INTERVALO:
+            try:
+                self._smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                self._descartar_smtp()
+        
+        if self._smtp is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            try:
+                server.starttls()
+                server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            self._smtp = server
+        
+        return self._smtp
+    
+    def _descartar_smtp(self) -> None:
+        """Fecha a conexão SMTP atual, sem propagar erros."""
+        server, self._smtp = self._smtp, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+    
+    def close(self) -> None:
+        """Encerra a conexão SMTP reaproveitada."""
+        with self._smtp_lock:
+            self._descartar_smtp()
     
     def enviar_email(self, destinatarios: List[str], assunto: str, corpo: str, 
                      html: bool = False, anexos: Optional[List[str]] = None) -> bool:
@@ -48,11 +153,18 @@ class EmailSender:
                 for anexo in anexos:
                     self._anexar_arquivo(msg, anexo)
             
-            # Envia o email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            # Envia o email pela conexão reaproveitada
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # O servidor fechou a conexão: reconecta e tenta uma vez mais
+                    self._descartar_smtp()
+                    self._get_smtp().send_message(msg)
+                except (smtplib.SMTPException, OSError):
+                    self._descartar_smtp()
+                    raise
+                self._ultimo_uso = time.monotonic()
             
             return True
         
@@ -60,21 +172,17 @@ class EmailSender:
             print(f"Erro ao enviar email: {e}")
             return False
     
+    def enviar_email_async(self, destinatarios: List[str], assunto: str, corpo: str,
+                           html: bool = False, anexos: Optional[List[str]] = None) -> "Future[bool]":
+        """Envia um email em segundo plano, sem bloquear quem chamou (o Future traz o resultado de enviar_email)."""
+        return _ENVIOS.submit(self.enviar_email, destinatarios, assunto, corpo, html, anexos)
+    
     def enviar_relatorio(self, destinatarios: List[str], titulo: str, 
                         arquivo_relatorio: str, corpo_adicional: str = "") -> bool:
         """Envia um relatório por email."""
         assunto = f"Relatório: {titulo}"
         
-        corpo = f"""
-        Prezado(a),
-        
-        Segue em anexo o relatório solicitado: {titulo}
-        
-        {corpo_adicional}
-        
-        Atenciosamente,
-        RH Control
-        """
+        corpo = _CORPO_RELATORIO.format(titulo=titulo, corpo_adicional=corpo_adicional)
         
         return self.enviar_email(destinatarios, assunto, corpo, anexos=[arquivo_relatorio])
     
@@ -84,21 +192,10 @@ class EmailSender:
         """Envia uma notificação de afastamento."""
         assunto = f"Notificação de Afastamento: {funcionario_nome}"
         
-        corpo = f"""
-        Prezado(a),
-        
-        Informamos que o funcionário {funcionario_nome} será afastado do trabalho.
-        
-        Detalhes do Afastamento:
-        - Tipo: {tipo_afastamento}
-        - Data de Início: {data_inicio}
-        - Data de Término: {data_fim}
-        
-        Favor tomar as devidas providências.
-        
-        Atenciosamente,
-        RH Control
-        """
+        corpo = _CORPO_NOTIFICACAO_AFASTAMENTO.format(
+            funcionario_nome=funcionario_nome, tipo_afastamento=tipo_afastamento,
+            data_inicio=data_inicio, data_fim=data_fim
+        )
         
         return self.enviar_email(destinatarios, assunto, corpo)
     
@@ -107,20 +204,7 @@ class EmailSender:
         """Envia um convite para novo usuário."""
         assunto = "Bem-vindo ao RH Control"
         
-        corpo = f"""
-        Prezado(a) {nome},
-        
-        Você foi convidado para usar o sistema RH Control.
-        
-        Dados de Acesso:
-        - Usuário: {username}
-        - Senha Temporária: {senha_temporaria}
-        
-        Acesse o sistema e altere sua senha na primeira oportunidade.
-        
-        Atenciosamente,
-        RH Control
-        """
+        corpo = _CORPO_CONVITE_USUARIO.format(nome=nome, username=username, senha_temporaria=senha_temporaria)
         
         return self.enviar_email([email], assunto, corpo)
     
@@ -129,14 +213,7 @@ class EmailSender:
         """Envia um relatório periódico."""
         assunto = f"Relatório Periódico - {periodo}"
         
-        corpo = f"""
-        Prezado(a),
-        
-        Segue em anexo o relatório periódico referente ao período de {periodo}.
-        
-        Atenciosamente,
-        RH Control
-        """
+        corpo = _CORPO_RELATORIO_PERIODICO.format(periodo=periodo)
         
         return self.enviar_email(destinatarios, assunto, corpo, anexos=[arquivo_relatorio])
     
@@ -150,11 +227,15 @@ class EmailSender:
             return
         
         try:
+            # Codifica em base64 bloco a bloco, sem carregar o arquivo bruto inteiro
+            partes = []
             with open(arquivo_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
+                while bloco := attachment.read(_BLOCO_ANEXO):
+                    partes.append(base64.encodebytes(bloco).decode('ascii'))
             
-            encoders.encode_base64(part)
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(''.join(partes))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header('Content-Disposition', f'attachment; filename= {arquivo_path.name}')
             msg.attach(part)
         
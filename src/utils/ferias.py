@@ -2,109 +2,176 @@
 Sistema de cálculo automático de férias.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+import pandas as pd
 from src.models import Funcionario
+from src.utils.validators import formatar_data
 from src.config import DIAS_FERIAS_ANUAL, MESES_PARA_FERIAS
 
 
+def _meses_servico(data_admissao: date, hoje: date) -> int:
+    """Tempo de serviço em meses entre a admissão e hoje."""
+    return (hoje.year - data_admissao.year) * 12 + hoje.month - data_admissao.month
+
+
+def _dias_ferias_por_meses(tempo_servico: int) -> int:
+    """Dias de férias a que dá direito um tempo de serviço em meses."""
+    # Verifica se o funcionário tem direito a férias
+    if tempo_servico < MESES_PARA_FERIAS:
+        return 0
+    
+    # Calcula o número de períodos completos de férias (30 dias por período)
+    periodos_completos = tempo_servico // MESES_PARA_FERIAS
+    return int(periodos_completos * DIAS_FERIAS_ANUAL)
+
+
+@lru_cache(maxsize=4096)
+def _dias_ferias_por_data(data_admissao: date, hoje: date) -> int:
+    """Calcula os dias de férias para uma data de admissão (cacheado por dia)."""
+    return _dias_ferias_por_meses(_meses_servico(data_admissao, hoje))
+
+
 class FeriasManager:
     """Gerenciador de cálculo de férias."""
     
     @staticmethod
-    def calcular_dias_ferias_disponiveis(funcionario: Funcionario) -> int:
+    def calcular_dias_ferias_disponiveis(funcionario: Funcionario, agora: Optional[datetime] = None) -> int:
         """Calcula os dias de férias disponíveis para um funcionário."""
-        if not funcionario.data_admissao:
-            return 0
-        
-        # Calcula o tempo de serviço em meses
-        agora = datetime.now()
-        tempo_servico = (agora.year - funcionario.data_admissao.year) * 12
-        tempo_servico += agora.month - funcionario.data_admissao.month
-        
-        # Verifica se o funcionário tem direito a férias
-        if tempo_servico < MESES_PARA_FERIAS:
+        return FeriasManager.calcular_dias_ferias(funcionario.data_admissao, agora)
+    
+    @staticmethod
+    def calcular_dias_ferias(data_admissao: Optional[datetime], agora: Optional[datetime] = None) -> int:
+        """Calcula os dias de férias disponíveis a partir da data de admissão (agora: instante de referência, padrão o atual)."""
+        if not data_admissao:
             return 0
         
-        # Calcula o número de períodos completos de férias
-        periodos_completos = tempo_servico // MESES_PARA_FERIAS
-        
-        # Calcula os dias de férias (30 dias por período)
-        dias_totais = periodos_completos * DIAS_FERIAS_ANUAL
+        # Normaliza para date para que o horário não invalide o cache
+        if isinstance(data_admissao, datetime):
+            data_admissao = data_admissao.date()
         
-        return int(dias_totais)
+        hoje = agora.date() if agora is not None else date.today()
+        return _dias_ferias_por_data(data_admissao, hoje)
     
     @staticmethod
-    def calcular_dias_ferias_usados(funcionario: Funcionario, afastamentos: List) -> int:
-        """Calcula os dias de férias já utilizados."""
-        dias_usados = 0
+    def calcular_dias_ferias_disponiveis_vec(datas_admissao: pd.Series) -> pd.Series:
+        """Calcula os dias de férias disponíveis para uma série de datas de admissão."""
+        datas = pd.to_datetime(datas_admissao)
+        agora = datetime.now()
         
-        for afastamento in afastamentos:
-            if afastamento.tipo == "Férias":
-                dias_usados += afastamento.dias_afastamento()
+        # Tempo de serviço em meses, como em calcular_dias_ferias_disponiveis
+        tempo_servico = (agora.year - datas.dt.year) * 12 + (agora.month - datas.dt.month)
+        periodos_completos = (tempo_servico // MESES_PARA_FERIAS).clip(lower=0)
         
-        return dias_usados
+        return (periodos_completos * DIAS_FERIAS_ANUAL).fillna(0).astype(int)
     
     @staticmethod
-    def calcular_dias_ferias_restantes(funcionario: Funcionario, afastamentos: List) -> int:
-        """Calcula os dias de férias restantes."""
-        disponíveis = FeriasManager.calcular_dias_ferias_disponiveis(funcionario)
-        usados = FeriasManager.calcular_dias_ferias_usados(funcionario, afastamentos)
-        
-        return max(0, disponíveis - usados)
+    def _resumo_ferias(funcionario: Funcionario, afastamentos: List,
+                       agora: Optional[datetime] = None) -> Tuple[int, int, int, Optional[datetime]]:
+        """Calcula disponíveis, usados, restantes e próxima data numa única passada."""
+        # Uma só varredura dos afastamentos
+        usados = sum(a.dias_afastamento() for a in afastamentos if a.tipo == "Férias")
+        if agora is None:
+            agora = datetime.now()
+        return FeriasManager._resumo_por_admissao(funcionario.data_admissao, usados, agora)
     
     @staticmethod
-    def obter_proxima_data_ferias(funcionario: Funcionario) -> Optional[datetime]:
-        """Obtém a próxima data em que o funcionário terá direito a férias."""
-        if not funcionario.data_admissao:
-            return None
+    def _resumo_por_admissao(data_admissao: Optional[datetime], usados: int,
+                             agora: datetime) -> Tuple[int, int, int, Optional[datetime]]:
+        """Calcula disponíveis, usados, restantes e próxima data a partir dos dias já usados."""
+        if not data_admissao:
+            return 0, usados, 0, None
         
-        agora = datetime.now()
-        tempo_servico = (agora.year - funcionario.data_admissao.year) * 12
-        tempo_servico += agora.month - funcionario.data_admissao.month
+        # Tempo de serviço calculado uma única vez
+        tempo_servico = _meses_servico(data_admissao, agora)
+        disponiveis = _dias_ferias_por_meses(tempo_servico)
         
-        # Se já tem direito, retorna a data de hoje
+        # Se já tem direito, a próxima data é hoje
         if tempo_servico >= MESES_PARA_FERIAS:
-            return agora
+            proxima_data = agora
+        else:
+            proxima_data = data_admissao + timedelta(days=MESES_PARA_FERIAS * 30)
         
-        # Calcula a próxima data
-        meses_faltantes = MESES_PARA_FERIAS - tempo_servico
-        proxima_data = funcionario.data_admissao + timedelta(days=MESES_PARA_FERIAS * 30)
-        
-        return proxima_data
+        return disponiveis, usados, max(0, disponiveis - usados), proxima_data
     
     @staticmethod
-    def gerar_relatorio_ferias(funcionario: Funcionario, afastamentos: List) -> Dict:
-        """Gera um relatório completo de férias para um funcionário."""
-        disponíveis = FeriasManager.calcular_dias_ferias_disponiveis(funcionario)
-        usados = FeriasManager.calcular_dias_ferias_usados(funcionario, afastamentos)
-        restantes = FeriasManager.calcular_dias_ferias_restantes(funcionario, afastamentos)
-        proxima_data = FeriasManager.obter_proxima_data_ferias(funcionario)
+    def _montar_relatorio(funcionario_id: Optional[int], nome: str, data_admissao: Optional[datetime],
+                          resumo: Tuple[int, int, int, Optional[datetime]]) -> Dict:
+        """Monta o dicionário de relatório de férias de um funcionário."""
+        disponíveis, usados, restantes, proxima_data = resumo
         
         return {
-            'funcionario_id': funcionario.id,
-            'funcionario_nome': funcionario.nome,
+            'funcionario_id': funcionario_id,
+            'funcionario_nome': nome,
             'dias_disponiveis': disponíveis,
             'dias_usados': usados,
             'dias_restantes': restantes,
-            'proxima_data_ferias': proxima_data.strftime('%d/%m/%Y') if proxima_data else 'N/A',
-            'data_admissao': funcionario.data_admissao.strftime('%d/%m/%Y') if funcionario.data_admissao else 'N/A'
+            'proxima_data_ferias': formatar_data(proxima_data) if proxima_data else 'N/A',
+            'data_admissao': formatar_data(data_admissao) if data_admissao else 'N/A'
         }
     
     @staticmethod
-    def validar_ferias(funcionario: Funcionario, data_inicio: datetime, data_fim: datetime, afastamentos: List) -> tuple:
-        """Valida se um período de férias é válido."""
+    def calcular_dias_ferias_usados(funcionario: Funcionario, afastamentos: List) -> int:
+        """Calcula os dias de férias já utilizados (com o banco SQL, use db.dias_ferias_usados, que soma na consulta)."""
+        return sum(a.dias_afastamento() for a in afastamentos if a.tipo == "Férias")
+    
+    @staticmethod
+    def calcular_dias_ferias_restantes(funcionario: Funcionario, afastamentos: List,
+                                       agora: Optional[datetime] = None) -> int:
+        """Calcula os dias de férias restantes."""
+        return FeriasManager._resumo_ferias(funcionario, afastamentos, agora)[2]
+    
+    @staticmethod
+    def obter_proxima_data_ferias(funcionario: Funcionario, agora: Optional[datetime] = None) -> Optional[datetime]:
+        """Obtém a próxima data em que o funcionário terá direito a férias."""
+        return FeriasManager._resumo_ferias(funcionario, (), agora)[3]
+    
+    @staticmethod
+    def gerar_relatorio_ferias(funcionario: Funcionario, afastamentos: List,
+                               agora: Optional[datetime] = None) -> Dict:
+        """Gera um relatório completo de férias para um funcionário (em laços, passe o mesmo agora a todos)."""
+        resumo = FeriasManager._resumo_ferias(funcionario, afastamentos, agora)
+        return FeriasManager._montar_relatorio(funcionario.id, funcionario.nome, funcionario.data_admissao, resumo)
+    
+    @staticmethod
+    def gerar_relatorios_lote(db, apenas_ativos: bool = True) -> List[Dict]:
+        """Gera os relatórios de férias de todos os funcionários com uma única consulta ao banco."""
+        agora = datetime.now()
+        relatorios = []
+        
+        # Dias usados já somados no banco (GROUP BY), sem ler afastamento por afastamento
+        for funcionario_id, nome, data_admissao, usados in db.relatorio_ferias(apenas_ativos=apenas_ativos):
+            resumo = FeriasManager._resumo_por_admissao(data_admissao, int(usados), agora)
+            relatorios.append(FeriasManager._montar_relatorio(funcionario_id, nome, data_admissao, resumo))
+        
+        return relatorios
+    
+    @staticmethod
+    def validar_ferias(funcionario: Funcionario, data_inicio: datetime, data_fim: datetime, afastamentos: List,
+                       agora: Optional[datetime] = None) -> tuple:
+        """Valida se um período de férias é válido (agora: instante de referência, padrão o atual)."""
         dias_solicitados = (data_fim - data_inicio).days + 1
-        dias_restantes = FeriasManager.calcular_dias_ferias_restantes(funcionario, afastamentos)
+        
+        # Uma só varredura: soma os dias de férias usados e acha o primeiro conflito
+        usados = 0
+        conflito = None
+        for afastamento in afastamentos:
+            if afastamento.tipo == "Férias":
+                usados += afastamento.dias_afastamento()
+            if (conflito is None and afastamento.data_inicio and afastamento.data_fim
+                    and data_fim >= afastamento.data_inicio and data_inicio <= afastamento.data_fim):
+                conflito = afastamento
+        
+        if agora is None:
+            agora = datetime.now()
+        dias_restantes = FeriasManager._resumo_por_admissao(funcionario.data_admissao, usados, agora)[2]
         
         if dias_solicitados > dias_restantes:
             return False, f"Funcionário tem apenas {dias_restantes} dias de férias disponíveis, mas solicitou {dias_solicitados} dias."
         
         # Verifica se há conflito com outros afastamentos
-        for afastamento in afastamentos:
-            if afastamento.data_inicio and afastamento.data_fim:
-                # Verifica se há sobreposição
-                if not (data_fim < afastamento.data_inicio or data_inicio > afastamento.data_fim):
-                    return False, f"Há um conflito com outro afastamento ({afastamento.tipo}) no período solicitado."
+        if conflito is not None:
+            return False, f"Há um conflito com outro afastamento ({conflito.tipo}) no período solicitado."
         
         return True, "Férias validadas com sucesso."
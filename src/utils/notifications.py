@@ -3,130 +3,132 @@ Sistema de notificações da aplicação.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List
 from pathlib import Path
 import json
 from src.models import Afastamento
-from src.utils.database import DatabaseManager
+from src.utils.database_sql import DatabaseSQL
+from src.utils.validators import formatar_data
+
+
+# Perfis que recebem as notificações de afastamentos próximos
+PERFIS_NOTIFICADOS = frozenset({"Gerente", "Recursos Humanos", "Administrador"})
+
+# Arquivos das versões anteriores (JSON Lines e, antes dele, um array JSON)
+ARQUIVOS_ANTIGOS = ("notificacoes.jsonl", "notificacoes.json")
 
 
 class NotificationManager:
-    """Gerenciador de notificações."""
+    """Gerenciador de notificações (tabela notificacoes do banco SQLite)."""
     
-    def __init__(self, db: DatabaseManager, data_dir: str = "src/data"):
+    def __init__(self, db: DatabaseSQL, data_dir: str = "src/data"):
         """Inicializa o gerenciador de notificações."""
         self.db = db
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.notifications_file = self.data_dir / "notificacoes.json"
-        
-        # Inicializa o arquivo se não existir
-        if not self.notifications_file.exists():
-            self._save_json([])
+        self._importar_arquivos_antigos()
     
-    def _load_json(self) -> List:
-        """Carrega notificações do arquivo JSON."""
-        try:
-            with open(self.notifications_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_json(self, data: List):
-        """Salva notificações em arquivo JSON."""
-        with open(self.notifications_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False, default=str)
+    def _importar_arquivos_antigos(self) -> None:
+        """Copia para o banco as notificações dos arquivos JSON antigos, uma única vez."""
+        for nome in ARQUIVOS_ANTIGOS:
+            arquivo = self.data_dir / nome
+            if not arquivo.exists():
+                continue
+            
+            notificacoes = []
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                if nome.endswith('.jsonl'):
+                    for linha in f:
+                        try:
+                            notificacoes.append(json.loads(linha))
+                        except json.JSONDecodeError:
+                            # Linha vazia ou incompleta (escrita interrompida): ignora
+                            continue
+                else:
+                    try:
+                        notificacoes = json.load(f)
+                    except json.JSONDecodeError:
+                        pass
+            
+            self.db.criar_notificacoes([
+                {
+                    'usuario_id': n['usuario_id'],
+                    'titulo': n['titulo'],
+                    'mensagem': n['mensagem'],
+                    'tipo': n.get('tipo', 'info'),
+                    'lida': n.get('lida', False),
+                    # Mesmo formato das datas gravadas pelo banco (comparadas como texto)
+                    'data_criacao': datetime.fromisoformat(n['data_criacao']) if n.get('data_criacao') else datetime.now(),
+                    'data_leitura': datetime.fromisoformat(n['data_leitura']) if n.get('data_leitura') else None
+                }
+                for n in notificacoes
+            ])
+            # Renomeia para não importar de novo
+            arquivo.rename(arquivo.with_name(arquivo.name + '.importado'))
     
-    def criar_notificacao(self, usuario_id: int, titulo: str, mensagem: str, tipo: str = "info") -> dict:
-        """Cria uma nova notificação."""
-        notificacoes = self._load_json()
-        
-        novo_id = max([n.get('id', 0) for n in notificacoes], default=0) + 1
-        
-        notificacao = {
-            'id': novo_id,
+    @staticmethod
+    def _nova_notificacao(usuario_id: int, titulo: str, mensagem: str, tipo: str, data_criacao: datetime) -> dict:
+        """Monta uma notificação (sem gravar; o ID vem do banco)."""
+        return {
+            'id': None,
             'usuario_id': usuario_id,
             'titulo': titulo,
             'mensagem': mensagem,
             'tipo': tipo,  # info, warning, error, success
             'lida': False,
-            'data_criacao': datetime.now().isoformat(),
+            'data_criacao': data_criacao,
             'data_leitura': None
         }
-        
-        notificacoes.append(notificacao)
-        self._save_json(notificacoes)
-        
-        return notificacao
+    
+    def criar_notificacao(self, usuario_id: int, titulo: str, mensagem: str, tipo: str = "info") -> dict:
+        """Cria uma nova notificação."""
+        notificacao = self._nova_notificacao(usuario_id, titulo, mensagem, tipo, datetime.now())
+        return self.db.criar_notificacoes([notificacao])[0]
     
     def obter_notificacoes(self, usuario_id: int, apenas_nao_lidas: bool = False) -> List[dict]:
-        """Obtém notificações de um usuário."""
-        notificacoes = self._load_json()
-        
-        resultado = []
-        for notif in notificacoes:
-            if notif.get('usuario_id') == usuario_id:
-                if apenas_nao_lidas and notif.get('lida'):
-                    continue
-                resultado.append(notif)
-        
-        return sorted(resultado, key=lambda x: x['data_criacao'], reverse=True)
+        """Obtém notificações de um usuário, das mais recentes para as mais antigas."""
+        return self.db.listar_notificacoes(usuario_id, apenas_nao_lidas)
     
     def marcar_como_lida(self, notificacao_id: int) -> bool:
         """Marca uma notificação como lida."""
-        notificacoes = self._load_json()
-        
-        for notif in notificacoes:
-            if notif.get('id') == notificacao_id:
-                notif['lida'] = True
-                notif['data_leitura'] = datetime.now().isoformat()
-                self._save_json(notificacoes)
-                return True
-        
-        return False
+        return self.db.marcar_notificacao_lida(notificacao_id)
     
     def deletar_notificacao(self, notificacao_id: int) -> bool:
         """Deleta uma notificação."""
-        notificacoes = self._load_json()
-        notificacoes = [n for n in notificacoes if n.get('id') != notificacao_id]
-        self._save_json(notificacoes)
-        return True
+        return self.db.deletar_notificacao(notificacao_id)
     
     def gerar_notificacoes_afastamentos(self, dias_antes: int = 7):
         """Gera notificações para afastamentos próximos."""
-        funcionarios = self.db.listar_funcionarios(apenas_ativos=True)
+        # Destinatários (gerentes e RH) buscados uma única vez
+        destinatarios = [
+            usuario.id for usuario in self.db.listar_usuarios(apenas_ativos=True)
+            if usuario.perfil in PERFIS_NOTIFICADOS
+        ]
+        if not destinatarios:
+            return
         
-        data_limite = datetime.now() + timedelta(days=dias_antes)
+        agora = datetime.now()
+        novas = []
         
-        for funcionario in funcionarios:
+        for funcionario in self.db.listar_funcionarios(apenas_ativos=True):
             afastamentos = self.db.listar_afastamentos_por_funcionario(funcionario.id)
             
             for afastamento in afastamentos:
                 if afastamento.data_inicio:
-                    dias_restantes = (afastamento.data_inicio - datetime.now()).days
+                    dias_restantes = (afastamento.data_inicio - agora).days
                     
                     if 0 < dias_restantes <= dias_antes:
                         titulo = f"Afastamento próximo: {afastamento.tipo}"
-                        mensagem = f"{funcionario.nome} terá um afastamento ({afastamento.tipo}) em {dias_restantes} dia(s) ({afastamento.data_inicio.strftime('%d/%m/%Y')})"
+                        mensagem = f"{funcionario.nome} terá um afastamento ({afastamento.tipo}) em {dias_restantes} dia(s) ({formatar_data(afastamento.data_inicio)})"
                         
                         # Cria notificação para gerentes e RH
-                        usuarios_rh = self.db.listar_usuarios(apenas_ativos=True)
-                        for usuario in usuarios_rh:
-                            if usuario.perfil in ["Gerente", "Recursos Humanos", "Administrador"]:
-                                self.criar_notificacao(usuario.id, titulo, mensagem, "warning")
+                        for usuario_id in destinatarios:
+                            novas.append(self._nova_notificacao(usuario_id, titulo, mensagem, "warning", agora))
+        
+        # Todas as notificações geradas são gravadas em uma única transação
+        if novas:
+            self.db.criar_notificacoes(novas)
     
     def limpar_notificacoes_antigas(self, dias: int = 30):
         """Remove notificações lidas com mais de X dias."""
-        notificacoes = self._load_json()
-        
-        data_limite = datetime.now() - timedelta(days=dias)
-        
-        notificacoes_filtradas = []
-        for notif in notificacoes:
-            data_criacao = datetime.fromisoformat(notif['data_criacao'])
-            
-            # Mantém notificações não lidas ou recentes
-            if not notif.get('lida') or data_criacao > data_limite:
-                notificacoes_filtradas.append(notif)
-        
-        self._save_json(notificacoes_filtradas)
+        # Mantém notificações não lidas ou recentes
+        self.db.limpar_notificacoes_lidas(datetime.now() - timedelta(days=dias))
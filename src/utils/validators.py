@@ -3,68 +3,186 @@ Utilitários para validação de dados.
 """
 
 import re
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from operator import mul
+from typing import List
+
+# Padrões compilados uma única vez na importação do módulo
+_NAO_DIGITO_RE = re.compile(r'\D')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Pontuação usual de CPFs e telefones, removida com str.translate (sem regex)
+_PONTUACAO = str.maketrans('', '', '.-/() ')
+
+# Pesos dos dígitos verificadores do CPF
+_PESOS_DV1 = tuple(range(10, 1, -1))
+_PESOS_DV2 = tuple(range(11, 1, -1))
+
+# As somas são feitas sobre os códigos ASCII dos dígitos; descontar 48 ('0')
+# de cada dígito equivale a subtrair 48 * soma dos pesos do total
+_AJUSTE_DV1 = ord('0') * sum(_PESOS_DV1)
+_AJUSTE_DV2 = ord('0') * sum(_PESOS_DV2)
+
+
+def _somente_digitos(texto: str) -> str:
+    """Remove os caracteres não numéricos de um texto."""
+    # Já só com dígitos (entradas de API, dados do banco): devolve o próprio texto
+    if texto.isdecimal():
+        return texto
+    
+    # Caso comum (só pontuação de máscara): translate; qualquer outro caractere cai na regex
+    digitos = texto.translate(_PONTUACAO)
+    if digitos.isdecimal():
+        return digitos
+    return _NAO_DIGITO_RE.sub('', digitos)
+
+
+def _cpfs_validos(digitos, resultado):
+    """Confere os dígitos verificadores de uma matriz (n, 11) de CPFs."""
+    for k in range(digitos.shape[0]):
+        d = digitos[k]
+        
+        # CPF não pode ter todos os dígitos iguais
+        iguais = True
+        for i in range(1, 11):
+            if d[i] != d[0]:
+                iguais = False
+                break
+        if iguais:
+            resultado[k] = False
+            continue
+        
+        s1 = 0
+        for i in range(9):
+            s1 += d[i] * (10 - i)
+        s2 = 0
+        for i in range(10):
+            s2 += d[i] * (11 - i)
+        
+        resultado[k] = (s1 * 10) % 11 % 10 == d[9] and (s2 * 10) % 11 % 10 == d[10]
+
+
+def validar_data(data: datetime) -> bool:
+    """Valida uma data (também disponível como Validators.validar_data)."""
+    return isinstance(data, datetime)
+
+
+def formatar_data(data: date) -> str:
+    """Formata uma data como DD/MM/AAAA (direto dos atributos, sem strftime; use-a no lugar de strftime('%d/%m/%Y'))."""
+    return f"{data.day:02d}/{data.month:02d}/{data.year}"
+
+
+def _cpfs_validos_numpy(digitos, resultado):
+    """Versão vetorizada de _cpfs_validos (numpy), usada quando o numba não está instalado."""
+    import numpy as np
+    
+    # Somas ponderadas de todos os CPFs de uma vez (produto de matrizes)
+    dv1 = (digitos[:, :9] @ np.array(_PESOS_DV1)) * 10 % 11 % 10
+    dv2 = (digitos[:, :10] @ np.array(_PESOS_DV2)) * 10 % 11 % 10
+    
+    # CPF não pode ter todos os dígitos iguais
+    iguais = (digitos == digitos[:, :1]).all(axis=1)
+    
+    resultado[:] = (dv1 == digitos[:, 9]) & (dv2 == digitos[:, 10]) & ~iguais
+
+
+@lru_cache(maxsize=1)
+def _kernel_cpfs():
+    """Compila o validador em lote com numba, se disponível (senão usa a versão numpy)."""
+    try:
+        from numba import njit
+    except ImportError:
+        return _cpfs_validos_numpy
+    return njit(cache=True)(_cpfs_validos)
 
 
 class Validators:
     """Classe com métodos estáticos para validação."""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def validar_cpf(cpf: str) -> bool:
         """Valida um CPF."""
         # Remove caracteres não numéricos
-        cpf = re.sub(r'\D', '', cpf)
+        cpf = _somente_digitos(cpf)
         
         # CPF deve ter 11 dígitos
         if len(cpf) != 11:
             return False
         
         # CPF não pode ter todos os dígitos iguais
-        if cpf == cpf[0] * 11:
+        if cpf.count(cpf[0]) == 11:
             return False
         
-        # Valida o primeiro dígito verificador
-        soma = sum(int(cpf[i]) * (10 - i) for i in range(9))
-        digito1 = 11 - (soma % 11)
-        digito1 = 0 if digito1 > 9 else digito1
+        # Códigos ASCII dos dígitos (dígitos não ASCII, ex.: largura total, são convertidos)
+        if cpf.isascii():
+            digitos = cpf.encode('ascii')
+        else:
+            digitos = bytes(int(c) + ord('0') for c in cpf)
         
-        if int(cpf[9]) != digito1:
-            return False
+        # Dígitos verificadores: (soma * 10) % 11 % 10 equivale a 11 - resto, com 10 e 11 -> 0
+        digito1 = (sum(map(mul, digitos, _PESOS_DV1)) - _AJUSTE_DV1) * 10 % 11 % 10
+        digito2 = (sum(map(mul, digitos, _PESOS_DV2)) - _AJUSTE_DV2) * 10 % 11 % 10
         
-        # Valida o segundo dígito verificador
-        soma = sum(int(cpf[i]) * (11 - i) for i in range(10))
-        digito2 = 11 - (soma % 11)
-        digito2 = 0 if digito2 > 9 else digito2
+        return digitos[9] - ord('0') == digito1 and digitos[10] - ord('0') == digito2
+    
+    @staticmethod
+    def validar_cpfs_lote(cpfs: List[str]) -> List[bool]:
+        """Valida uma lista de CPFs de uma vez (com numba quando disponível, senão com numpy)."""
+        import numpy as np
         
-        if int(cpf[10]) != digito2:
-            return False
+        kernel = _kernel_cpfs()
         
-        return True
+        limpos = [_somente_digitos(cpf) for cpf in cpfs]
+        resultado = [False] * len(cpfs)
+        indices = []
+        for i, cpf in enumerate(limpos):
+            if len(cpf) != 11:
+                continue
+            if cpf.isascii():
+                indices.append(i)
+            else:
+                # Dígitos não ASCII (ex.: largura total) seguem pelo caminho escalar
+                resultado[i] = Validators.validar_cpf(cpf)
+        if not indices:
+            return resultado
+        
+        # Converte os CPFs com 11 dígitos em uma matriz (n, 11) de uint8
+        texto = ''.join(limpos[i] for i in indices).encode('ascii')
+        digitos = (np.frombuffer(texto, dtype=np.uint8) - ord('0')).reshape(-1, 11).astype(np.int64)
+        validos = np.empty(len(indices), dtype=np.bool_)
+        kernel(digitos, validos)
+        
+        for i, valido in zip(indices, validos.tolist()):
+            resultado[i] = valido
+        return resultado
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def validar_email(email: str) -> bool:
         """Valida um email."""
-        padrao = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(padrao, email) is not None
+        # Descarta sem a regex o que não tem '@' ou não tem '.' depois dele (o domínio exige os dois)
+        if '@' not in email or email.rfind('.') < email.rfind('@'):
+            return False
+        return _EMAIL_RE.fullmatch(email) is not None
     
     @staticmethod
     def validar_telefone(telefone: str) -> bool:
         """Valida um telefone."""
         # Remove caracteres não numéricos
-        telefone = re.sub(r'\D', '', telefone)
+        telefone = _somente_digitos(telefone)
         
         # Telefone deve ter 10 ou 11 dígitos
-        return len(telefone) in [10, 11]
+        return len(telefone) in (10, 11)
     
-    @staticmethod
-    def validar_data(data: datetime) -> bool:
-        """Valida uma data."""
-        return isinstance(data, datetime)
+    validar_data = staticmethod(validar_data)
+    formatar_data = staticmethod(formatar_data)
     
     @staticmethod
     def formatar_cpf(cpf: str) -> str:
         """Formata um CPF para o padrão XXX.XXX.XXX-XX."""
-        cpf = re.sub(r'\D', '', cpf)
+        cpf = _somente_digitos(cpf)
         if len(cpf) == 11:
             return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
         return cpf
@@ -72,7 +190,7 @@ class Validators:
     @staticmethod
     def formatar_telefone(telefone: str) -> str:
         """Formata um telefone para o padrão (XX) XXXXX-XXXX ou (XX) XXXX-XXXX."""
-        telefone = re.sub(r'\D', '', telefone)
+        telefone = _somente_digitos(telefone)
         
         if len(telefone) == 11:
             return f"({telefone[:2]}) {telefone[2:7]}-{telefone[7:]}"
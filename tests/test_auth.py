@@ -0,0 +1,89 @@
+"""
+Testes da autenticação: migração de hashes antigos para Argon2 no login.
+"""
+
+import hashlib
+
+import pytest
+
+from src.utils import auth
+from src.utils.auth import AuthManager
+from src.utils.database import DatabaseManager
+from src.utils.database_sql import DatabaseSQL
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Banco SQLite novo para cada teste."""
+    db = DatabaseSQL(str(tmp_path / "rh.db"))
+    yield db
+    db.pool.close()
+
+
+@pytest.fixture
+def gerenciador(db):
+    """AuthManager com um usuário 'maria' (senha 'segredo123')."""
+    gerenciador = AuthManager(db)
+    usuario, erro = gerenciador.criar_usuario("Maria", "maria@exemplo.com", "maria", "segredo123")
+    assert erro is None
+    return gerenciador
+
+
+def _aguardar_gravacoes() -> None:
+    """Espera as gravações do último acesso em segundo plano (o executor tem uma única thread)."""
+    auth._ACESSOS.submit(lambda: None).result()
+
+
+def _definir_hash(db: DatabaseSQL, username: str, senha_hash: str) -> None:
+    """Grava um hash diretamente no banco, como faria uma versão antiga do sistema."""
+    with db.sessao() as conn:
+        conn.execute("UPDATE usuarios SET senha_hash = ? WHERE username = ?", (senha_hash, username))
+        conn.commit()
+
+
+def test_login_migra_hash_sha256_para_argon2(db, gerenciador):
+    """Um hash SHA-256 antigo é aceito no login e regravado como Argon2 antes de o login terminar."""
+    _definir_hash(db, "maria", hashlib.sha256(b"segredo123").hexdigest())
+
+    assert gerenciador.autenticar("maria", "segredo123") is not None
+
+    senha_hash = db.obter_usuario_por_username("maria").senha_hash
+    assert senha_hash.startswith("$argon2")
+    assert gerenciador.autenticar("maria", "segredo123") is not None
+
+
+def test_senha_errada_nao_migra_o_hash(db, gerenciador):
+    """Com a senha errada o login falha e o hash antigo continua como estava."""
+    antigo = hashlib.sha256(b"segredo123").hexdigest()
+    _definir_hash(db, "maria", antigo)
+
+    assert gerenciador.autenticar("maria", "errada") is None
+    assert db.obter_usuario_por_username("maria").senha_hash == antigo
+
+
+def test_ultimo_acesso_nao_sobrescreve_alteracoes_feitas_depois_do_login(db, gerenciador):
+    """A gravação do último acesso em segundo plano só toca essa coluna."""
+    usuario = gerenciador.autenticar("maria", "segredo123")
+    assert usuario is not None
+
+    # Um administrador desativa o usuário logo depois do login
+    gerenciador.deletar_usuario(usuario.id)
+    _aguardar_gravacoes()
+
+    gravado = db.obter_usuario(usuario.id)
+    assert gravado.ativo is False
+    assert gravado.ultimo_acesso is not None
+
+
+def test_login_migra_senha_em_texto_puro_do_banco_json(tmp_path):
+    """No banco JSON, registros antigos com senha em texto puro passam a ter hash Argon2 no primeiro login."""
+    db = DatabaseManager(str(tmp_path / "data"))
+    db._save_json(db.users_file, [{'id': 1, 'username': 'joao', 'password': 'segredo123'}])
+
+    assert db.validar_usuario('joao', 'errada') is None
+    usuario = db.validar_usuario('joao', 'segredo123')
+
+    assert usuario is not None
+    assert 'password' not in usuario
+    assert usuario['password_hash'].startswith('$argon2')
+    assert db.validar_usuario('joao', 'segredo123') is not None
@@ -0,0 +1,149 @@
+"""
+Testes do DatabaseManager (banco JSON): journal, compactação e cache em memória.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.database import DatabaseManager
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Diretório de dados vazio para cada teste."""
+    return str(tmp_path / "data")
+
+
+def _ler_base(db: DatabaseManager) -> list:
+    """Registros gravados no arquivo base de funcionários (sem o journal)."""
+    with open(db.employees_file, 'rb') as f:
+        return json.loads(f.read())
+
+
+def _popular(db: DatabaseManager, quantidade: int) -> None:
+    """Inclui funcionários e incorpora o journal ao arquivo base."""
+    for i in range(quantidade):
+        db.adicionar_funcionario({'name': f'Funcionário {i}', 'status': 'Ativo'})
+    db.commit()
+
+
+def test_journal_reaplicado_por_outra_instancia(data_dir):
+    """Inclusões, alterações e remoções no journal são reaplicadas ao reabrir o banco."""
+    db = DatabaseManager(data_dir)
+    _popular(db, 20)
+
+    db.atualizar_funcionario(1, {'name': 'Alterado', 'status': 'Afastado'})
+    db.remover_funcionario(2)
+    novo_id = db.adicionar_funcionario({'name': 'Novo', 'status': 'Ativo'})
+
+    # Alterações pequenas ficam no journal, sem reescrever o arquivo base
+    assert os.path.exists(db._journal(db.employees_file))
+    assert len(_ler_base(db)) == 20
+
+    outro = DatabaseManager(data_dir)
+    assert outro.buscar_funcionario(1)['name'] == 'Alterado'
+    assert outro.buscar_funcionario(2) is None
+    assert outro.buscar_funcionario(novo_id)['name'] == 'Novo'
+    assert len(outro.listar_funcionarios()) == 20
+
+
+def test_linha_incompleta_do_journal_e_ignorada(data_dir):
+    """Uma linha truncada no fim do journal (escrita interrompida) não impede a leitura."""
+    db = DatabaseManager(data_dir)
+    _popular(db, 20)
+    db.atualizar_funcionario(1, {'name': 'Alterado'})
+
+    with open(db._journal(db.employees_file), 'ab') as f:
+        f.write(b'{"op": "set", "rec": {"id": 3, "na')
+
+    outro = DatabaseManager(data_dir)
+    assert outro.buscar_funcionario(1)['name'] == 'Alterado'
+    assert outro.buscar_funcionario(3)['name'] == 'Funcionário 2'
+
+
+def test_commit_incorpora_o_journal_ao_arquivo_base(data_dir):
+    """commit() reescreve o arquivo base com o journal aplicado e remove o journal."""
+    db = DatabaseManager(data_dir)
+    _popular(db, 20)
+    db.atualizar_funcionario(5, {'name': 'Alterado'})
+
+    db.commit()
+
+    assert not os.path.exists(db._journal(db.employees_file))
+    assert {e['id']: e['name'] for e in _ler_base(db)}[5] == 'Alterado'
+
+
+def test_journal_grande_e_compactado_automaticamente(data_dir):
+    """Quando o journal passa da metade do arquivo base, o arquivo é reescrito."""
+    db = DatabaseManager(data_dir)
+
+    # Arquivo base vazio ("[]"): a primeira inclusão já passa do limite
+    db.adicionar_funcionario({'name': 'Único'})
+
+    assert not os.path.exists(db._journal(db.employees_file))
+    assert [e['name'] for e in _ler_base(db)] == ['Único']
+
+
+def test_cache_invalidado_quando_o_arquivo_muda_por_fora(data_dir):
+    """Alterações de outra instância (ou processo) aparecem na próxima leitura."""
+    db = DatabaseManager(data_dir)
+    _popular(db, 3)
+    assert len(db.listar_funcionarios()) == 3
+
+    # Outro escritor reescreve o arquivo base; garante um mtime diferente
+    with open(db.employees_file, 'w', encoding='utf-8') as f:
+        json.dump([{'id': 1, 'name': 'Externo'}], f)
+    st = os.stat(db.employees_file)
+    os.utime(db.employees_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert [e['name'] for e in db.listar_funcionarios()] == ['Externo']
+    assert db.buscar_funcionario(2) is None
+
+
+def test_leituras_publicas_devolvem_copias(data_dir):
+    """Alterar um registro devolvido não altera o cache nem o que vai para o disco."""
+    db = DatabaseManager(data_dir)
+    _popular(db, 3)
+
+    db.listar_funcionarios()[0]['salario'] = 999
+    db.buscar_funcionario(1)['salario'] = 999
+    db.buscar_funcionarios_por_status('Ativo')[0]['salario'] = 999
+
+    dados = {'name': 'Novo'}
+    db.adicionar_funcionario(dados)
+    dados['salario'] = 999
+    db.commit()
+
+    assert 'salario' not in db.buscar_funcionario(1)
+    assert all('salario' not in e for e in _ler_base(db))
+
+
+def test_inclusao_pendente_visivel_para_outra_instancia(data_dir):
+    """Com commit_every > 1, as inclusões vão para o disco na hora: duas instâncias não repetem IDs."""
+    a = DatabaseManager(data_dir)
+    c = DatabaseManager(data_dir, commit_every=5)
+    _popular(a, 20)
+
+    id_c = c.adicionar_funcionario({'name': 'C'})
+    id_a = a.adicionar_funcionario({'name': 'A'})
+    c.flush()
+    a.commit()
+
+    assert id_a != id_c
+    nomes = {e['name'] for e in _ler_base(a)}
+    assert {'A', 'C'} <= nomes
+
+
+def test_inclusoes_concorrentes_geram_ids_unicos(data_dir):
+    """A mesma instância usada por várias threads não perde registros nem repete IDs."""
+    db = DatabaseManager(data_dir, commit_every=3)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(lambda i: db.adicionar_funcionario({'name': f'F{i}'}), range(200)))
+    db.commit()
+
+    assert len(set(ids)) == 200
+    assert sorted(e['id'] for e in _ler_base(db)) == sorted(ids)
@@ -0,0 +1,113 @@
+"""
+Testes do SQLitePool: reentrância, transações e devolução das conexões.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.utils.db_pool import SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Pool sobre um banco novo com uma tabela de teste."""
+    pool = SQLitePool(tmp_path / "teste.db", min_size=1, max_size=3, timeout=1)
+    with pool.acquire() as conn:
+        conn.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT)")
+        conn.commit()
+    yield pool
+    pool.close()
+
+
+def _contar(pool: SQLitePool) -> int:
+    """Quantidade de linhas gravadas na tabela de teste."""
+    with pool.acquire() as conn:
+        return conn.execute("SELECT COUNT(*) FROM itens").fetchone()[0]
+
+
+def test_acquire_aninhado_reaproveita_a_conexao(pool):
+    """Dentro da mesma thread, acquire() aninhados devolvem a conexão já emprestada."""
+    with pool.acquire() as externa:
+        with pool.acquire() as interna:
+            assert interna is externa
+            assert pool.pool_health()['active_connections'] == 1
+
+    saude = pool.pool_health()
+    assert saude['active_connections'] == 0
+    assert saude['idle_connections'] == saude['total_connections']
+
+
+def test_transacao_aninhada_faz_parte_da_externa(pool):
+    """Uma transação aninhada só é confirmada junto com a externa."""
+    with pool.transaction() as conn:
+        conn.execute("INSERT INTO itens (nome) VALUES ('a')")
+        with pool.transaction():
+            conn.execute("INSERT INTO itens (nome) VALUES ('b')")
+        # commit() dentro da transação não faz nada
+        pool.commit(conn)
+        assert conn.in_transaction
+
+    assert _contar(pool) == 2
+
+
+def test_erro_na_transacao_desfaz_tudo(pool):
+    """Um erro em qualquer nível desfaz a transação inteira."""
+    with pytest.raises(RuntimeError):
+        with pool.transaction() as conn:
+            conn.execute("INSERT INTO itens (nome) VALUES ('a')")
+            with pool.transaction():
+                conn.execute("INSERT INTO itens (nome) VALUES ('b')")
+                raise RuntimeError("falha")
+
+    assert _contar(pool) == 0
+
+
+def test_conexao_volta_ao_pool_apos_erro(pool):
+    """Após um erro no bloco, a conexão volta ao pool sem transação aberta."""
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.acquire() as conn:
+            conn.execute("INSERT INTO itens (nome) VALUES ('a')")
+            conn.execute("SELECT * FROM tabela_inexistente")
+
+    saude = pool.pool_health()
+    assert saude['active_connections'] == 0
+    assert saude['idle_connections'] == saude['total_connections']
+    assert _contar(pool) == 0
+
+    # A thread não fica presa à conexão devolvida
+    with pool.acquire() as conn:
+        assert not conn.in_transaction
+
+
+def test_acquire_separada_nao_interfere_na_conexao_da_thread(pool):
+    """A conexão de acquire_separada é outra, e devolvê-la não afeta a transação da thread."""
+    leitura = pool.acquire_separada()
+    with pool.transaction() as conn:
+        conn.execute("INSERT INTO itens (nome) VALUES ('a')")
+
+        separada = leitura.__enter__()
+        assert separada is not conn
+        leitura.__exit__(None, None, None)
+
+        assert conn.in_transaction
+        with pool.acquire() as mesma:
+            assert mesma is conn
+
+    assert _contar(pool) == 1
+    assert pool.pool_health()['active_connections'] == 0
+
+
+def test_limite_de_conexoes(pool):
+    """Sem conexões livres e no limite do pool, acquire_separada espera e desiste com TimeoutError."""
+    abertas = [pool.acquire_separada() for _ in range(pool.max_size)]
+    for contexto in abertas:
+        contexto.__enter__()
+
+    with pytest.raises(TimeoutError):
+        with pool.acquire_separada():
+            pass
+
+    for contexto in abertas:
+        contexto.__exit__(None, None, None)
+    assert pool.pool_health()['active_connections'] == 0